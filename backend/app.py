@@ -1,15 +1,45 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
+import os
 import pymysql
 import re
+import json
+import hashlib
+import time
+import unicodedata
 from datetime import datetime
-from config import DB_CONFIG, GEMINI_API_KEY
-from fortune_analyzer import FortuneAnalyzer
+from config import (GEMINI_API_KEY, ANALYZE_COALESCE_TTL,
+                    FORTUNE_DEDUPE_MINUTES, FORTUNE_IDEMPOTENCY_HOURS)
+from fortune_analyzer import FortuneAnalyzer, ANALYSIS_ERROR_PREFIX
 from rag_system import RAGSystem
+from saju_calculator import SajuCalculator
+from sal_calculator import SalCalculator
+from chart_index import get_chart_index, PILLAR_KEYS
+from compatibility import CompatibilityCalculator
+from user_charts import UserChartStore
+from memo_cache import SingleFlight
+from job_queue import AnalysisJobQueue
+from db_pool import get_db_pool
+from migrations import MigrationRunner, connect_database
+from app_queries import (FIND_FORTUNE_USER_SQL, RECENT_ANALYSIS_BY_HASH_SQL, RECENT_ANALYSIS_BY_IDEMPOTENCY_KEY_SQL,
+                         USER_PROFILE_SQL, GET_USER_SQL, build_users_query)
+import numpy as np
 
 app = Flask(__name__)
 CORS(app)  # CORS 설정으로 React 앱에서 API 호출 가능
 
+# 궁합 계산기 (Gemini 없이 동작)
+compatibility_calculator = CompatibilityCalculator()
+
+# 사용자 사주·살 저장소 (사용자 생성 시 저장, 사주 조건 조회)
+user_chart_store = UserChartStore(SalCalculator(compatibility_calculator.saju_calculator))
+
+# 조언 프롬프트를 만들 데이터가 없을 때 안내 문구
+NO_ADVICE_CONTEXT_MESSAGE = "아직 관련된 경험 데이터가 없습니다. 더 많은 경험을 공유해주세요."
+
+# 같은 내용의 동시 사주 분석 요청 합치기 (Gemini 호출 한 번의 결과를 함께 받음)
+analyze_flight = SingleFlight(ANALYZE_COALESCE_TTL)
+
 # 사주 분석기와 RAG 시스템 초기화
 fortune_analyzer = None
 rag_system = None
@@ -29,12 +59,8 @@ else:
 def get_db_connection():
     """데이터베이스 연결을 반환합니다."""
     try:
-        connection = pymysql.connect(
-            **DB_CONFIG,
-            use_unicode=True,
-            autocommit=False
-        )
-        return connection
+        # 공유 연결 풀에서 빌림 (close()하면 풀에 반환)
+        return get_db_pool().connection()
     except Exception as e:
         print(f"데이터베이스 연결 오류: {e}")
         return None
@@ -49,98 +75,192 @@ def validate_name(name):
     return len(name) > 0 and len(name) <= 50
 
 def init_database():
-    """데이터베이스와 테이블을 초기화합니다."""
+    """데이터베이스를 만들고 적용하지 않은 스키마 마이그레이션을 적용합니다 (migrations.py)."""
+    connection = None
     try:
-        # 데이터베이스 생성
-        connection = pymysql.connect(
-            host=DB_CONFIG['host'],
-            user=DB_CONFIG['user'],
-            password=DB_CONFIG['password'],
-            charset='utf8mb4',
-            use_unicode=True
-        )
+        connection = connect_database(create_database=True)
+        applied = MigrationRunner(connection).migrate()
+        if applied:
+            print(f"데이터베이스 마이그레이션 {len(applied)}개를 적용했습니다: {applied}")
+        print("데이터베이스와 테이블이 준비되었습니다.")
         
-        with connection.cursor() as cursor:
-            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']}")
-            cursor.execute(f"USE {DB_CONFIG['database']}")
-            
-            # 사용자 정보 테이블 생성
-            create_users_table = """
-            CREATE TABLE IF NOT EXISTS users (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                name VARCHAR(100) NOT NULL COMMENT '이름',
-                birth_date DATE NOT NULL COMMENT '생년월일',
-                birth_time TIME NOT NULL COMMENT '태어난 시간',
-                message TEXT NOT NULL COMMENT '할말',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '생성일시',
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '수정일시'
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사용자 정보 테이블'
-            """
-            cursor.execute(create_users_table)
-            
-            # 사용자 프로필 테이블 생성 (RAG용 개인화 데이터)
-            create_user_profiles_table = """
-            CREATE TABLE IF NOT EXISTS user_profiles (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id INT NOT NULL COMMENT '사용자 ID',
-                financial_status VARCHAR(50) COMMENT '재정상태',
-                occupation VARCHAR(100) COMMENT '직업',
-                interests TEXT COMMENT '관심분야',
-                current_challenges TEXT COMMENT '현재 고민',
-                goals TEXT COMMENT '목표',
-                personality_traits TEXT COMMENT '성격특성',
-                relationship_status VARCHAR(50) COMMENT '연애상태',
-                health_concerns TEXT COMMENT '건강관심사',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '생성일시',
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '수정일시',
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사용자 프로필 테이블'
-            """
-            cursor.execute(create_user_profiles_table)
-            
-            # 사주 분석 결과 테이블 생성
-            create_fortune_table = """
-            CREATE TABLE IF NOT EXISTS fortune_analysis (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id INT NOT NULL COMMENT '사용자 ID',
-                analysis_result TEXT NOT NULL COMMENT '사주 분석 결과',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '생성일시',
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사주 분석 결과 테이블'
-            """
-            cursor.execute(create_fortune_table)
-            
-            # 사용자 경험 데이터 테이블 생성 (RAG용)
-            create_experiences_table = """
-            CREATE TABLE IF NOT EXISTS user_experiences (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id INT NOT NULL COMMENT '사용자 ID',
-                experience_text TEXT NOT NULL COMMENT '경험 내용',
-                experience_date DATE COMMENT '경험 날짜',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '생성일시',
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사용자 경험 데이터 테이블'
-            """
-            cursor.execute(create_experiences_table)
-            
-            # 검색 성능 향상을 위한 인덱스 추가
-            try:
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_name ON users(name)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_birth_date ON users(birth_date)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_birth_time ON users(birth_time)")
-                print("데이터베이스 인덱스가 생성되었습니다.")
-            except Exception as idx_error:
-                print(f"인덱스 생성 중 오류 (무시 가능): {idx_error}")
-            
-            connection.commit()
-            print("데이터베이스와 테이블이 성공적으로 생성되었습니다.")
-            
     except Exception as e:
         print(f"데이터베이스 초기화 오류: {e}")
     finally:
         if connection:
             connection.close()
 
+def find_fortune_user_id(cursor, data):
+    """이름과 생년월일시로 사용자 ID를 찾습니다 (없으면 None)."""
+    cursor.execute(FIND_FORTUNE_USER_SQL, (data['name'], data['birthDate'], data['birthTime']))
+    user_result = cursor.fetchone()
+    return user_result[0] if user_result else None
+
+def fortune_request_hash(data):
+    """정규화한 분석 요청 내용의 SHA-256 (fortune_analysis.request_hash)"""
+    return hashlib.sha256(json.dumps(fortune_request_key(data), ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def find_recent_analysis(cursor, user_id, request_hash, idempotency_key=None):
+    """
+    같은 사용자의 저장된 분석 결과를 찾습니다 (없으면 None).
+    멱등성 키가 있으면 그 키로 FORTUNE_IDEMPOTENCY_HOURS 안의 결과를, 없으면 같은 요청 내용의 FORTUNE_DEDUPE_MINUTES 안의 결과를 찾습니다.
+    (user_id, created_at) 인덱스로 사용자의 최근 행만 확인합니다. 빈 텍스트나 분석 실패 텍스트가 저장된 행은 건너뜁니다.
+    """
+    error_pattern = ANALYSIS_ERROR_PREFIX + '%'
+    if idempotency_key:
+        cursor.execute(RECENT_ANALYSIS_BY_IDEMPOTENCY_KEY_SQL,
+                       (user_id, FORTUNE_IDEMPOTENCY_HOURS, idempotency_key, error_pattern))
+    else:
+        cursor.execute(RECENT_ANALYSIS_BY_HASH_SQL, (user_id, FORTUNE_DEDUPE_MINUTES, request_hash, error_pattern))
+    recent_analysis = cursor.fetchone()
+    return recent_analysis[0] if recent_analysis else None
+
+def is_valid_analysis(analysis_result):
+    """저장·재사용할 수 있는 분석 결과인지 (빈 텍스트나 분석 실패 텍스트가 아님)"""
+    return bool(analysis_result and analysis_result.strip()) and not analysis_result.startswith(ANALYSIS_ERROR_PREFIX)
+
+def request_idempotency_key(data):
+    """요청의 멱등성 키 (Idempotency-Key 헤더 또는 본문 idempotencyKey, 없으면 None). 형식이 틀리면 ValueError"""
+    idempotency_key = request.headers.get('Idempotency-Key') or data.get('idempotencyKey')
+    if idempotency_key is not None and not (isinstance(idempotency_key, str) and 0 < len(idempotency_key) <= 100):
+        raise ValueError('멱등성 키는 100자 이하의 문자열이어야 합니다.')
+    return idempotency_key
+
+def load_stored_analysis(data, idempotency_key=None):
+    """Gemini를 호출하기 전에 같은 요청(또는 같은 멱등성 키)의 저장된 분석 결과를 조회합니다 (없으면 None)."""
+    connection = get_db_connection()
+    if not connection:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            user_id = find_fortune_user_id(cursor, data)
+            if user_id is None:
+                return None
+            return find_recent_analysis(cursor, user_id, fortune_request_hash(data), idempotency_key)
+    finally:
+        connection.close()
+
+def save_fortune_result(data, analysis_result, idempotency_key=None):
+    """
+    사주 분석 결과를 fortune_analysis와 RAG 컨텍스트에 저장합니다
+    (같은 요청의 최근 결과가 있거나, 빈 텍스트·분석 실패 텍스트면 생략).
+    """
+    if not is_valid_analysis(analysis_result):
+        print("빈 분석 결과나 분석 실패 결과는 저장하지 않습니다.")
+        return
+    
+    saved_user_id = None
+    connection = get_db_connection()
+    if connection:
+        with connection.cursor() as cursor:
+            # 사용자 ID 찾기 (이름과 생년월일로)
+            user_id = find_fortune_user_id(cursor, data)
+            if user_id is not None:
+                request_hash = fortune_request_hash(data)
+                
+                # 최근에 같은 요청(또는 같은 멱등성 키)의 분석 결과가 있는지 확인
+                recent_analysis = find_recent_analysis(cursor, user_id, request_hash, idempotency_key)
+                
+                if recent_analysis is None:
+                    # 분석 결과 저장
+                    cursor.execute("""
+                        INSERT INTO fortune_analysis (user_id, analysis_result, request_hash, idempotency_key)
+                        VALUES (%s, %s, %s, %s)
+                    """, (user_id, analysis_result, request_hash, idempotency_key))
+                    connection.commit()
+                    saved_user_id = user_id
+                else:
+                    print(f"사용자 {user_id}의 최근 분석 결과가 있어 중복 저장을 방지했습니다.")
+        
+        connection.close()
+        
+        # RAG 컨텍스트로도 저장 (연결을 풀에 돌려준 뒤)
+        if saved_user_id is not None and rag_system:
+            rag_system.save_fortune_analysis_context(saved_user_id, analysis_result)
+
+def load_fortune_context(data):
+    """요청의 userId로 사용자 프로필과 RAG 컨텍스트를 조회합니다 (없으면 None, "")."""
+    profile_data = None
+    rag_context = ""
+    if 'userId' in data:
+        connection = get_db_connection()
+        if connection:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(USER_PROFILE_SQL, (data['userId'],))
+                profile_data = cursor.fetchone()
+            connection.close()
+        
+        # RAG 컨텍스트 생성
+        if rag_system:
+            rag_context = rag_system.get_user_context_for_fortune(data['userId'])
+    return profile_data, rag_context
+
+def fortune_request_key(data):
+    """사주 분석 요청 → 요청 합치기 키 (이름 유니코드 정규화, 공백·초 단위 차이는 같은 요청으로 봄)"""
+    return (
+        unicodedata.normalize('NFC', str(data['name'])).strip(),
+        str(data['birthDate']).strip(),
+        str(data['birthTime']).strip()[:5],
+        ' '.join(str(data.get('message') or '').split()),
+        str(data.get('gender') or '').strip().lower(),
+        str(data.get('userId') or '')
+    )
+
+def sse_event(event, payload):
+    """Server-Sent Events 메시지 한 개 (data는 JSON)"""
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False, default=str)}\n\n"
+
+def sse_response(events):
+    """SSE 이벤트 이터레이터 → 스트리밍 응답 (프록시 버퍼링 끔)"""
+    return Response(stream_with_context(events), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def run_fortune_job(data, report):
+    """
+    분석 작업 큐에서 실행하는 사주 분석 (컨텍스트 조회 → 사주·프롬프트 → Gemini → 저장, 단계마다 진행 상황 기록).
+    재시도·중복 작업이면 저장된 결과를 그대로 반환하고, 빈 응답이면 작업을 실패로 끝냅니다.
+    """
+    started = time.perf_counter()
+    timings = {}
+    
+    # 같은 요청(또는 같은 멱등성 키)의 저장된 결과가 있으면 Gemini를 다시 호출하지 않음
+    report('stored_lookup')
+    stored_result = load_stored_analysis(data, data.get('idempotencyKey'))
+    timings['stored_lookup'] = round((time.perf_counter() - started) * 1000, 3)
+    if stored_result is not None:
+        return {'message': '사주 분석이 완료되었습니다.', 'analysis': stored_result, 'stored': True, 'timings': timings}
+    
+    report('context')
+    profile_data, rag_context = load_fortune_context(data)
+    
+    report('chart')
+    prompt, _ = fortune_analyzer.build_fortune_prompt(
+        data['name'],
+        data['birthDate'],
+        data['birthTime'],
+        data.get('message', ''),
+        profile_data,
+        rag_context,
+        gender=data.get('gender'),
+        timings=timings
+    )
+    
+    report('llm')
+    llm_started = time.perf_counter()
+    analysis_result = fortune_analyzer.generate_text(prompt)
+    timings['llm'] = round((time.perf_counter() - llm_started) * 1000, 3)
+    if not is_valid_analysis(analysis_result):
+        raise ValueError('사주 분석 결과가 비어 있습니다.')
+    
+    report('saving')
+    save_fortune_result(data, analysis_result, data.get('idempotencyKey'))
+    timings['total'] = round((time.perf_counter() - started) * 1000, 3)
+    
+    return {'message': '사주 분석이 완료되었습니다.', 'analysis': analysis_result, 'timings': timings}
+
+# 분석 작업 큐 (비동기 사주 분석, 작업자는 첫 submit 또는 서버 시작 시 실행)
+job_queue = AnalysisJobQueue({'fortune': run_fortune_job})
+
 @app.route('/api/users', methods=['POST'])
 def create_user():
     """새로운 사용자 정보를 저장합니다."""
@@ -179,6 +299,14 @@ def create_user():
             # 삽입된 사용자 ID 반환
             user_id = cursor.lastrowid
             
+            # 사주·살 저장 (실패해도 사용자 저장은 유지, user_charts.py 백필로 채움)
+            try:
+                user_chart_store.save_user_chart(cursor, user_id, data['birthDate'], data['birthTime'])
+                connection.commit()
+            except Exception as chart_error:
+                connection.rollback()
+                print(f"사용자 사주 저장 오류: {chart_error}")
+            
         connection.close()
         
         return jsonify({
@@ -190,30 +318,98 @@ def create_user():
         print(f"사용자 생성 오류: {e}")
         return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
 
+def format_user_row(user):
+    """사용자 행의 날짜·시간을 JSON용 문자열로 변환합니다."""
+    if user.get('birth_date'):
+        user['birth_date'] = user['birth_date'].strftime('%Y-%m-%d')
+    if user.get('birth_time'):
+        user['birth_time'] = str(user['birth_time'])
+    if user.get('created_at'):
+        user['created_at'] = user['created_at'].strftime('%Y-%m-%d %H:%M:%S')
+    return user
+
+def make_users_cursor(row):
+    """사용자 목록 다음 페이지 커서 (마지막 행의 created_at과 id)"""
+    return f"{row['created_at'].strftime('%Y-%m-%dT%H:%M:%S')}_{row['id']}"
+
+def parse_users_cursor(value):
+    """커서 → (created_at, id), 없으면 None (형식이 틀리면 ValueError)"""
+    if not value:
+        return None
+    created_at, _, user_id = value.rpartition('_')
+    return datetime.strptime(created_at, '%Y-%m-%dT%H:%M:%S'), int(user_id)
+
 @app.route('/api/users', methods=['GET'])
 def get_users():
-    """모든 사용자 정보를 조회합니다."""
+    """
+    사용자 목록을 최신 가입순으로 조회합니다 (?limit=, 다음 페이지는 응답의 next_after를 after로).
+    ?format=ndjson(또는 Accept: application/x-ndjson)이면 after 다음 전체(limit이 있으면 limit명)를 한 줄에 한 명씩 스트리밍합니다.
+    """
+    try:
+        after = parse_users_cursor(request.args.get('after'))
+    except ValueError:
+        return jsonify({'error': 'after는 이전 응답의 next_after 값이어야 합니다.'}), 400
+    
+    if request.args.get('format') == 'ndjson' or request.accept_mimetypes.best == 'application/x-ndjson':
+        limit = request.args.get('limit')
+        if limit is not None:
+            if not limit.isdigit() or int(limit) < 1:
+                return jsonify({'error': 'limit은 1 이상의 정수여야 합니다.'}), 400
+            limit = int(limit)
+        return stream_users_ndjson(after, limit)
+    
     try:
+        limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+        
         connection = get_db_connection()
         if not connection:
             return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
         
         with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-            cursor.execute("""
-                SELECT id, name, birth_date, birth_time, message, created_at
-                FROM users
-                ORDER BY created_at DESC
-            """)
-            users = cursor.fetchall()
+            # 다음 페이지가 있는지 알기 위해 하나 더 조회
+            query, params = build_users_query(after, limit + 1)
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
             
         connection.close()
         
-        return jsonify({'users': users}), 200
+        next_after = make_users_cursor(rows[limit - 1]) if len(rows) > limit else None
+        users = [format_user_row(row) for row in rows[:limit]]
+        return jsonify({'users': users, 'next_after': next_after}), 200
         
     except Exception as e:
         print(f"사용자 조회 오류: {e}")
         return jsonify({'error': '서버 오류가 발생했습니다.'}), 500
 
+def stream_users_ndjson(after=None, limit=None):
+    """
+    서버 측 커서(SSDictCursor)로 사용자를 읽는 대로 NDJSON으로 보냅니다 (전체 내보내기도 메모리 일정).
+    응답을 보내는 중에 오류가 나면 마지막 줄로 {"error": ...}를 보내 잘린 내보내기임을 알립니다.
+    """
+    connection = get_db_connection()
+    if not connection:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    def lines():
+        try:
+            with connection.cursor(pymysql.cursors.SSDictCursor) as cursor:
+                query, params = build_users_query(after, limit)
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(500)
+                    if not rows:
+                        break
+                    yield ''.join(json.dumps(format_user_row(row), ensure_ascii=False) + '\n' for row in rows)
+        except Exception as e:
+            print(f"사용자 내보내기 오류: {e}")
+            yield json.dumps({'error': '사용자 내보내기 중 오류가 발생해 목록이 끝까지 전송되지 않았습니다.'},
+                             ensure_ascii=False) + '\n'
+        finally:
+            connection.close()
+    
+    return Response(stream_with_context(lines()), mimetype='application/x-ndjson',
+                    headers={'X-Accel-Buffering': 'no'})
+
 @app.route('/api/users/<int:user_id>', methods=['GET'])
 def get_user(user_id):
     """특정 사용자 정보를 조회합니다."""
@@ -225,11 +421,7 @@ def get_user(user_id):
             return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
         
         with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-            cursor.execute("""
-                SELECT id, name, birth_date, birth_time, message, created_at
-                FROM users
-                WHERE id = %s
-            """, (user_id,))
+            cursor.execute(GET_USER_SQL, (user_id,))
             user = cursor.fetchone()
             print(f"조회된 사용자: {user}")
             
@@ -237,12 +429,7 @@ def get_user(user_id):
         
         if user:
             # datetime 객체를 문자열로 변환
-            if user.get('birth_date'):
-                user['birth_date'] = user['birth_date'].strftime('%Y-%m-%d')
-            if user.get('birth_time'):
-                user['birth_time'] = str(user['birth_time'])
-            if user.get('created_at'):
-                user['created_at'] = user['created_at'].strftime('%Y-%m-%d %H:%M:%S')
+            format_user_row(user)
             
             print(f"변환된 사용자: {user}")
             return jsonify(user), 200
@@ -275,84 +462,206 @@ def analyze_fortune():
         if not validate_name(data['name']):
             return jsonify({'error': '올바른 이름을 입력해주세요.'}), 400
         
-        # 사용자 프로필 조회
-        profile_data = None
-        rag_context = ""
-        if 'userId' in data:
-            connection = get_db_connection()
-            if connection:
-                with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-                    cursor.execute("""
-                        SELECT * FROM user_profiles 
-                        WHERE user_id = %s
-                    """, (data['userId'],))
-                    profile_data = cursor.fetchone()
-                connection.close()
-            
-            # RAG 컨텍스트 생성
-            if rag_system:
-                rag_context = rag_system.get_user_context_for_fortune(data['userId'])
-        
-        # 사주 분석 수행 (프로필 데이터 + RAG 컨텍스트 포함)
-        analysis_result = fortune_analyzer.analyze_fortune(
-            data['name'],
-            data['birthDate'],
-            data['birthTime'],
-            data.get('message', ''),
-            profile_data,
-            data.get('userId'),
-            rag_context
-        )
+        # 멱등성 키 (헤더 또는 본문, 같은 키로 다시 보내면 저장된 결과 반환)
+        try:
+            idempotency_key = request_idempotency_key(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # 데이터베이스에 분석 결과 저장
-        connection = get_db_connection()
-        if connection:
-            with connection.cursor() as cursor:
-                # 사용자 ID 찾기 (이름과 생년월일로)
-                cursor.execute("""
-                    SELECT id FROM users 
-                    WHERE name = %s AND birth_date = %s AND birth_time = %s
-                    ORDER BY created_at DESC LIMIT 1
-                """, (data['name'], data['birthDate'], data['birthTime']))
-                
-                user_result = cursor.fetchone()
-                if user_result:
-                    user_id = user_result[0]
-                    
-                    # 최근 5분 내에 같은 사용자의 분석 결과가 있는지 확인
-                    cursor.execute("""
-                        SELECT id FROM fortune_analysis 
-                        WHERE user_id = %s AND created_at > DATE_SUB(NOW(), INTERVAL 5 MINUTE)
-                        ORDER BY created_at DESC LIMIT 1
-                    """, (user_id,))
-                    
-                    recent_analysis = cursor.fetchone()
-                    
-                    if not recent_analysis:
-                        # 분석 결과 저장
-                        cursor.execute("""
-                            INSERT INTO fortune_analysis (user_id, analysis_result)
-                            VALUES (%s, %s)
-                        """, (user_id, analysis_result))
-                        connection.commit()
-                        
-                        # RAG 컨텍스트로도 저장
-                        if rag_system:
-                            rag_system.save_fortune_analysis_context(user_id, analysis_result)
-                    else:
-                        print(f"사용자 {user_id}의 최근 분석 결과가 있어 중복 저장을 방지했습니다.")
+        # Gemini 호출 전에 같은 요청의 저장된 결과가 있으면 그대로 반환
+        started = time.perf_counter()
+        stored_result = load_stored_analysis(data, idempotency_key)
+        if stored_result is not None:
+            return jsonify({
+                'message': '사주 분석이 완료되었습니다.',
+                'analysis': stored_result,
+                'stored': True,  # 저장된 결과 재사용 여부
+                'timings': {'stored_lookup': round((time.perf_counter() - started) * 1000, 3)}
+            }), 200
+        
+        # 비동기 요청이면 작업 ID만 바로 반환 (결과는 GET /api/jobs/<job_id>로 조회)
+        if data.get('async'):
+            job_id = job_queue.submit('fortune', dict(data, idempotencyKey=idempotency_key))
+            if not job_id:
+                return jsonify({'error': '분석 작업 등록 중 오류가 발생했습니다.'}), 500
+            return jsonify({
+                'message': '사주 분석 작업이 등록되었습니다.',
+                'job_id': job_id,
+                'status_url': f'/api/jobs/{job_id}'
+            }), 202
+        
+        def run_analysis():
+            # 사용자 프로필과 RAG 컨텍스트 조회
+            profile_data, rag_context = load_fortune_context(data)
             
-            connection.close()
+            # 사주 분석 수행 (프로필 데이터 + RAG 컨텍스트 포함, 단계별 소요 시간 포함)
+            fortune_result = fortune_analyzer.analyze_fortune_with_timings(
+                data['name'],
+                data['birthDate'],
+                data['birthTime'],
+                data.get('message', ''),
+                profile_data,
+                data.get('userId'),
+                rag_context,
+                gender=data.get('gender')
+            )
+            
+            # 데이터베이스에 분석 결과 저장 (분석 실패 결과는 저장하지 않음 - 저장된 결과 재사용·이후 프롬프트에 쓰이지 않도록)
+            if fortune_result['saju']:
+                save_fortune_result(data, fortune_result['analysis'], idempotency_key)
+            return fortune_result
+        
+        # 같은 요청이 실행 중이거나 방금 끝났으면 그 결과를 함께 받음 (오류 결과는 보관하지 않음,
+        # 멱등성 키가 다르면 키마다 결과 행을 저장하도록 따로 실행)
+        fortune_result = analyze_flight.do((fortune_request_key(data), idempotency_key), run_analysis,
+                                           cache_if=lambda result: bool(result['saju']))
+        analysis_result = fortune_result['analysis']
         
         return jsonify({
             'message': '사주 분석이 완료되었습니다.',
-            'analysis': analysis_result
+            'analysis': analysis_result,
+            'timings': fortune_result['timings']  # 단계별 소요 시간 (ms)
         }), 200
         
     except Exception as e:
         print(f"사주 분석 오류: {e}")
         return jsonify({'error': '사주 분석 중 오류가 발생했습니다.'}), 500
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """분석 작업의 상태(queued, running, done, failed)와 진행 단계, 완료되면 결과를 조회합니다."""
+    if not re.fullmatch(r'[0-9a-f]{32}', job_id):
+        return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+    
+    try:
+        job = job_queue.get_job(job_id)
+        if not job:
+            return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+        return jsonify(job), 200
+        
+    except Exception as e:
+        print(f"작업 조회 오류: {e}")
+        return jsonify({'error': '작업 조회 중 오류가 발생했습니다.'}), 500
+
+@app.route('/api/fortune/analyze/stream', methods=['POST'])
+def analyze_fortune_stream():
+    """
+    사주를 분석하고 Gemini 응답을 생성되는 대로 SSE로 보냅니다 (chunk → done, 끝까지 받은 뒤 결과 저장).
+    같은 요청(또는 같은 멱등성 키)의 저장된 결과가 있으면 chunk 한 개로 보냅니다.
+    """
+    if not fortune_analyzer:
+        return jsonify({'error': '사주 분석 기능이 비활성화되어 있습니다.'}), 503
+    
+    try:
+        data = request.get_json()
+        
+        # 필수 필드 검증
+        required_fields = ['name', 'birthDate', 'birthTime']
+        for field in required_fields:
+            if field not in data or not data[field]:
+                return jsonify({'error': f'{field} 필드는 필수입니다.'}), 400
+        
+        # 이름 검증
+        if not validate_name(data['name']):
+            return jsonify({'error': '올바른 이름을 입력해주세요.'}), 400
+        
+        # 멱등성 키 (분석 요청과 같은 규칙, 결과 저장 시 함께 기록)
+        try:
+            idempotency_key = request_idempotency_key(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Gemini 호출 전에 같은 요청의 저장된 결과가 있으면 그대로 보냄
+        started = time.perf_counter()
+        stored_result = load_stored_analysis(data, idempotency_key)
+        if stored_result is not None:
+            timings = {'stored_lookup': round((time.perf_counter() - started) * 1000, 3)}
+            return sse_response(iter([
+                sse_event('chunk', {'text': stored_result}),
+                sse_event('done', {'message': '사주 분석이 완료되었습니다.', 'stored': True, 'timings': timings})
+            ]))
+        
+        # 사용자 프로필과 RAG 컨텍스트 조회 후 프롬프트 생성 (잘못된 생년월일시는 스트림 시작 전에 400)
+        profile_data, rag_context = load_fortune_context(data)
+        timings = {}
+        try:
+            chunks = fortune_analyzer.stream_fortune(
+                data['name'],
+                data['birthDate'],
+                data['birthTime'],
+                data.get('message', ''),
+                profile_data,
+                rag_context,
+                gender=data.get('gender'),
+                timings=timings
+            )
+        except ValueError as e:
+            return jsonify({'error': f'생년월일시를 확인해주세요: {e}'}), 400
+        
+    except Exception as e:
+        print(f"사주 분석 오류: {e}")
+        return jsonify({'error': '사주 분석 중 오류가 발생했습니다.'}), 500
+    
+    def events():
+        started = time.perf_counter()
+        parts = []
+        try:
+            for chunk in chunks:
+                if not parts:
+                    timings['first_chunk'] = round((time.perf_counter() - started) * 1000, 3)
+                parts.append(chunk)
+                yield sse_event('chunk', {'text': chunk})
+            timings['llm'] = round((time.perf_counter() - started) * 1000, 3)
+            
+            # 응답을 끝까지 받은 뒤 저장 (빈 응답은 저장하지 않고 오류로 끝냄)
+            analysis_result = ''.join(parts)
+            if not is_valid_analysis(analysis_result):
+                yield sse_event('error', {'error': '사주 분석 결과가 비어 있습니다.'})
+                return
+            save_fortune_result(data, analysis_result, idempotency_key)
+            yield sse_event('done', {'message': '사주 분석이 완료되었습니다.', 'timings': timings})
+            
+        except Exception as e:
+            print(f"사주 분석 스트리밍 오류: {e}")
+            yield sse_event('error', {'error': '사주 분석 중 오류가 발생했습니다.'})
+    
+    return sse_response(events())
+
+@app.route('/api/fortune/daily', methods=['POST'])
+def daily_fortune():
+    """오늘의 운세를 조회합니다 (일주 x 오늘 일진 조합으로 캐시)."""
+    if not fortune_analyzer:
+        return jsonify({'error': '사주 분석 기능이 비활성화되어 있습니다.'}), 503
+    
+    try:
+        data = request.get_json()
+        
+        # 필수 필드 검증
+        required_fields = ['birthDate', 'birthTime']
+        for field in required_fields:
+            if field not in data or not data[field]:
+                return jsonify({'error': f'{field} 필드는 필수입니다.'}), 400
+        
+        # 생년월일시 검증
+        try:
+            fortune_analyzer.saju_calculator.chart_key(data['birthDate'], data['birthTime'])
+        except ValueError:
+            return jsonify({'error': '올바른 생년월일시를 입력해주세요.'}), 400
+        
+        result = fortune_analyzer.analyze_daily_fortune(data['birthDate'], data['birthTime'])
+        if not result:
+            return jsonify({'error': '오늘의 운세 분석 중 오류가 발생했습니다.'}), 500
+        
+        return jsonify({
+            'message': '오늘의 운세 분석이 완료되었습니다.',
+            **result
+        }), 200
+        
+    except Exception as e:
+        print(f"오늘의 운세 분석 오류: {e}")
+        return jsonify({'error': '오늘의 운세 분석 중 오류가 발생했습니다.'}), 500
+
+
 
 @app.route('/api/experience', methods=['POST'])
 def save_experience():
@@ -418,8 +727,8 @@ def search_experiences():
 
 @app.route('/api/advice/personalized', methods=['POST'])
 def get_personalized_advice():
-    """개인화된 조언을 제공합니다."""
-    if not RAG_AVAILABLE or not rag_system:
+    """개인화된 조언 프롬프트로 Gemini 조언을 생성합니다 (같은 프롬프트는 응답 캐시 사용)."""
+    if not RAG_AVAILABLE or not rag_system or not fortune_analyzer:
         return jsonify({'error': 'RAG 시스템이 비활성화되어 있습니다.'}), 503
     
     try:
@@ -431,11 +740,12 @@ def get_personalized_advice():
             if field not in data or not data[field]:
                 return jsonify({'error': f'{field} 필드는 필수입니다.'}), 400
         
-        # 개인화된 조언 생성
-        advice = rag_system.get_personalized_advice(
-            data['userId'],
-            data['query']
-        )
+        # 개인화된 조언 생성 (관련 데이터가 없으면 안내 문구)
+        advice_prompt = rag_system.build_advice_prompt(data['userId'], data['query'])
+        if advice_prompt is None:
+            advice = NO_ADVICE_CONTEXT_MESSAGE
+        else:
+            advice = fortune_analyzer.generate_text(advice_prompt)
         
         return jsonify({
             'message': '개인화된 조언이 생성되었습니다.',
@@ -446,6 +756,42 @@ def get_personalized_advice():
         print(f"개인화된 조언 생성 오류: {e}")
         return jsonify({'error': '개인화된 조언 생성 중 오류가 발생했습니다.'}), 500
 
+@app.route('/api/advice/personalized/stream', methods=['POST'])
+def get_personalized_advice_stream():
+    """POST /api/advice/personalized의 스트리밍 버전 - 같은 조언을 생성되는 대로 SSE로 보냅니다 (chunk → done)."""
+    if not RAG_AVAILABLE or not rag_system or not fortune_analyzer:
+        return jsonify({'error': 'RAG 시스템이 비활성화되어 있습니다.'}), 503
+    
+    try:
+        data = request.get_json()
+        
+        # 필수 필드 검증
+        required_fields = ['userId', 'query']
+        for field in required_fields:
+            if field not in data or not data[field]:
+                return jsonify({'error': f'{field} 필드는 필수입니다.'}), 400
+        
+        advice_prompt = rag_system.build_advice_prompt(data['userId'], data['query'])
+        
+    except Exception as e:
+        print(f"개인화된 조언 생성 오류: {e}")
+        return jsonify({'error': '개인화된 조언 생성 중 오류가 발생했습니다.'}), 500
+    
+    def events():
+        try:
+            if advice_prompt is None:
+                yield sse_event('chunk', {'text': NO_ADVICE_CONTEXT_MESSAGE})
+            else:
+                for chunk in fortune_analyzer.stream_text(advice_prompt):
+                    yield sse_event('chunk', {'text': chunk})
+            yield sse_event('done', {'message': '개인화된 조언이 생성되었습니다.'})
+            
+        except Exception as e:
+            print(f"개인화된 조언 스트리밍 오류: {e}")
+            yield sse_event('error', {'error': '개인화된 조언 생성 중 오류가 발생했습니다.'})
+    
+    return sse_response(events())
+
 @app.route('/api/profile', methods=['POST'])
 def save_user_profile():
     """사용자 프로필을 저장합니다."""
@@ -463,55 +809,34 @@ def save_user_profile():
             return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
         
         with connection.cursor() as cursor:
-            # 기존 프로필이 있는지 확인
-            cursor.execute("SELECT id FROM user_profiles WHERE user_id = %s", (data['userId'],))
-            existing_profile = cursor.fetchone()
-            
-            if existing_profile:
-                # 기존 프로필 업데이트
-                update_query = """
-                UPDATE user_profiles SET
-                    financial_status = %s,
-                    occupation = %s,
-                    interests = %s,
-                    current_challenges = %s,
-                    goals = %s,
-                    personality_traits = %s,
-                    relationship_status = %s,
-                    health_concerns = %s,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE user_id = %s
-                """
-                cursor.execute(update_query, (
-                    data.get('financialStatus'),
-                    data.get('occupation'),
-                    data.get('interests'),
-                    data.get('currentChallenges'),
-                    data.get('goals'),
-                    data.get('personalityTraits'),
-                    data.get('relationshipStatus'),
-                    data.get('healthConcerns'),
-                    data['userId']
-                ))
-            else:
-                # 새 프로필 생성
-                insert_query = """
+            # 프로필 저장 (사용자당 한 행 - uq_user_profiles_user_id, 있으면 갱신)
+            # 조회 후 INSERT하면 동시에 처음 저장하는 두 요청 중 하나가 고유 인덱스 위반으로 실패하므로 한 문장으로 처리
+            cursor.execute("""
                 INSERT INTO user_profiles 
                 (user_id, financial_status, occupation, interests, current_challenges, 
                  goals, personality_traits, relationship_status, health_concerns)
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                cursor.execute(insert_query, (
-                    data['userId'],
-                    data.get('financialStatus'),
-                    data.get('occupation'),
-                    data.get('interests'),
-                    data.get('currentChallenges'),
-                    data.get('goals'),
-                    data.get('personalityTraits'),
-                    data.get('relationshipStatus'),
-                    data.get('healthConcerns')
-                ))
+                ON DUPLICATE KEY UPDATE
+                    financial_status = VALUES(financial_status),
+                    occupation = VALUES(occupation),
+                    interests = VALUES(interests),
+                    current_challenges = VALUES(current_challenges),
+                    goals = VALUES(goals),
+                    personality_traits = VALUES(personality_traits),
+                    relationship_status = VALUES(relationship_status),
+                    health_concerns = VALUES(health_concerns),
+                    updated_at = CURRENT_TIMESTAMP
+            """, (
+                data['userId'],
+                data.get('financialStatus'),
+                data.get('occupation'),
+                data.get('interests'),
+                data.get('currentChallenges'),
+                data.get('goals'),
+                data.get('personalityTraits'),
+                data.get('relationshipStatus'),
+                data.get('healthConcerns')
+            ))
             
             connection.commit()
         
@@ -532,10 +857,7 @@ def get_user_profile(user_id):
             return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
         
         with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-            cursor.execute("""
-                SELECT * FROM user_profiles 
-                WHERE user_id = %s
-            """, (user_id,))
+            cursor.execute(USER_PROFILE_SQL, (user_id,))
             profile = cursor.fetchone()
         
         connection.close()
@@ -569,6 +891,160 @@ def get_similar_users(user_id):
         return jsonify({'error': '유사한 사용자 검색 중 오류가 발생했습니다.'}), 500
 
 
+@app.route('/api/compatibility/<int:user_id>', methods=['GET'])
+def get_compatibility(user_id):
+    """한 사용자와 다른 모든 사용자의 궁합을 계산해 상위 사용자를 조회합니다."""
+    try:
+        limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+        
+        connection = get_db_connection()
+        if not connection:
+            return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+        
+        try:
+            # 저장된 사주(user_charts)를 읽고, 저장되지 않은 사용자만 계산
+            user_ids, codes = user_chart_store.load_all_codes(connection)
+            
+            matches = np.flatnonzero(user_ids == user_id)
+            if len(matches) == 0:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT id FROM users WHERE id = %s", (user_id,))
+                    if cursor.fetchone() is None:
+                        return jsonify({'error': '사용자를 찾을 수 없습니다.'}), 404
+                return jsonify({'error': '사용자의 생년월일시로 사주를 계산할 수 없습니다.'}), 400
+            target_index = int(matches[0])
+            
+            # 행렬 연산으로 궁합 점수 → 상위 limit명 (이름은 상위 사용자만 조회)
+            top = compatibility_calculator.top_matches(codes[target_index], codes, limit, target_index)
+            names = {}
+            if top:
+                top_ids = [int(user_ids[index]) for index, _ in top]
+                with connection.cursor() as cursor:
+                    cursor.execute(f"SELECT id, name FROM users WHERE id IN ({', '.join(['%s'] * len(top_ids))})",
+                                   top_ids)
+                    names = dict(cursor.fetchall())
+        finally:
+            connection.close()
+        
+        saju_calculator = compatibility_calculator.saju_calculator
+        target_saju = {key: saju_calculator.JIAZI_CYCLE[code] for key, code in zip(PILLAR_KEYS, codes[target_index])}
+        results = []
+        for index, score in top:
+            saju = {key: saju_calculator.JIAZI_CYCLE[code] for key, code in zip(PILLAR_KEYS, codes[index])}
+            results.append({
+                'user_id': int(user_ids[index]),
+                'name': names.get(int(user_ids[index])),
+                'score': score,
+                'saju': saju,
+                'details': compatibility_calculator.calculate_compatibility(target_saju, saju)
+            })
+        
+        return jsonify({
+            'message': '궁합 계산이 완료되었습니다.',
+            'user_id': user_id,
+            'saju': target_saju,
+            'matches': results
+        }), 200
+        
+    except Exception as e:
+        print(f"궁합 계산 오류: {e}")
+        return jsonify({'error': '궁합 계산 중 오류가 발생했습니다.'}), 500
+
+
+@app.route('/api/saju/search', methods=['POST'])
+def search_saju():
+    """네 기둥 패턴에 맞는 생년월일시 구간을 검색합니다 (사주 검증·테스트 데이터 작성용)."""
+    try:
+        data = request.get_json()
+        
+        # 필수 필드 검증
+        required_fields = ['startYear', 'endYear']
+        for field in required_fields:
+            if field not in data or data[field] in (None, ''):
+                return jsonify({'error': f'{field} 필드는 필수입니다.'}), 400
+        
+        # 패턴 (yearPillar, monthPillar, dayPillar, hourPillar - 없거나 '*'이면 모두 허용)
+        pattern = {
+            key: data.get(field)
+            for key, field in zip(PILLAR_KEYS, ['yearPillar', 'monthPillar', 'dayPillar', 'hourPillar'])
+        }
+        
+        try:
+            result = get_chart_index().search(
+                pattern,
+                int(data['startYear']),
+                int(data['endYear']),
+                max(0, min(int(data.get('limit', 1000)), 10000))
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'message': '사주 검색이 완료되었습니다.',
+            **result
+        }), 200
+        
+    except Exception as e:
+        print(f"사주 검색 오류: {e}")
+        return jsonify({'error': '사주 검색 중 오류가 발생했습니다.'}), 500
+
+@app.route('/api/charts/users', methods=['GET'])
+def query_chart_users():
+    """살·기둥 조건에 맞는 사용자를 조회합니다 (예: ?sal=dohwa_sal,yeokma_sal, ?dayPillar=甲子)."""
+    try:
+        sal_keys = [key for key in request.args.get('sal', '').split(',') if key]
+        unknown = [key for key in sal_keys if key not in user_chart_store.SAL_KEYS]
+        if unknown:
+            return jsonify({'error': f'알 수 없는 살입니다: {", ".join(unknown)}'}), 400
+        
+        pillars = {}
+        for pillar, field in zip(PILLAR_KEYS, ['yearPillar', 'monthPillar', 'dayPillar', 'hourPillar']):
+            ganji = request.args.get(field)
+            if ganji:
+                if ganji not in user_chart_store.saju_calculator.JIAZI_CODE:
+                    return jsonify({'error': f'{field}는 60갑자 간지여야 합니다.'}), 400
+                pillars[pillar] = ganji
+        
+        if not sal_keys and not pillars:
+            return jsonify({'error': 'sal 또는 기둥 조건이 하나 이상 필요합니다.'}), 400
+        
+        limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+        after_id = request.args.get('after', 0, type=int)
+        
+        connection = get_db_connection()
+        if not connection:
+            return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+        
+        with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+            result = user_chart_store.query_users(cursor, sal_keys, pillars, limit, after_id)
+        connection.close()
+        
+        return jsonify(result), 200
+        
+    except Exception as e:
+        print(f"사주 조건 조회 오류: {e}")
+        return jsonify({'error': '사주 조건 조회 중 오류가 발생했습니다.'}), 500
+
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """캐시 적중/미스 통계를 조회합니다 (캐시 크기 조정용)."""
+    return jsonify({
+        'saju': SajuCalculator.cache_stats(),
+        'sal': SalCalculator.cache_stats(),
+        'daily_fortune': FortuneAnalyzer.daily_cache_stats(),
+        'llm': FortuneAnalyzer.llm_cache_stats(),
+        'analyze_coalescing': analyze_flight.stats(),
+        'analysis_text': {
+            'saju': SajuCalculator.analysis_cache_stats(),
+            'sal': SalCalculator.analysis_cache_stats()
+        }
+    }), 200
+
+@app.route('/api/db/pool', methods=['GET'])
+def get_db_pool_stats():
+    """데이터베이스 연결 풀 통계를 조회합니다 (사용 중·대기 연결 수, 연결 대기 시간)."""
+    return jsonify(get_db_pool().stats()), 200
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """서버 상태를 확인합니다."""
@@ -578,5 +1054,10 @@ if __name__ == '__main__':
     # 데이터베이스 초기화
     init_database()
     
+    # 분석 작업자 시작 (재시작 전에 남은 analysis_jobs 작업을 이어서 실행)
+    # debug 모드 리로더의 부모 프로세스는 요청을 받지 않으므로 서버를 실행하는 자식 프로세스에서만 시작
+    if fortune_analyzer and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        job_queue.start()
+    
     # Flask 서버 실행
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,59 @@
+# app.py 라우트가 요청마다 실행하는 SQL (migrations.py explain이 같은 문장을 EXPLAIN으로 확인)
+
+# 이름과 생년월일시로 사용자 ID 찾기 - 인자: (name, birth_date, birth_time)
+FIND_FORTUNE_USER_SQL = """
+    SELECT id FROM users
+    WHERE name = %s AND birth_date = %s AND birth_time = %s
+    ORDER BY created_at DESC LIMIT 1
+"""
+
+# 같은 요청 내용의 최근 분석 결과 - 인자: (user_id, 분, request_hash, 분석 실패 텍스트 LIKE 패턴)
+RECENT_ANALYSIS_BY_HASH_SQL = """
+    SELECT analysis_result FROM fortune_analysis
+    WHERE user_id = %s AND created_at > DATE_SUB(NOW(), INTERVAL %s MINUTE) AND request_hash = %s
+      AND analysis_result NOT LIKE %s AND analysis_result <> ''
+    ORDER BY created_at DESC LIMIT 1
+"""
+
+# 같은 멱등성 키의 최근 분석 결과 - 인자: (user_id, 시간, idempotency_key, 분석 실패 텍스트 LIKE 패턴)
+RECENT_ANALYSIS_BY_IDEMPOTENCY_KEY_SQL = """
+    SELECT analysis_result FROM fortune_analysis
+    WHERE user_id = %s AND created_at > DATE_SUB(NOW(), INTERVAL %s HOUR) AND idempotency_key = %s
+      AND analysis_result NOT LIKE %s AND analysis_result <> ''
+    ORDER BY created_at DESC LIMIT 1
+"""
+
+# 사용자 프로필 - 인자: (user_id,)
+USER_PROFILE_SQL = """
+    SELECT * FROM user_profiles
+    WHERE user_id = %s
+"""
+
+# 사용자 한 명 - 인자: (user_id,)
+GET_USER_SQL = """
+    SELECT id, name, birth_date, birth_time, message, created_at
+    FROM users
+    WHERE id = %s
+"""
+
+
+def build_users_query(after=None, limit=None):
+    """
+    사용자 목록 SQL과 인자 (최신 가입순, (created_at, id) 인덱스로 after 다음부터 읽음).
+    행 비교 대신 풀어 쓴 조건을 써서 인덱스 범위 조회가 되게 합니다.
+    """
+    where_clause, limit_clause, params = '', '', []
+    if after:
+        where_clause = "WHERE created_at < %s OR (created_at = %s AND id < %s)"
+        params.extend([after[0], after[0], after[1]])
+    if limit is not None:
+        limit_clause = "LIMIT %s"
+        params.append(limit)
+    query = f"""
+        SELECT id, name, birth_date, birth_time, message, created_at
+        FROM users
+        {where_clause}
+        ORDER BY created_at DESC, id DESC
+        {limit_clause}
+    """
+    return query, params
@@ -0,0 +1,130 @@
+import argparse
+import os
+from datetime import date
+from typing import Optional
+
+import numpy as np
+
+from config import CALENDAR_TABLE_PATH
+
+# 테이블 범위: 1900-01-01 ~ 2100-12-31 (+ 23:30 이후 다음날 일주 조회용 2101-01-01 한 줄)
+TABLE_START = date(1900, 1, 1)
+TABLE_END = date(2100, 12, 31)
+TABLE_DAYS = (TABLE_END - TABLE_START).days + 2
+
+# 컬럼 (int16): 일주/월주/연주 60갑자 인덱스, 그날 절입 시각(자정 기준 분, 없으면 -1)
+# 월주·연주는 절입 시각 이후 값이며, 절입 전은 전날 행의 값을 사용
+COL_DAY = 0
+COL_MONTH = 1
+COL_YEAR = 2
+COL_TERM_MINUTE = 3
+TABLE_COLUMNS = 4
+
+_loaded_tables = {}
+
+
+def load_calendar_table(path: str = CALENDAR_TABLE_PATH) -> Optional[np.ndarray]:
+    """
+    미리 생성된 달력 테이블을 읽기 전용으로 메모리 매핑합니다.
+    같은 파일을 매핑한 워커 프로세스들은 같은 페이지를 공유하며,
+    파일이 없거나 형식이 맞지 않으면 None을 반환합니다 (계산 방식으로 동작).
+    """
+    if path in _loaded_tables:
+        return _loaded_tables[path]
+
+    table = None
+    try:
+        if os.path.exists(path):
+            mapped = np.load(path, mmap_mode='r')
+            if mapped.dtype == np.int16 and mapped.shape == (TABLE_DAYS, TABLE_COLUMNS):
+                table = mapped
+            else:
+                print(f"달력 테이블 형식이 맞지 않아 사용하지 않습니다: {path}")
+        else:
+            print(f"달력 테이블이 없어 계산 방식으로 동작합니다 (python calendar_table.py build): {path}")
+    except Exception as e:
+        print(f"달력 테이블 로드 오류: {e}")
+
+    _loaded_tables[path] = table
+    return table
+
+
+def build_calendar_table() -> np.ndarray:
+    """현재 계산 방식(SajuCalculator)으로 전체 달력 테이블을 생성합니다."""
+    from saju_calculator import SajuCalculator
+
+    calculator = SajuCalculator()
+    days_diff = np.arange(TABLE_DAYS, dtype=np.int64)
+    dates = np.datetime64(TABLE_START, 'D') + days_diff
+    year = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+    month = (dates.astype('datetime64[M]') - dates.astype('datetime64[Y]')).astype(np.int64) + 1
+    day = (dates - dates.astype('datetime64[M]')).astype(np.int64) + 1
+
+    # 일주는 정오 기준 (23:30 전이면 그날 값), 월주·연주는 그날 마지막 분(절입 이후) 기준
+    day_codes = calculator._calculate_pillar_codes_batch(year, month, day, days_diff,
+                                                         np.full(TABLE_DAYS, 720, dtype=np.int64))
+    term_codes = calculator._calculate_pillar_codes_batch(year, month, day, days_diff,
+                                                          np.full(TABLE_DAYS, 1439, dtype=np.int64))
+
+    table = np.empty((TABLE_DAYS, TABLE_COLUMNS), dtype=np.int16)
+    table[:, COL_DAY] = day_codes['day_pillar']
+    table[:, COL_MONTH] = term_codes['month_pillar']
+    table[:, COL_YEAR] = term_codes['year_pillar']
+
+    # 절입 시각 (자정 기준 분) - 절입 시각 표가 없으면 고정 절입일 자정부터 새 달
+    terms = calculator.SOLAR_TERM_MINUTE_ARRAY
+    if len(terms):
+        table[:, COL_TERM_MINUTE] = -1
+        term_days = terms // 1440
+        inside = (term_days >= 0) & (term_days < TABLE_DAYS)
+        table[term_days[inside], COL_TERM_MINUTE] = terms[inside] % 1440
+    else:
+        table[:, COL_TERM_MINUTE] = np.where(day == calculator.SOLAR_TERM_DAY_ARRAY[month], 0, -1)
+    return table
+
+
+def check_calendar_table(table: np.ndarray) -> int:
+    """테이블 조회 결과를 계산 방식과 모든 날짜·시간 구간에 대해 비교하고 불일치 수를 반환합니다."""
+    from saju_calculator import SajuCalculator
+
+    calculator = SajuCalculator()
+    rows = memoryview(np.ascontiguousarray(table))
+    # 시간 구간별 대표 시각 (각 구간의 첫 분)
+    bucket_minutes = [calculator.TIME_BUCKET_BY_MINUTE.index(bucket) for bucket in range(14)]
+
+    mismatches = 0
+    for days_diff in range(TABLE_DAYS - 1):
+        day_value = TABLE_START.toordinal() + days_diff
+        current = date.fromordinal(day_value)
+        # 절입일은 절입 직전·직후 분도 확인
+        term_minute = int(table[days_diff, COL_TERM_MINUTE])
+        term_minutes = [term_minute - 1, term_minute] if term_minute > 0 else []
+        for total_minutes in bucket_minutes + term_minutes:
+            expected = calculator._compute_pillar_codes(current.year, current.month, current.day,
+                                                        days_diff, total_minutes)
+            actual = calculator._lookup_pillar_codes(rows, days_diff, total_minutes)
+            if expected != actual:
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"불일치: {current} {total_minutes // 60:02d}:{total_minutes % 60:02d} "
+                          f"계산={expected} 테이블={actual}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='사주 달력 테이블 생성/검증 도구')
+    parser.add_argument('command', choices=['build', 'check'], help='build: 테이블 생성, check: 계산 방식과 비교')
+    parser.add_argument('--path', default=CALENDAR_TABLE_PATH, help='테이블 파일 경로')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        os.makedirs(os.path.dirname(os.path.abspath(args.path)), exist_ok=True)
+        np.save(args.path, build_calendar_table())
+        print(f"달력 테이블을 생성했습니다: {args.path} ({TABLE_DAYS}일)")
+    else:
+        table = load_calendar_table(args.path)
+        if table is None:
+            raise SystemExit(1)
+        mismatch_count = check_calendar_table(table)
+        print(f"검증 완료: 불일치 {mismatch_count}건")
+        raise SystemExit(1 if mismatch_count else 0)
@@ -0,0 +1,144 @@
+import threading
+from datetime import date, timedelta
+import numpy as np
+from typing import Dict, Optional
+from saju_calculator import SajuCalculator
+from calendar_table import build_calendar_table, TABLE_START, TABLE_END, TABLE_DAYS, COL_TERM_MINUTE
+
+# 검색할 수 있는 주 (패턴 키)
+PILLAR_KEYS = ['year_pillar', 'month_pillar', 'day_pillar', 'hour_pillar']
+
+class ChartIndex:
+    """사주 역검색 인덱스 - 네 기둥 패턴에 맞는 생년월일시 구간 검색"""
+
+    def __init__(self, saju_calculator: Optional[SajuCalculator] = None):
+        self.saju_calculator = saju_calculator or SajuCalculator()
+
+        # 달력 테이블 (파일이 없으면 메모리에서 생성)
+        table = self.saju_calculator.calendar_table
+        if table is None:
+            table = build_calendar_table()
+
+        # 하루를 사주가 같은 구간으로 나눔: 시간 구간 14개의 시작 분 + 절입일은 절입 시각
+        bucket_minutes = self.saju_calculator.TIME_BUCKET_BY_MINUTE
+        bucket_starts = np.array([minute for minute in range(1440)
+                                  if minute == 0 or bucket_minutes[minute] != bucket_minutes[minute - 1]])
+
+        days = np.arange(TABLE_DAYS - 1)
+        term_minutes = np.asarray(table[:TABLE_DAYS - 1, COL_TERM_MINUTE]).astype(np.int64)
+        term_days = days[(term_minutes > 0) & ~np.isin(term_minutes, bucket_starts)]
+
+        segment_days = np.concatenate([np.repeat(days, len(bucket_starts)), term_days])
+        segment_starts = np.concatenate([np.tile(bucket_starts, len(days)), term_minutes[term_days]])
+        order = np.lexsort((segment_starts, segment_days))
+        segment_days = segment_days[order]
+        segment_starts = segment_starts[order]
+
+        # 구간 끝 (다음 구간 시작, 그날 마지막 구간은 24:00)
+        segment_ends = np.append(segment_starts[1:], 1440)
+        segment_ends[np.append(segment_days[1:] != segment_days[:-1], True)] = 1440
+
+        # 구간 안에서는 사주가 같으므로 시작 분으로 조회
+        codes = self.saju_calculator._lookup_pillar_codes_batch(np.asarray(table), segment_days, segment_starts)
+
+        self.segment_days = segment_days.astype(np.int32)      # TABLE_START로부터의 일수
+        self.segment_starts = segment_starts.astype(np.int16)  # 자정 기준 분
+        self.segment_ends = segment_ends.astype(np.int16)
+        self.segment_codes = {key: codes[key].astype(np.int8) for key in PILLAR_KEYS}
+
+    def search(self, pattern: Dict[str, Optional[str]], start_year: int, end_year: int,
+               limit: int = 1000) -> Dict[str, any]:
+        """
+        start_year~end_year 사이에서 네 기둥 패턴에 맞는 생년월일시 구간을 찾습니다.
+
+        Args:
+            pattern: 주 이름(year_pillar 등) → 간지 ('庚午'). 없거나 None, '*'이면 모두 허용하며
+                     천간·지지 한 글자만 '*'로 둘 수도 있음 ('庚*', '*午')
+            start_year, end_year: 검색 연도 범위 (1900~2100 안으로 잘림)
+            limit: 반환할 최대 구간 수
+
+        Returns:
+            전체 일치 수와 구간 목록 (날짜, 시작·끝 시각, 네 기둥).
+            잘못된 패턴이면 ValueError가 발생합니다.
+        """
+        first_day = max(date(start_year, 1, 1), TABLE_START)
+        last_day = min(date(end_year, 12, 31), TABLE_END)
+        if first_day > last_day:
+            return {'total': 0, 'results': []}
+
+        # 연도 범위 → 구간 범위 (구간은 날짜순으로 정렬됨)
+        low, high = np.searchsorted(self.segment_days, [(first_day - TABLE_START).days,
+                                                        (last_day - TABLE_START).days + 1])
+        matched = np.ones(high - low, dtype=bool)
+        for key in PILLAR_KEYS:
+            value = pattern.get(key)
+            if value in (None, '', '*', '**'):
+                continue
+            codes = self.segment_codes[key][low:high]
+            stem, branch = self._parse_pillar_pattern(value)
+            if stem is not None:
+                matched &= (codes % 10) == stem
+            if branch is not None:
+                matched &= (codes % 12) == branch
+
+        positions = low + np.flatnonzero(matched)
+        jiazi = self.saju_calculator.JIAZI_CYCLE
+        results = []
+        for position in positions[:limit]:
+            start, end = int(self.segment_starts[position]), int(self.segment_ends[position]) - 1
+            result = {
+                'date': (TABLE_START + timedelta(days=int(self.segment_days[position]))).isoformat(),
+                'start_time': f"{start // 60:02d}:{start % 60:02d}",
+                'end_time': f"{end // 60:02d}:{end % 60:02d}"
+            }
+            for key in PILLAR_KEYS:
+                result[key] = jiazi[self.segment_codes[key][position]]
+            results.append(result)
+
+        return {'total': int(len(positions)), 'results': results}
+
+    def _parse_pillar_pattern(self, value: str):
+        """'庚午' / '庚*' / '*午' → (천간 인덱스 또는 None, 지지 인덱스 또는 None)"""
+        calculator = self.saju_calculator
+        if len(value) != 2:
+            raise ValueError(f"잘못된 간지 패턴입니다: {value}")
+
+        stem = None if value[0] == '*' else calculator.CHEONGAN.index(value[0]) if value[0] in calculator.CHEONGAN else -1
+        branch = None if value[1] == '*' else calculator.JIJI.index(value[1]) if value[1] in calculator.JIJI else -1
+        if stem == -1 or branch == -1:
+            raise ValueError(f"잘못된 간지 패턴입니다: {value}")
+        # 천간·지지 음양이 다르면 60갑자에 없는 조합
+        if stem is not None and branch is not None and stem % 2 != branch % 2:
+            raise ValueError(f"60갑자에 없는 간지입니다: {value}")
+        return stem, branch
+
+
+_shared_index = None
+_shared_index_lock = threading.Lock()
+
+
+def get_chart_index() -> ChartIndex:
+    """처음 사용할 때 한 번만 인덱스를 만들어 공유합니다 (약 100만 구간)."""
+    global _shared_index
+    if _shared_index is None:
+        with _shared_index_lock:
+            if _shared_index is None:
+                _shared_index = ChartIndex()
+    return _shared_index
+
+# 사용 예시
+if __name__ == "__main__":
+    index = ChartIndex()
+
+    # 테스트 1: 네 기둥 모두 지정 (1990-05-15 14:30 → 庚午 辛巳 庚辰 癸未)
+    found = index.search({'year_pillar': '庚午', 'month_pillar': '辛巳',
+                          'day_pillar': '庚辰', 'hour_pillar': '癸未'}, 1900, 2100)
+    print(f"전체 {found['total']}건")
+    for item in found['results']:
+        print(item)
+
+    # 테스트 2: 일주만 지정 (2024년)
+    found2 = index.search({'day_pillar': '甲子'}, 2024, 2024, limit=5)
+    print(f"\n2024년 甲子일 구간 {found2['total']}건 (앞 5건)")
+    for item in found2['results']:
+        print(item)
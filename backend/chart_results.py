@@ -0,0 +1,98 @@
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List
+
+# 오행 분석 결과 키 (analyze_five_elements 딕셔너리와 같은 순서)
+FIVE_ELEMENTS_KEYS = ('day_element', 'five_elements_count', 'strong_elements', 'weak_elements',
+                      'cheongan_combinations')
+
+# 천간 목록(최대 4개) 안의 두 천간 쌍 (i < j) - 천간합 비트마스크의 비트 순서
+STEM_PAIRS = tuple((i, j) for i in range(4) for j in range(i + 1, 4))
+
+
+class SalResult(Mapping):
+    """
+    살 계산 결과 - 네 기둥 60갑자 인덱스와 살별 위치 비트마스크(비트 0~3 = 연·월·일·시주)만 저장합니다.
+    딕셔너리처럼 읽으면 (result['dohwa_sal']) 그때 설명 등을 붙여 기존과 같은 형태의 딕셔너리를 만듭니다.
+    """
+
+    __slots__ = ('codes', 'masks', '_calculator')
+
+    def __init__(self, codes: List[int], masks: List[int], calculator):
+        self.codes = tuple(codes)
+        self.masks = bytes(masks)
+        self._calculator = calculator
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        return self._calculator._render_sal_rule(key, self.codes, self.masks)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._calculator.SAL_KEYS)
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def position_mask(self, key: str) -> int:
+        """살 하나의 위치 비트마스크 (렌더링 없이)"""
+        return self.masks[self._calculator.SAL_INDEX[key]]
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """28개 살을 한 번에 결과 딕셔너리로 변환"""
+        return self._calculator._render_sal_results(list(self.codes), list(self.masks))
+
+    def __repr__(self) -> str:
+        return f"SalResult(codes={self.codes}, masks={self.masks.hex()})"
+
+
+class FiveElementsResult(Mapping):
+    """
+    오행 분석 결과 - 기둥 60갑자 인덱스, 일간, 오행 개수, 천간합 비트마스크(STEM_PAIRS 순서)만 저장합니다.
+    딕셔너리처럼 읽으면 (result['strong_elements']) 그때 오행 이름 등으로 변환합니다.
+    """
+
+    __slots__ = ('codes', 'day_stem', 'counts', 'combination_bits', '_calculator')
+
+    def __init__(self, codes: List[int], day_stem: int, counts: List[int], combination_bits: int, calculator):
+        self.codes = tuple(codes)            # 있는 기둥만 (연·월·일·시 순서)
+        self.day_stem = day_stem             # 일간 인덱스 (없으면 -1)
+        self.counts = tuple(counts)          # 木火土金水 개수
+        self.combination_bits = combination_bits
+        self._calculator = calculator
+
+    def __getitem__(self, key: str) -> Any:
+        calculator = self._calculator
+        names = calculator.FIVE_ELEMENT_NAMES
+        if key == 'day_element':
+            if self.day_stem < 0:
+                return ''
+            return calculator.CHEONGAN_FIVE_ELEMENTS[calculator.CHEONGAN[self.day_stem]]
+        if key == 'five_elements_count':
+            return dict(zip(names, self.counts))
+        if key == 'strong_elements':
+            return [name for name, count in zip(names, self.counts) if count >= 2]
+        if key == 'weak_elements':
+            return [name for name, count in zip(names, self.counts) if count == 0]
+        if key == 'cheongan_combinations':
+            combinations = []
+            for bit, (i, j) in enumerate(STEM_PAIRS):
+                if (self.combination_bits >> bit) & 1:
+                    combo = (calculator.CHEONGAN[self.codes[i] % 10], calculator.CHEONGAN[self.codes[j] % 10])
+                    combinations.append({
+                        'pair': combo,
+                        'result_element': calculator.CHEONGAN_COMBINATIONS[combo]
+                    })
+            return combinations
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIVE_ELEMENTS_KEYS)
+
+    def __len__(self) -> int:
+        return len(FIVE_ELEMENTS_KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """analyze_five_elements가 예전에 반환하던 딕셔너리로 변환"""
+        return {key: self[key] for key in FIVE_ELEMENTS_KEYS}
+
+    def __repr__(self) -> str:
+        return (f"FiveElementsResult(codes={self.codes}, counts={self.counts}, "
+                f"combination_bits={self.combination_bits:06b})")
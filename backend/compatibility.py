@@ -0,0 +1,198 @@
+import numpy as np
+from typing import Dict, List, Optional
+from saju_calculator import SajuCalculator
+
+class CompatibilityCalculator:
+    """궁합 계산 클래스 - 천간합, 지지 육합·충, 오행 보완으로 두 사주의 궁합 점수 계산"""
+
+    def __init__(self, saju_calculator: Optional[SajuCalculator] = None):
+        self.saju_calculator = saju_calculator or SajuCalculator()
+        calculator = self.saju_calculator
+
+        self.FIVE_ELEMENTS = ['木', '火', '土', '金', '水']
+
+        # 지지 육합
+        self.JIJI_COMBINATIONS = [('子', '丑'), ('寅', '亥'), ('卯', '戌'), ('辰', '酉'), ('巳', '申'), ('午', '未')]
+
+        # 지지 충 (정반대 지지)
+        self.JIJI_CLASHES = [('子', '午'), ('丑', '未'), ('寅', '申'), ('卯', '酉'), ('辰', '戌'), ('巳', '亥')]
+
+        # 점수 가중치 (기본 50점, 0~100점으로 자름)
+        self.BASE_SCORE = 50
+        self.SCORE_WEIGHTS = {
+            'day_stem_combination': 15,    # 일간끼리 천간합
+            'day_branch_combination': 10,  # 일지끼리 육합
+            'day_branch_clash': -10,       # 일지끼리 충
+            'stem_combination': 3,         # 네 기둥 천간끼리 천간합 (쌍마다)
+            'branch_combination': 3,       # 네 기둥 지지끼리 육합 (쌍마다)
+            'branch_clash': -3,            # 네 기둥 지지끼리 충 (쌍마다)
+            'complemented_element': 4      # 한쪽에 없는 오행을 상대가 채워줌 (오행마다)
+        }
+
+        # 천간 x 천간 → 천간합 여부 (CHEONGAN_COMBINATIONS 기준)
+        self.STEM_COMBINATION_MATRIX = np.zeros((10, 10), dtype=np.int8)
+        for first, second in calculator.CHEONGAN_COMBINATIONS:
+            self.STEM_COMBINATION_MATRIX[calculator.CHEONGAN.index(first), calculator.CHEONGAN.index(second)] = 1
+
+        # 지지 x 지지 → 육합 / 충 여부
+        self.BRANCH_COMBINATION_MATRIX = np.zeros((12, 12), dtype=np.int8)
+        self.BRANCH_CLASH_MATRIX = np.zeros((12, 12), dtype=np.int8)
+        for matrix, pairs in [(self.BRANCH_COMBINATION_MATRIX, self.JIJI_COMBINATIONS),
+                              (self.BRANCH_CLASH_MATRIX, self.JIJI_CLASHES)]:
+            for first, second in pairs:
+                i, j = calculator.JIJI.index(first), calculator.JIJI.index(second)
+                matrix[i, j] = matrix[j, i] = 1
+
+        # 천간 / 지지 → 오행 원-핫 (오행 분포를 행렬 합으로 계산)
+        self.STEM_ELEMENT_ONEHOT = np.array([
+            [calculator.CHEONGAN_FIVE_ELEMENTS[stem] == element for element in self.FIVE_ELEMENTS]
+            for stem in calculator.CHEONGAN
+        ], dtype=np.int8)
+        self.BRANCH_ELEMENT_ONEHOT = np.array([
+            [calculator.JIJI_FIVE_ELEMENTS[branch] == element for element in self.FIVE_ELEMENTS]
+            for branch in calculator.JIJI
+        ], dtype=np.int8)
+
+        # 60갑자 → 천간·지지에 있는 오행 비트마스크 (木=1, 火=2, 土=4, 金=8, 水=16)
+        element_bits = 1 << np.arange(len(self.FIVE_ELEMENTS))
+        self.JIAZI_ELEMENT_MASK = np.array([
+            (self.STEM_ELEMENT_ONEHOT[code % 10] | self.BRANCH_ELEMENT_ONEHOT[code % 12]) @ element_bits
+            for code in range(60)
+        ], dtype=np.uint8)
+        self.BIT_COUNT = np.array([bin(mask).count('1') for mask in range(32)], dtype=np.int64)
+
+    def calculate_compatibility(self, saju_a: Dict[str, str], saju_b: Dict[str, str]) -> Dict[str, any]:
+        """
+        두 사주의 궁합을 계산합니다.
+
+        Args:
+            saju_a, saju_b: calculate_saju 결과
+
+        Returns:
+            궁합 점수(0~100)와 근거 (천간합, 육합, 충, 보완되는 오행)
+        """
+        try:
+            codes_a = self._saju_to_codes(saju_a)
+            codes_b = self._saju_to_codes(saju_b)
+            calculator = self.saju_calculator
+
+            stems_a, branches_a = codes_a % 10, codes_a % 12
+            stems_b, branches_b = codes_b % 10, codes_b % 12
+
+            stem_combinations = [
+                f"{calculator.CHEONGAN[a]}+{calculator.CHEONGAN[b]}"
+                for a in stems_a for b in stems_b if self.STEM_COMBINATION_MATRIX[a, b]
+            ]
+            branch_combinations = [
+                f"{calculator.JIJI[a]}+{calculator.JIJI[b]}"
+                for a in branches_a for b in branches_b if self.BRANCH_COMBINATION_MATRIX[a, b]
+            ]
+            branch_clashes = [
+                f"{calculator.JIJI[a]}-{calculator.JIJI[b]}"
+                for a in branches_a for b in branches_b if self.BRANCH_CLASH_MATRIX[a, b]
+            ]
+
+            counts_a = self._element_counts(codes_a[None, :])[0]
+            counts_b = self._element_counts(codes_b[None, :])[0]
+            complemented_elements = [
+                element for element, count_a, count_b in zip(self.FIVE_ELEMENTS, counts_a, counts_b)
+                if (count_a == 0) != (count_b == 0)
+            ]
+
+            return {
+                'score': int(self.score_batch(codes_a, codes_b[None, :])[0]),
+                'day_stem_combination': bool(self.STEM_COMBINATION_MATRIX[stems_a[2], stems_b[2]]),
+                'day_branch_combination': bool(self.BRANCH_COMBINATION_MATRIX[branches_a[2], branches_b[2]]),
+                'day_branch_clash': bool(self.BRANCH_CLASH_MATRIX[branches_a[2], branches_b[2]]),
+                'stem_combinations': stem_combinations,       # 천간합
+                'branch_combinations': branch_combinations,   # 지지 육합
+                'branch_clashes': branch_clashes,             # 지지 충
+                'complemented_elements': complemented_elements  # 서로 채워주는 오행
+            }
+
+        except Exception as e:
+            print(f"궁합 계산 오류: {e}")
+            return {}
+
+    def score_batch(self, target_codes: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """
+        한 사주와 여러 사주의 궁합 점수를 행렬 연산으로 한 번에 계산합니다.
+
+        Args:
+            target_codes: 기준 사주의 네 기둥 60갑자 인덱스 (길이 4)
+            codes: 비교할 사주들의 60갑자 인덱스 (N x 4, calculate_saju_batch 결과를 쌓은 것)
+
+        Returns:
+            길이 N의 궁합 점수 배열 (0~100)
+        """
+        target_codes = np.asarray(target_codes, dtype=np.int64)
+        codes = np.asarray(codes, dtype=np.int64)
+        target_stems, target_branches = target_codes % 10, target_codes % 12
+        stems, branches = codes % 10, codes % 12
+
+        # 기준 사주 천간·지지 4개와 합/충이 되는 개수를 값별로 미리 합산 → 상대 천간·지지로 조회
+        stem_combination_counts = self.STEM_COMBINATION_MATRIX[target_stems].sum(axis=0)
+        branch_combination_counts = self.BRANCH_COMBINATION_MATRIX[target_branches].sum(axis=0)
+        branch_clash_counts = self.BRANCH_CLASH_MATRIX[target_branches].sum(axis=0)
+
+        # 오행 보완: 한쪽에만 있는 오행 수 = 오행 비트마스크 XOR의 비트 수
+        target_mask = np.bitwise_or.reduce(self.JIAZI_ELEMENT_MASK[target_codes])
+        masks = np.bitwise_or.reduce(self.JIAZI_ELEMENT_MASK[codes], axis=1)
+        complemented = self.BIT_COUNT[masks ^ target_mask]
+
+        weights = self.SCORE_WEIGHTS
+        score = (self.BASE_SCORE
+                 + weights['day_stem_combination'] * self.STEM_COMBINATION_MATRIX[target_stems[2], stems[:, 2]]
+                 + weights['day_branch_combination'] * self.BRANCH_COMBINATION_MATRIX[target_branches[2], branches[:, 2]]
+                 + weights['day_branch_clash'] * self.BRANCH_CLASH_MATRIX[target_branches[2], branches[:, 2]]
+                 + weights['stem_combination'] * stem_combination_counts[stems].sum(axis=1)
+                 + weights['branch_combination'] * branch_combination_counts[branches].sum(axis=1)
+                 + weights['branch_clash'] * branch_clash_counts[branches].sum(axis=1)
+                 + weights['complemented_element'] * complemented)
+        return np.clip(score, 0, 100)
+
+    def top_matches(self, target_codes: np.ndarray, codes: np.ndarray, k: int = 10,
+                    exclude_index: Optional[int] = None) -> List[tuple]:
+        """궁합 점수 상위 k개의 (행 인덱스, 점수) 목록 (점수 내림차순)"""
+        scores = self.score_batch(target_codes, codes)
+        valid = (np.asarray(codes) >= 0).all(axis=1)
+        if exclude_index is not None:
+            valid[exclude_index] = False
+        candidates = np.flatnonzero(valid)
+        if k <= 0 or len(candidates) == 0:
+            return []
+
+        # 전체 정렬 대신 상위 k개만 골라서 정렬 (같은 점수는 앞 행 우선)
+        k = min(k, len(candidates))
+        rank_keys = -scores[candidates].astype(np.int64) * len(codes) + candidates
+        top = candidates[np.argpartition(rank_keys, k - 1)[:k]]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(int(index), int(scores[index])) for index in top]
+
+    def _element_counts(self, codes: np.ndarray) -> np.ndarray:
+        """네 기둥 60갑자 인덱스 (N x 4) → 오행 개수 (N x 5)"""
+        return (self.STEM_ELEMENT_ONEHOT[codes % 10].sum(axis=1)
+                + self.BRANCH_ELEMENT_ONEHOT[codes % 12].sum(axis=1))
+
+    def _saju_to_codes(self, saju: Dict[str, str]) -> np.ndarray:
+        """calculate_saju 결과 → 네 기둥 60갑자 인덱스 배열"""
+        jiazi = self.saju_calculator.JIAZI_CYCLE
+        return np.array([jiazi.index(saju[pillar])
+                         for pillar in ['year_pillar', 'month_pillar', 'day_pillar', 'hour_pillar']])
+
+# 사용 예시
+if __name__ == "__main__":
+    saju_calculator = SajuCalculator()
+    calculator = CompatibilityCalculator(saju_calculator)
+
+    # 테스트 1: 두 사람의 궁합
+    saju_a = saju_calculator.calculate_saju("1990-05-15", "14:30")
+    saju_b = saju_calculator.calculate_saju("1992-11-03", "08:10")
+    print("궁합:", calculator.calculate_compatibility(saju_a, saju_b))
+
+    # 테스트 2: 한 사람과 여러 사람의 궁합 상위 5명
+    dates = np.datetime64('1980-01-01') + np.arange(0, 10000, 7)
+    batch = saju_calculator.calculate_saju_batch(dates.astype(str), ['12:00'] * len(dates))
+    codes = np.stack([batch[pillar] for pillar in ['year_pillar', 'month_pillar', 'day_pillar', 'hour_pillar']], axis=1)
+    for index, score in calculator.top_matches(calculator._saju_to_codes(saju_a), codes, k=5):
+        print(f"{dates[index]}: {score}점")
@@ -13,5 +13,61 @@ DB_CONFIG = {
     'charset': 'utf8mb4'
 }
 
+# 데이터베이스 연결 풀 (최대 연결 수, 연결 대기 최대 시간(초), 연결 최대 수명(초), 이 시간(초) 넘게 쉰 연결은 ping 후 사용)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+DB_POOL_MAX_LIFETIME = float(os.getenv('DB_POOL_MAX_LIFETIME', '1800'))
+DB_POOL_PING_INTERVAL = float(os.getenv('DB_POOL_PING_INTERVAL', '30'))
+
 # Gemini API 설정
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+
+# 사주/살 계산 캐시 크기 (항목 수)
+SAJU_CACHE_SIZE = int(os.getenv('SAJU_CACHE_SIZE', '65536'))
+SAL_CACHE_SIZE = int(os.getenv('SAL_CACHE_SIZE', '4096'))
+
+# 분석 텍스트 조각 캐시 크기 (살·오행 분석 텍스트, 사주 키별 항목 수)
+ANALYSIS_TEXT_CACHE_SIZE = int(os.getenv('ANALYSIS_TEXT_CACHE_SIZE', '4096'))
+
+# 오늘의 운세 캐시 크기 (일주 60 x 오늘 일진 60 조합, 자정마다 초기화)
+DAILY_FORTUNE_CACHE_SIZE = int(os.getenv('DAILY_FORTUNE_CACHE_SIZE', '3600'))
+
+# Gemini 응답 캐시 (메모리 LRU 항목 수, SQLite 디스크 캐시 경로·유효 시간(초)·최대 항목 수)
+LLM_CACHE_SIZE = int(os.getenv('LLM_CACHE_SIZE', '256'))
+LLM_CACHE_PATH = os.getenv(
+    'LLM_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'llm_cache.sqlite3')
+)
+LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', '86400'))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '10000'))
+
+# 같은 사주 분석 요청 합치기 (끝난 결과를 같은 요청에 돌려줄 시간(초))
+ANALYZE_COALESCE_TTL = float(os.getenv('ANALYZE_COALESCE_TTL', '10'))
+
+# 저장된 사주 분석 결과 재사용 (같은 요청 내용은 분, 같은 멱등성 키는 시간 단위)
+FORTUNE_DEDUPE_MINUTES = int(os.getenv('FORTUNE_DEDUPE_MINUTES', '5'))
+FORTUNE_IDEMPOTENCY_HOURS = int(os.getenv('FORTUNE_IDEMPOTENCY_HOURS', '24'))
+
+# 분석 작업 큐 (작업자 스레드 수, 대기 작업 확인 주기(초), 실행 중 작업을 중단된 것으로 볼 시간(초), 최대 시도 횟수)
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '4'))
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '2'))
+JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '600'))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+
+# 미리 생성한 달력 테이블 경로 (python calendar_table.py build 로 생성)
+CALENDAR_TABLE_PATH = os.getenv(
+    'CALENDAR_TABLE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'calendar_1900_2100.npy')
+)
+
+# 미리 생성한 살 테이블 경로 (python sal_table.py build 로 생성)
+SAL_TABLE_PATH = os.getenv(
+    'SAL_TABLE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sal_masks.npy')
+)
+
+# 12절 절입 시각 표 (KST, 분 단위 - python solar_terms.py generate 로 생성)
+SOLAR_TERMS_PATH = os.getenv(
+    'SOLAR_TERMS_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'solar_terms.csv')
+)
@@ -0,0 +1,212 @@
+import argparse
+import time
+
+import pymysql
+
+from db_pool import get_db_pool
+from fortune_context import FortuneContext
+from rag_system import RAGSystem
+
+
+def find_similar_users_by_queries(rag_system, user_id, max_similar=5):
+    """RAGSystem.find_similar_users의 이전 구현 - 단계별 쿼리를 차례로 실행"""
+    try:
+        # 현재 사용자 정보 조회 (연결을 빌리기 전에)
+        current_user = rag_system.get_user_basic_info(user_id)
+        if not current_user:
+            return []
+        
+        connection = rag_system.get_db_connection()
+        if not connection:
+            return []
+        
+        with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+            similar_users = []
+            
+            # 1. 같은 생년월일을 가진 사용자들 (최우선)
+            cursor.execute("""
+                SELECT u.id, u.name, u.birth_date, u.birth_time, u.message,
+                       p.occupation, p.financial_status, p.interests, 
+                       p.current_challenges, p.goals, p.personality_traits, 
+                       p.relationship_status, p.health_concerns
+                FROM users u
+                LEFT JOIN user_profiles p ON u.id = p.user_id
+                WHERE u.id != %s AND u.birth_date = %s
+                ORDER BY ABS(TIME_TO_SEC(TIMEDIFF(u.birth_time, %s))) ASC
+                LIMIT %s
+            """, (user_id, current_user['birth_date'], current_user['birth_time'], max_similar))
+            
+            same_birthday_users = cursor.fetchall()
+            for user in same_birthday_users:
+                user['similarity_type'] = 'same_birthday'
+                user['similarity_score'] = 1.0
+                similar_users.append(user)
+            
+            # 2. 같은 월일을 가진 사용자들 (2순위)
+            if len(similar_users) < max_similar:
+                current_month = current_user['birth_date'].month
+                current_day = current_user['birth_date'].day
+                
+                cursor.execute("""
+                    SELECT u.id, u.name, u.birth_date, u.birth_time, u.message,
+                           p.occupation, p.financial_status, p.interests, 
+                           p.current_challenges, p.goals, p.personality_traits, 
+                           p.relationship_status, p.health_concerns
+                    FROM users u
+                    LEFT JOIN user_profiles p ON u.id = p.user_id
+                    WHERE u.id != %s AND MONTH(u.birth_date) = %s AND DAY(u.birth_date) = %s
+                    ORDER BY ABS(TIME_TO_SEC(TIMEDIFF(u.birth_time, %s))) ASC
+                    LIMIT %s
+                """, (user_id, current_month, current_day, current_user['birth_time'], max_similar - len(similar_users)))
+                
+                same_monthday_users = cursor.fetchall()
+                for user in same_monthday_users:
+                    user['similarity_type'] = 'same_monthday'
+                    user['similarity_score'] = 0.8
+                    similar_users.append(user)
+            
+            # 3. 비슷한 시간대를 가진 사용자들 (3순위)
+            if len(similar_users) < max_similar:
+                current_time = current_user['birth_time']
+                # 2시간 이내의 시간대
+                cursor.execute("""
+                    SELECT u.id, u.name, u.birth_date, u.birth_time, u.message,
+                           p.occupation, p.financial_status, p.interests, 
+                           p.current_challenges, p.goals, p.personality_traits, 
+                           p.relationship_status, p.health_concerns
+                    FROM users u
+                    LEFT JOIN user_profiles p ON u.id = p.user_id
+                    WHERE u.id != %s AND ABS(TIME_TO_SEC(TIMEDIFF(u.birth_time, %s))) <= 7200
+                    ORDER BY ABS(TIME_TO_SEC(TIMEDIFF(u.birth_time, %s))) ASC
+                    LIMIT %s
+                """, (user_id, current_time, current_time, max_similar - len(similar_users)))
+                
+                similar_time_users = cursor.fetchall()
+                for user in similar_time_users:
+                    user['similarity_type'] = 'similar_time'
+                    user['similarity_score'] = 0.6
+                    similar_users.append(user)
+            
+            # 4. 비슷한 이름을 가진 사용자들 (4순위)
+            if len(similar_users) < max_similar:
+                current_name = current_user['name']
+                # 이름의 첫 글자가 같은 사용자들
+                if len(current_name) > 0:
+                    first_char = current_name[0]
+                    cursor.execute("""
+                        SELECT u.id, u.name, u.birth_date, u.birth_time, u.message,
+                               p.occupation, p.financial_status, p.interests, 
+                               p.current_challenges, p.goals, p.personality_traits, 
+                               p.relationship_status, p.health_concerns
+                        FROM users u
+                        LEFT JOIN user_profiles p ON u.id = p.user_id
+                        WHERE u.id != %s AND u.name LIKE %s
+                        ORDER BY u.created_at DESC
+                        LIMIT %s
+                    """, (user_id, f"{first_char}%", max_similar - len(similar_users)))
+                    
+                    similar_name_users = cursor.fetchall()
+                    for user in similar_name_users:
+                        user['similarity_type'] = 'similar_name'
+                        user['similarity_score'] = 0.4
+                        similar_users.append(user)
+        
+        connection.close()
+        return similar_users[:max_similar]
+        
+    except Exception as e:
+        print(f"유사한 사용자 검색 오류: {e}")
+        return []
+
+
+def load_fortune_context_by_queries(rag_system, user_id):
+    """FortuneContextLoader.load의 이전 구현 - 쿼리를 연결 여러 개로 차례로 실행"""
+    connection = rag_system.get_db_connection()
+    if not connection:
+        return None
+    
+    try:
+        with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+            # 1. 사용자 기본 정보 + 프로필 정보
+            cursor.execute("""
+                SELECT u.name, u.birth_date, u.birth_time, u.message,
+                       p.financial_status, p.occupation, p.interests, 
+                       p.current_challenges, p.goals, p.personality_traits, 
+                       p.relationship_status, p.health_concerns
+                FROM users u
+                LEFT JOIN user_profiles p ON u.id = p.user_id
+                WHERE u.id = %s
+            """, (user_id,))
+            user_data = cursor.fetchone()
+            
+            # 2. 최근 경험들 (최근 5개)
+            cursor.execute("""
+                SELECT experience_text, experience_date, created_at
+                FROM user_experiences
+                WHERE user_id = %s
+                ORDER BY created_at DESC
+                LIMIT 5
+            """, (user_id,))
+            experiences = list(cursor.fetchall())
+            
+            # 3. 과거 사주 분석 결과들 (최근 3개)
+            cursor.execute("""
+                SELECT analysis_result, created_at
+                FROM fortune_analysis
+                WHERE user_id = %s
+                ORDER BY created_at DESC
+                LIMIT 3
+            """, (user_id,))
+            past_analyses = list(cursor.fetchall())
+    finally:
+        connection.close()
+    
+    # 4. 유사한 사용자들
+    similar_users = find_similar_users_by_queries(rag_system, user_id, max_similar=3)
+    return FortuneContext(user_id, user_data, experiences, past_analyses, similar_users)
+
+
+def measure(function, user_ids, repeat: int) -> float:
+    """사용자 하나당 평균 실행 시간 (밀리초, repeat번 중 최솟값)"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for user_id in user_ids:
+            function(user_id)
+        best = min(best, time.perf_counter() - started)
+    return best / len(user_ids) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='사주 분석 컨텍스트 조회 벤치마크 - 쿼리 차례로 실행 vs 다중 문장 쿼리 한 번 (로컬 MySQL 필요)')
+    parser.add_argument('--users', type=int, default=200, help='측정할 사용자 수 (최근 가입순)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (최솟값 사용)')
+    args = parser.parse_args()
+
+    rag_system = RAGSystem()
+    connection = get_db_pool().connection()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT id FROM users ORDER BY id DESC LIMIT %s", (args.users,))
+        user_ids = [row[0] for row in cursor.fetchall()]
+    connection.close()
+    if not user_ids:
+        raise SystemExit("사용자가 없습니다 (database_setup.sql의 샘플 데이터를 넣어주세요)")
+
+    def by_queries(user_id):
+        return rag_system.format_fortune_context(load_fortune_context_by_queries(rag_system, user_id))
+
+    def by_loader(user_id):
+        return rag_system.format_fortune_context(rag_system.context_loader.load(user_id, max_similar=3))
+
+    # 결과 텍스트가 같은지 먼저 확인 (정렬 기준이 같은 행이 여러 개면 순서가 달라질 수 있음)
+    mismatches = sum(1 for user_id in user_ids if by_queries(user_id) != by_loader(user_id))
+
+    # 연결 풀을 채운 뒤 측정 (첫 연결 생성 시간 제외)
+    sequential = measure(by_queries, user_ids, args.repeat)
+    batched = measure(by_loader, user_ids, args.repeat)
+
+    print(f"사용자 {len(user_ids)}명, 결과 불일치 {mismatches}개")
+    print(f"쿼리 차례로 실행 (연결 3개, 쿼리 최대 9번): {sequential:.2f}ms/사용자")
+    print(f"다중 문장 쿼리 한 번 (연결 1개, 왕복 1번): {batched:.2f}ms/사용자 ({sequential / batched:.2f}배)")
+    print(f"연결 풀: {get_db_pool().stats()}")
+    print(f"다중 문장 연결 풀: {get_db_pool(multi_statements=True).stats()}")
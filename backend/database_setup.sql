@@ -1,4 +1,5 @@
 -- 사주 & RAG 시스템 데이터베이스 생성 (한자 처리 최적화)
+-- 최신 스키마 전체 - 이미 만든 DB는 python migrations.py migrate로 변경분만 적용
 CREATE DATABASE IF NOT EXISTS user_info_db CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
 
 -- 데이터베이스 사용
@@ -12,7 +13,14 @@ CREATE TABLE IF NOT EXISTS users (
     birth_time TIME NOT NULL COMMENT '태어난 시간',
     message TEXT NOT NULL COMMENT '할말',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '생성일시',
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '수정일시'
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '수정일시',
+    birth_monthday SMALLINT AS (MONTH(birth_date) * 100 + DAYOFMONTH(birth_date)) VIRTUAL COMMENT '생일 월일 (MMDD)',
+    INDEX idx_users_name (name),
+    INDEX idx_users_birth_date (birth_date),
+    INDEX idx_users_birth_time (birth_time),
+    INDEX idx_users_name_birth (name, birth_date, birth_time, created_at),
+    INDEX idx_users_created_at_id (created_at, id),
+    INDEX idx_users_birth_monthday (birth_monthday)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사용자 정보 테이블';
 
 -- 사용자 프로필 테이블 생성 (RAG용 개인화 데이터)
@@ -29,6 +37,7 @@ CREATE TABLE IF NOT EXISTS user_profiles (
     health_concerns TEXT COMMENT '건강관심사',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '생성일시',
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '수정일시',
+    UNIQUE INDEX uq_user_profiles_user_id (user_id),
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사용자 프로필 테이블';
 
@@ -37,7 +46,10 @@ CREATE TABLE IF NOT EXISTS fortune_analysis (
     id INT AUTO_INCREMENT PRIMARY KEY,
     user_id INT NOT NULL COMMENT '사용자 ID',
     analysis_result TEXT NOT NULL COMMENT '사주 분석 결과',
+    request_hash CHAR(64) COMMENT '정규화한 요청 내용 해시',
+    idempotency_key VARCHAR(100) COMMENT '클라이언트 멱등성 키',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '생성일시',
+    INDEX idx_fortune_analysis_user_created_at (user_id, created_at),
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사주 분석 결과 테이블';
 
@@ -48,13 +60,50 @@ CREATE TABLE IF NOT EXISTS user_experiences (
     experience_text TEXT NOT NULL COMMENT '경험 내용',
     experience_date DATE COMMENT '경험 날짜',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '생성일시',
+    INDEX idx_user_experiences_user_created_at (user_id, created_at),
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사용자 경험 데이터 테이블';
 
--- 한자 처리를 위한 인덱스 추가
-CREATE INDEX idx_users_name ON users(name);
-CREATE INDEX idx_users_birth_date ON users(birth_date);
-CREATE INDEX idx_users_birth_time ON users(birth_time);
+-- 사용자 사주 테이블 생성 (네 기둥 60갑자 인덱스 + 살 보유 비트, 사주 조건 조회용)
+CREATE TABLE IF NOT EXISTS user_charts (
+    user_id INT PRIMARY KEY COMMENT '사용자 ID',
+    year_code TINYINT UNSIGNED NOT NULL COMMENT '연주 60갑자 인덱스',
+    month_code TINYINT UNSIGNED NOT NULL COMMENT '월주 60갑자 인덱스',
+    day_code TINYINT UNSIGNED NOT NULL COMMENT '일주 60갑자 인덱스',
+    hour_code TINYINT UNSIGNED NOT NULL COMMENT '시주 60갑자 인덱스',
+    sal_bits INT UNSIGNED NOT NULL COMMENT '살 보유 비트 (SalCalculator.SAL_KEYS 순서)',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '계산일시',
+    INDEX idx_user_charts_year_code (year_code),
+    INDEX idx_user_charts_month_code (month_code),
+    INDEX idx_user_charts_day_code (day_code),
+    INDEX idx_user_charts_hour_code (hour_code),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사용자 사주 테이블';
+
+-- 사용자 살 테이블 생성 (살 키 + 사용자 ID, 살 조건 조회용)
+CREATE TABLE IF NOT EXISTS user_sal (
+    sal_key VARCHAR(32) NOT NULL COMMENT '살 키 (dohwa_sal 등)',
+    user_id INT NOT NULL COMMENT '사용자 ID',
+    PRIMARY KEY (sal_key, user_id),
+    INDEX idx_user_sal_user_id (user_id),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사용자 살 테이블';
+
+-- 분석 작업 큐 테이블 (비동기 사주 분석, 재시작 시 대기·중단 작업 재실행)
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    id CHAR(32) PRIMARY KEY COMMENT '작업 ID (UUID)',
+    job_type VARCHAR(32) NOT NULL COMMENT '작업 종류 (fortune 등)',
+    status VARCHAR(16) NOT NULL DEFAULT 'queued' COMMENT '상태 (queued, running, done, failed)',
+    progress VARCHAR(32) COMMENT '진행 단계',
+    payload MEDIUMTEXT NOT NULL COMMENT '요청 데이터 (JSON)',
+    result MEDIUMTEXT COMMENT '결과 (JSON)',
+    error TEXT COMMENT '오류 메시지',
+    attempts INT NOT NULL DEFAULT 0 COMMENT '실행 시도 횟수',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '생성일시',
+    started_at TIMESTAMP NULL COMMENT '실행 시작일시',
+    finished_at TIMESTAMP NULL COMMENT '완료일시',
+    INDEX idx_analysis_jobs_status_created_at (status, created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='분석 작업 큐 테이블';
 
 -- 샘플 데이터 삽입 (한자 이름 테스트용)
 INSERT INTO users (name, birth_date, birth_time, message) VALUES
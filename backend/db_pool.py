@@ -0,0 +1,222 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+
+import pymysql
+from pymysql.constants import CLIENT
+
+from config import DB_CONFIG, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_MAX_LIFETIME, DB_POOL_PING_INTERVAL
+
+
+class PooledConnection:
+    """
+    풀에서 빌린 연결 - pymysql 연결처럼 쓰고 close()하면 실제로 끊지 않고 풀에 돌려줍니다.
+    close()를 빠뜨린 채 버려져도(예외 등) 가비지 컬렉션 때 풀에 돌아갑니다.
+    """
+
+    def __init__(self, pool: 'ConnectionPool', connection, created_at: float):
+        self._pool = pool
+        self._connection = connection
+        self._created_at = created_at
+
+    def __getattr__(self, name):
+        if self._connection is None:
+            raise pymysql.err.InterfaceError(0, '풀에 반환된 연결입니다.')
+        return getattr(self._connection, name)
+
+    def close(self) -> None:
+        """풀에 반환 (여러 번 호출해도 한 번만 반환)"""
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            self._pool._release(connection, self._created_at)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        if getattr(self, '_connection', None) is not None:
+            try:
+                self._pool._record('leaked')
+                self.close()
+            except Exception:
+                pass
+
+
+class ConnectionPool:
+    """
+    스레드 안전한 크기 제한 MySQL 연결 풀 - 요청마다 새 TCP 연결·인증을 하지 않고 연결을 재사용합니다.
+    빌려줄 때 오래 쉬었던 연결은 ping으로 확인하고, max_lifetime이 지난 연결은 새로 만듭니다.
+    돌려받을 때 rollback으로 트랜잭션을 끝내 다음 사용자가 이전 스냅샷을 보지 않게 합니다.
+    """
+
+    def __init__(self, maxsize: int = DB_POOL_SIZE, timeout: float = DB_POOL_TIMEOUT,
+                 max_lifetime: float = DB_POOL_MAX_LIFETIME, ping_interval: float = DB_POOL_PING_INTERVAL,
+                 **connect_kwargs):
+        """
+        Args:
+            maxsize: 최대 연결 수 (모두 사용 중이면 반환될 때까지 대기)
+            timeout: 연결을 기다리는 최대 시간(초), 넘으면 TimeoutError
+            max_lifetime: 연결 최대 수명(초) - 서버 wait_timeout보다 짧게
+            ping_interval: 이 시간(초) 넘게 쉬었던 연결은 빌려주기 전에 ping
+        """
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+        self.connect_kwargs = connect_kwargs or DB_CONFIG
+        self._idle = deque()  # (연결, 생성 시각, 반환 시각)
+        self._size = 0        # 만든 연결 수 (사용 중 + 대기 중)
+        self._condition = threading.Condition()
+
+        # 통계
+        self.counters = {'checkouts': 0, 'waits': 0, 'timeouts': 0, 'created': 0, 'expired': 0,
+                         'ping_failures': 0, 'discarded': 0, 'leaked': 0}
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def connection(self) -> PooledConnection:
+        """연결을 빌립니다 (close()로 반환). 연결 생성 오류나 대기 시간 초과는 예외로 전달됩니다."""
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        with self._condition:
+            while not self._idle and self._size >= self.maxsize:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.counters['timeouts'] += 1
+                    raise TimeoutError(f"데이터베이스 연결 대기 시간({self.timeout}초)을 초과했습니다.")
+                waited = True
+                self._condition.wait(remaining)
+            entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                self._size += 1
+
+        try:
+            connection, created_at = self._checkout(entry)
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+        wait_ms = (time.perf_counter() - started) * 1000
+        with self._condition:
+            self.counters['checkouts'] += 1
+            if waited:
+                self.counters['waits'] += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        return PooledConnection(self, connection, created_at)
+
+    def _checkout(self, entry):
+        """대기 중이던 연결 확인(수명·ping), 쓸 수 없거나 없으면 새로 연결"""
+        now = time.monotonic()
+        if entry is not None:
+            connection, created_at, released_at = entry
+            if now - created_at >= self.max_lifetime:
+                self._record('expired')
+                self._close_quietly(connection)
+            elif now - released_at < self.ping_interval:
+                return connection, created_at
+            else:
+                try:
+                    connection.ping(reconnect=False)
+                    return connection, created_at
+                except Exception:
+                    self._record('ping_failures')
+                    self._close_quietly(connection)
+
+        connection = pymysql.connect(**self.connect_kwargs)
+        self._record('created')
+        return connection, time.monotonic()
+
+    def _release(self, connection, created_at: float) -> None:
+        """반환된 연결의 트랜잭션을 끝내고 대기열에 넣음 (rollback에 실패하거나 수명이 지났으면 닫음)"""
+        reusable = time.monotonic() - created_at < self.max_lifetime
+        if reusable:
+            try:
+                connection.rollback()
+            except Exception:
+                self._record('discarded')
+                reusable = False
+        if not reusable:
+            self._close_quietly(connection)
+
+        with self._condition:
+            if reusable:
+                self._idle.append((connection, created_at, time.monotonic()))
+            else:
+                self._size -= 1
+            self._condition.notify()
+
+    def _record(self, counter: str) -> None:
+        with self._condition:
+            self.counters[counter] += 1
+
+    @staticmethod
+    def _close_quietly(connection) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_idle(self) -> None:
+        """대기 중인 연결을 모두 닫음 (사용 중인 연결은 반환될 때 다시 대기열에 들어감)"""
+        with self._condition:
+            entries = list(self._idle)
+            self._idle.clear()
+            self._size -= len(entries)
+            self._condition.notify_all()
+        for connection, _, _ in entries:
+            self._close_quietly(connection)
+
+    def stats(self) -> Dict[str, Any]:
+        """연결 수와 대기 시간 통계 (풀 크기 조정용)"""
+        with self._condition:
+            checkouts = self.counters['checkouts']
+            return {
+                'maxsize': self.maxsize,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                **self.counters,
+                'avg_wait_ms': round(self.total_wait_ms / checkouts, 3) if checkouts else 0.0,
+                'max_wait_ms': round(self.max_wait_ms, 3)
+            }
+
+
+_shared_pools: Dict[bool, ConnectionPool] = {}
+_shared_pool_lock = threading.Lock()
+
+
+def get_db_pool(multi_statements: bool = False) -> ConnectionPool:
+    """
+    app.py와 RAGSystem 등이 함께 쓰는 연결 풀 (처음 사용할 때 생성).
+    multi_statements=True는 다중 문장 쿼리를 허용하는 별도 풀 - 고정 쿼리만 보내는 곳(fortune_context)에서만 사용합니다.
+    """
+    pool = _shared_pools.get(multi_statements)
+    if pool is None:
+        with _shared_pool_lock:
+            pool = _shared_pools.get(multi_statements)
+            if pool is None:
+                connect_kwargs = dict(DB_CONFIG)
+                if multi_statements:
+                    connect_kwargs['client_flag'] = CLIENT.MULTI_STATEMENTS
+                pool = _shared_pools[multi_statements] = ConnectionPool(**connect_kwargs)
+    return pool
+
+
+# 사용 예시
+if __name__ == "__main__":
+    pool = get_db_pool()
+    for _ in range(3):
+        connection = pool.connection()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT CONNECTION_ID()")
+            print(f"연결 ID: {cursor.fetchone()[0]}")
+        connection.close()
+    print(pool.stats())
@@ -1,39 +1,118 @@
 import google.generativeai as genai
-from config import GEMINI_API_KEY
-from datetime import datetime
+from config import GEMINI_API_KEY, DAILY_FORTUNE_CACHE_SIZE
+from datetime import datetime, date
 import json
+import threading
+import time
 from saju_calculator import SajuCalculator
 from sal_calculator import SalCalculator
+from luck_calculator import LuckCalculator
+from memo_cache import DailyMemoCache
+from llm_cache import LLMResponseCache
+
+# 분석 실패 시 analysis 텍스트 머리말 (저장된 결과에서 오류 결과를 거를 때 사용)
+ANALYSIS_ERROR_PREFIX = "사주 분석 중 오류가 발생했습니다"
 
 class FortuneAnalyzer:
+    # (타고난 일주, 오늘 일진) → 오늘의 운세. 같은 일주를 가진 사용자끼리 공유하며 자정마다 초기화
+    _daily_fortune_cache = DailyMemoCache(DAILY_FORTUNE_CACHE_SIZE)
+
+    # (모델 이름, 프롬프트) 해시 → Gemini 응답 (메모리 LRU + SQLite 디스크, TTL). 같은 프롬프트는 다시 호출하지 않음
+    # 모듈을 import만 해도 SQLite 파일이 생기지 않도록 분석기를 처음 만들 때 생성 (_get_llm_cache)
+    _llm_cache = None
+    _llm_cache_lock = threading.Lock()
+
+    # 사용할 Gemini 모델
+    MODEL_NAME = 'gemini-1.5-flash'
+
     def __init__(self):
         if not GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다.")
         
         genai.configure(api_key=GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.model = genai.GenerativeModel(self.MODEL_NAME)
         self.saju_calculator = SajuCalculator()
-        self.sal_calculator = SalCalculator()
+        self.sal_calculator = SalCalculator(self.saju_calculator)
+        self.luck_calculator = LuckCalculator(self.saju_calculator)
+        self._llm_cache = self._get_llm_cache()
     
     
-    def analyze_fortune(self, name, birth_date, birth_time, message="", profile_data=None, user_id=None, rag_context=""):
+    def analyze_fortune(self, name, birth_date, birth_time, message="", profile_data=None, user_id=None, rag_context="", gender=None):
         """
         생년월일시와 사용자 프로필, RAG 컨텍스트를 기반으로 사주를 분석합니다.
+        성별이 있으면 대운까지, 없으면 세운만 계산해 프롬프트에 넣습니다.
+        """
+        return self.analyze_fortune_with_timings(name, birth_date, birth_time, message, profile_data,
+                                                 user_id, rag_context, gender)['analysis']
+
+    def analyze_fortune_with_timings(self, name, birth_date, birth_time, message="", profile_data=None,
+                                     user_id=None, rag_context="", gender=None):
+        """
+        analyze_fortune과 같은 분석을 하고, 분석 텍스트와 함께 사주와 단계별 소요 시간(ms)을 반환합니다.
+        사주는 한 번만 계산해 살·오행·대운 계산과 프롬프트 생성에 그대로 넘깁니다.
+
+        Returns:
+            {'analysis': 분석 텍스트, 'saju': 사주팔자,
+             'timings': {'chart', 'five_elements', 'sal', 'luck', 'render', 'llm', 'total'}}
         """
+        timings = {}
         try:
-            # 생년월일시를 한국어로 변환 (시간 형식 처리)
-            # birth_time이 "HH:MM:SS" 또는 "HH:MM" 형식일 수 있음
-            if len(birth_time.split(':')) == 3:
-                # "HH:MM:SS" 형식
-                birth_datetime = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M:%S")
-            else:
-                # "HH:MM" 형식
-                birth_datetime = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M")
+            prompt, chart = self.build_fortune_prompt(name, birth_date, birth_time, message, profile_data,
+                                                      rag_context, gender, timings)
+            
+            started = time.perf_counter()
+            analysis = self._llm_cache.generate(self.model, self.MODEL_NAME, prompt)
+            self._record_timing(timings, 'llm', started)
+            
+            return {'analysis': analysis, 'saju': chart['saju'], 'timings': self._with_total(timings)}
             
-            # 프로필 정보를 포함한 프롬프트 생성
-            profile_context = ""
-            if profile_data:
-                profile_context = f"""
+        except Exception as e:
+            print(f"사주 분석 오류: {e}")
+            return {'analysis': f"{ANALYSIS_ERROR_PREFIX}: {str(e)}", 'saju': {},
+                    'timings': self._with_total(timings)}
+
+    def stream_fortune(self, name, birth_date, birth_time, message="", profile_data=None,
+                       rag_context="", gender=None, timings=None):
+        """
+        analyze_fortune의 스트리밍 버전 - 프롬프트는 바로 만들고(잘못된 입력이면 여기서 예외),
+        Gemini 응답 텍스트 조각을 생성되는 대로 내보내는 이터레이터를 반환합니다.
+        """
+        prompt, _ = self.build_fortune_prompt(name, birth_date, birth_time, message, profile_data,
+                                              rag_context, gender, timings)
+        return self.stream_text(prompt)
+
+    def generate_text(self, prompt):
+        """프롬프트의 Gemini 응답 전체 텍스트 (응답 캐시 사용, 모델 호출 오류는 그대로 전달)"""
+        return self._llm_cache.generate(self.model, self.MODEL_NAME, prompt)
+
+    def stream_text(self, prompt):
+        """프롬프트의 Gemini 응답을 조각 단위로 내보냄 (응답 캐시에 있으면 한 번에, 끝까지 받으면 캐시에 저장)"""
+        return self._llm_cache.stream(self.model, self.MODEL_NAME, prompt)
+
+    def build_fortune_prompt(self, name, birth_date, birth_time, message="", profile_data=None,
+                             rag_context="", gender=None, timings=None):
+        """
+        사주를 계산하고 Gemini에 보낼 사주 분석 프롬프트를 만듭니다 (analyze_fortune과 스트리밍이 같이 사용).
+        잘못된 생년월일시면 예외가 그대로 전달됩니다.
+
+        Returns:
+            (프롬프트, prepare_chart 결과)
+        """
+        timings = {} if timings is None else timings
+
+        # 생년월일시를 한국어로 변환 (시간 형식 처리)
+        # birth_time이 "HH:MM:SS" 또는 "HH:MM" 형식일 수 있음
+        if len(birth_time.split(':')) == 3:
+            # "HH:MM:SS" 형식
+            birth_datetime = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M:%S")
+        else:
+            # "HH:MM" 형식
+            birth_datetime = datetime.strptime(f"{birth_date} {birth_time}", "%Y-%m-%d %H:%M")
+        
+        # 프로필 정보를 포함한 프롬프트 생성
+        profile_context = ""
+        if profile_data:
+            profile_context = f"""
             === 사용자 현재 상황 ===
             재정상태: {profile_data.get('financial_status', '미입력')}
             직업: {profile_data.get('occupation', '미입력')}
@@ -44,26 +123,27 @@ class FortuneAnalyzer:
             연애상태: {profile_data.get('relationship_status', '미입력')}
             건강관심사: {profile_data.get('health_concerns', '미입력')}
             """
-            
-            # RAG 컨텍스트 추가 (유사한 사용자 데이터 포함)
-            rag_context_section = ""
-            if rag_context:
-                rag_context_section = f"""
+        
+        # RAG 컨텍스트 추가 (유사한 사용자 데이터 포함)
+        rag_context_section = ""
+        if rag_context:
+            rag_context_section = f"""
             === 과거 데이터 및 유사한 사용자 데이터 기반 개인화 정보 ===
             {rag_context}
             """
-            
-            
-            # 사주팔자 계산
-            saju_result = self.saju_calculator.calculate_saju(birth_date, birth_time)
-            saju_analysis = self.saju_calculator.get_detailed_analysis(saju_result)
-            
-            # 살(煞) 계산
-            sal_result = self.sal_calculator.calculate_sal(birth_date, birth_time)
-            sal_analysis = self.sal_calculator.get_sal_analysis(sal_result)
-            
-            # 사주 분석을 위한 프롬프트 생성
-            prompt = f"""
+        
+        
+        # 사주팔자를 한 번 계산해 살·오행·대운·세운까지 계산
+        chart = self.prepare_chart(birth_date, birth_time, gender, timings)
+        
+        # 분석 텍스트와 프롬프트 생성
+        started = time.perf_counter()
+        saju_analysis = self.saju_calculator.get_detailed_analysis(chart['saju'], chart['five_elements'])
+        sal_analysis = self.sal_calculator.get_sal_analysis_for_saju(chart['saju'], chart['sal'])
+        luck_analysis = self.luck_calculator.get_luck_analysis(chart['luck'])
+        
+        # 사주 분석을 위한 프롬프트 생성
+        prompt = f"""
             다음 정보를 바탕으로 개인화된 사주를 분석해주세요:
             - 존댓말을 사용해라.
             === 기본 정보 ===
@@ -78,6 +158,9 @@ class FortuneAnalyzer:
             
             === 계산된 살(煞) 분석 ===
             {sal_analysis}
+            
+            === 계산된 대운·세운 ===
+            {luck_analysis}
 
             === 분석 요청사항 ===
             위의 계산된 사주팔자, 계산된 살(煞) 분석, 현재 상황, 과거 데이터를 종합하여 다음 항목들을 분석해주세요:
@@ -90,7 +173,7 @@ class FortuneAnalyzer:
             7. 연애운 (현재 관계상태와 과거 경험 고려, 사주팔자 고려, 살 고려)
             8. 건강운 (건강관심사와 과거 경험 고려, 사주팔자 고려, 살 고려)
             9. 금전운 (재정상태와 과거 경험 고려, 사주팔자 고려, 살 고려)
-            10. 올해 내년 말년의 운세 (현재 고민, 목표, 과거 패턴 고려, 사주팔자 고려, 살 고려)
+            10. 올해 내년 말년의 운세 (계산된 세운·대운 기준, 현재 고민, 목표, 과거 패턴 고려, 사주팔자 고려, 살 고려)
             11. 추가 메세지를 사주를 토대로 답변해줘
 
             === 분석 지침 ===
@@ -104,6 +187,7 @@ class FortuneAnalyzer:
             - 꼭 긍정적인 말만 하지않고 부정적인 말도해줘 그렇다고 부정적인 말만하지는 말고 조화롭게 얘기해줘
             - 각 항목을 구체적이고 실행 가능한 조언으로 작성
             - 과거 데이터와 유사한 사용자 데이터에서 발견된 패턴이나 경향을 활용하여 더 정확한 예측 제공
+            - 올해, 내년, 말년의 운세는 계산된 대운·세운의 간지를 그대로 사용하고 새로 만들지 말 것
             === 출력 형식 지침 ===
             - 각 항목은 반드시 "번호. 제목" 형태로 시작해야 합니다 (예: "1. 계산된 사주팔자 상세 해석")
             - 내용 중간에 빈 줄이 있어도 괜찮지만, 각 항목은 명확히 구분되어야 합니다
@@ -112,11 +196,139 @@ class FortuneAnalyzer:
             - 마크다운 문법이나 특수 기호는 사용하지 말고 순수한 텍스트로만 작성해주세요
             - 계산된 사주팔자 상세 해석 의 경우에는 줄글보다는 좀 더 한눈에 알아보기 쉽게 출력해줘 
             """
-            
-            response = self.model.generate_content(prompt)
-            return response.text
-            
+        self._record_timing(timings, 'render', started)
+        return prompt, chart
+
+    def prepare_chart(self, birth_date, birth_time, gender=None, timings=None):
+        """
+        사주팔자를 한 번 계산하고, 그 결과로 오행·살·대운·세운을 계산합니다.
+        timings 딕셔너리를 넘기면 단계별 소요 시간(ms)을 기록합니다.
+
+        Returns:
+            {'saju', 'five_elements', 'sal', 'luck'} (잘못된 입력이면 각 값은 빈 딕셔너리).
+            five_elements와 sal은 정수 코드만 담은 결과(FiveElementsResult, SalResult)이며 딕셔너리처럼 읽을 수 있음
+        """
+        timings = {} if timings is None else timings
+
+        # 날짜 파싱과 네 기둥 계산은 여기서 한 번만 (대운·세운도 이 결과를 사용)
+        started = time.perf_counter()
+        try:
+            birth_datetime = self.saju_calculator._parse_birth_datetime(birth_date, birth_time)
+            saju = self.saju_calculator.calculate_saju_from_datetime(birth_datetime, birth_date, birth_time)
         except Exception as e:
-            print(f"사주 분석 오류: {e}")
-            return f"사주 분석 중 오류가 발생했습니다: {str(e)}"
-    
+            print(f"사주 계산 오류: {e}")
+            birth_datetime, saju = None, {}
+        self._record_timing(timings, 'chart', started)
+
+        started = time.perf_counter()
+        five_elements = self.saju_calculator.analyze_five_elements(saju)
+        self._record_timing(timings, 'five_elements', started)
+
+        started = time.perf_counter()
+        sal = self.sal_calculator.calculate_sal_result(saju) or {}
+        self._record_timing(timings, 'sal', started)
+
+        # 대운·세운 계산 (모델이 운세 흐름을 직접 지어내지 않도록)
+        started = time.perf_counter()
+        if saju:
+            jiazi_code = self.saju_calculator.JIAZI_CODE
+            luck = self.luck_calculator.calculate_luck_from_chart(
+                birth_datetime, jiazi_code[saju['year_pillar']], jiazi_code[saju['month_pillar']], gender)
+        else:
+            luck = {}
+        self._record_timing(timings, 'luck', started)
+
+        return {'saju': saju, 'five_elements': five_elements, 'sal': sal, 'luck': luck}
+
+    def _record_timing(self, timings, stage, started):
+        """단계 소요 시간 기록 (ms)"""
+        timings[stage] = round((time.perf_counter() - started) * 1000, 3)
+
+    def _with_total(self, timings):
+        """단계별 소요 시간에 합계 추가"""
+        return {**timings, 'total': round(sum(timings.values()), 3)}
+
+    def analyze_daily_fortune(self, birth_date, birth_time, today=None):
+        """
+        타고난 일주와 오늘 일진으로 오늘의 운세를 생성합니다.
+        결과는 (일주, 일진) 조합으로 캐시되어 같은 일주를 가진 사용자는 Gemini 호출 없이 받습니다.
+        """
+        try:
+            today = today or date.today()
+
+            # 타고난 일주와 오늘 일진 (정오 기준)
+            natal_saju = self.saju_calculator.calculate_saju(birth_date, birth_time)
+            today_saju = self.saju_calculator.calculate_saju(today.isoformat(), "12:00")
+            if not natal_saju or not today_saju:
+                return {}
+
+            natal_day_pillar = natal_saju['day_pillar']
+            today_pillar = today_saju['day_pillar']
+            cache_key = (natal_day_pillar, today_pillar)
+
+            fortune = self._daily_fortune_cache.get(cache_key)
+            cached = fortune is not None
+            if not cached:
+                fortune = self._generate_daily_fortune(natal_day_pillar, today_pillar, today)
+                self._daily_fortune_cache.put(cache_key, fortune)
+
+            return {
+                'date': today.isoformat(),
+                'day_pillar': natal_day_pillar,      # 타고난 일주
+                'today_pillar': today_pillar,        # 오늘 일진
+                'fortune': fortune,
+                'cached': cached
+            }
+
+        except Exception as e:
+            print(f"오늘의 운세 분석 오류: {e}")
+            return {}
+
+    def _generate_daily_fortune(self, natal_day_pillar, today_pillar, today):
+        """일주와 일진만으로 오늘의 운세 생성 (여러 사용자가 공유하므로 개인 정보는 넣지 않음)"""
+        natal_element = self.saju_calculator.CHEONGAN_FIVE_ELEMENTS[natal_day_pillar[0]]
+        today_element = self.saju_calculator.CHEONGAN_FIVE_ELEMENTS[today_pillar[0]]
+
+        prompt = f"""
+            다음 정보를 바탕으로 오늘의 운세를 알려주세요:
+            - 존댓말을 사용해라.
+            === 기본 정보 ===
+            날짜: {today.strftime('%Y년 %m월 %d일')}
+            타고난 일주: {natal_day_pillar} (일간 五行: {natal_element})
+            오늘 일진: {today_pillar} (五行: {today_element})
+
+            === 분석 요청사항 ===
+            일주와 오늘 일진의 관계(천간합, 충, 五行의 생극)를 바탕으로 다음 항목을 짧게 알려주세요:
+            1. 오늘의 총운
+            2. 금전운
+            3. 연애운
+            4. 건강운
+            5. 오늘의 조언
+
+            === 출력 형식 지침 ===
+            - 각 항목은 반드시 "번호. 제목" 형태로 시작해야 합니다
+            - 각 항목은 2~3문장으로 작성해주세요
+            - * 문자를 절대로 사용하지 말아라
+            - 마크다운 문법이나 특수 기호는 사용하지 말고 순수한 텍스트로만 작성해주세요
+            """
+
+        return self._llm_cache.generate(self.model, self.MODEL_NAME, prompt)
+
+    @classmethod
+    def daily_cache_stats(cls):
+        """오늘의 운세 캐시 적중/미스 통계"""
+        return cls._daily_fortune_cache.stats()
+
+    @classmethod
+    def _get_llm_cache(cls):
+        """처음 사용할 때 한 번만 Gemini 응답 캐시를 만들어 모든 인스턴스가 공유합니다."""
+        if cls._llm_cache is None:
+            with cls._llm_cache_lock:
+                if cls._llm_cache is None:
+                    cls._llm_cache = LLMResponseCache()
+        return cls._llm_cache
+
+    @classmethod
+    def llm_cache_stats(cls):
+        """Gemini 응답 캐시 적중률과 절약한 호출 시간 (분석기를 만든 적이 없으면 None)"""
+        return cls._llm_cache.stats() if cls._llm_cache is not None else None
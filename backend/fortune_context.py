@@ -0,0 +1,185 @@
+from typing import Any, Dict, List, Optional
+
+import pymysql
+
+from db_pool import get_db_pool
+
+# 사용자 기본 정보 + 프로필 컬럼 (유사 사용자 조회 공통)
+USER_COLUMNS = """
+    u.id, u.name, u.birth_date, u.birth_time, u.message,
+    p.occupation, p.financial_status, p.interests,
+    p.current_challenges, p.goals, p.personality_traits,
+    p.relationship_status, p.health_concerns
+"""
+
+# 사주 분석 컨텍스트 (사용자·프로필, 최근 경험 5개, 과거 분석 3개) - 인자: user_id 3번
+CONTEXT_STATEMENTS = [
+    """
+    SELECT u.name, u.birth_date, u.birth_time, u.message,
+           p.financial_status, p.occupation, p.interests,
+           p.current_challenges, p.goals, p.personality_traits,
+           p.relationship_status, p.health_concerns
+    FROM users u
+    LEFT JOIN user_profiles p ON u.id = p.user_id
+    WHERE u.id = %s
+    """,
+    """
+    SELECT experience_text, experience_date, created_at
+    FROM user_experiences
+    WHERE user_id = %s
+    ORDER BY created_at DESC
+    LIMIT 5
+    """,
+    """
+    SELECT analysis_result, created_at
+    FROM fortune_analysis
+    WHERE user_id = %s
+    ORDER BY created_at DESC
+    LIMIT 3
+    """
+]
+
+# 유사 사용자 4단계 (같은 생년월일 → 같은 월일 → 2시간 이내 시간대 → 이름 첫 글자)
+# 기준 사용자(me)를 조인해 앞 단계 결과 없이 한 번에 실행 - 인자: (user_id, limit) 4번
+# 월일은 users.birth_monthday 생성 컬럼, 시간대는 birth_time 범위 조건으로 인덱스를 씀 (migrations.py 7번)
+SIMILAR_USER_TIERS = [
+    ('same_birthday', 1.0, f"""
+    SELECT {USER_COLUMNS}
+    FROM users me
+    JOIN users u ON u.id != me.id AND u.birth_date = me.birth_date
+    LEFT JOIN user_profiles p ON u.id = p.user_id
+    WHERE me.id = %s
+    ORDER BY ABS(TIME_TO_SEC(TIMEDIFF(u.birth_time, me.birth_time))) ASC
+    LIMIT %s
+    """),
+    ('same_monthday', 0.8, f"""
+    SELECT {USER_COLUMNS}
+    FROM users me
+    JOIN users u ON u.id != me.id AND u.birth_monthday = me.birth_monthday
+    LEFT JOIN user_profiles p ON u.id = p.user_id
+    WHERE me.id = %s
+    ORDER BY ABS(TIME_TO_SEC(TIMEDIFF(u.birth_time, me.birth_time))) ASC
+    LIMIT %s
+    """),
+    ('similar_time', 0.6, f"""
+    SELECT {USER_COLUMNS}
+    FROM users me
+    JOIN users u ON u.id != me.id AND u.birth_time BETWEEN SUBTIME(me.birth_time, '02:00:00')
+                                             AND ADDTIME(me.birth_time, '02:00:00')
+    LEFT JOIN user_profiles p ON u.id = p.user_id
+    WHERE me.id = %s
+    ORDER BY ABS(TIME_TO_SEC(TIMEDIFF(u.birth_time, me.birth_time))) ASC
+    LIMIT %s
+    """),
+    ('similar_name', 0.4, f"""
+    SELECT {USER_COLUMNS}
+    FROM users me
+    JOIN users u ON u.id != me.id AND u.name LIKE CONCAT(LEFT(me.name, 1), '%%')
+    LEFT JOIN user_profiles p ON u.id = p.user_id
+    WHERE me.id = %s AND CHAR_LENGTH(me.name) > 0
+    ORDER BY u.created_at DESC
+    LIMIT %s
+    """)
+]
+
+
+class FortuneContext:
+    """
+    사주 분석 컨텍스트 - 한 사용자의 분석에 필요한 DB 데이터 (행은 DictCursor 딕셔너리 그대로).
+    텍스트 변환은 RAGSystem.format_fortune_context가 합니다.
+    """
+
+    __slots__ = ('user_id', 'user', 'experiences', 'past_analyses', 'similar_users')
+
+    def __init__(self, user_id: int, user: Optional[Dict[str, Any]], experiences: List[Dict[str, Any]],
+                 past_analyses: List[Dict[str, Any]], similar_users: List[Dict[str, Any]]):
+        self.user_id = user_id
+        self.user = user                    # 사용자 기본 정보 + 프로필 (없으면 None)
+        self.experiences = experiences      # 최근 경험 (최신순, 최대 5개)
+        self.past_analyses = past_analyses  # 과거 사주 분석 (최신순, 최대 3개)
+        self.similar_users = similar_users  # 유사 사용자 (similarity_type, similarity_score 포함)
+
+    def __repr__(self) -> str:
+        return (f"FortuneContext(user_id={self.user_id}, user={'있음' if self.user else '없음'}, "
+                f"experiences={len(self.experiences)}, past_analyses={len(self.past_analyses)}, "
+                f"similar_users={len(self.similar_users)})")
+
+
+class FortuneContextLoader:
+    """
+    사주 분석 컨텍스트를 한 번의 왕복으로 조회 - 사용자·경험·과거 분석·유사 사용자 4단계 쿼리 7개를
+    다중 문장 쿼리 하나로 보내고 결과 집합을 차례로 읽습니다 (기존: 연결 3개, 쿼리 최대 9번).
+    다중 문장은 이 모듈의 고정 쿼리만 보내는 전용 연결 풀(multi_statements=True)에서만 허용합니다.
+    """
+
+    def __init__(self, pool=None):
+        self._pool = pool
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = get_db_pool(multi_statements=True)
+        return self._pool
+
+    def load(self, user_id: int, max_similar: int = 3) -> FortuneContext:
+        """사주 분석 컨텍스트 조회 (연결·쿼리 오류는 그대로 전달)"""
+        statements = [sql.strip() for sql in CONTEXT_STATEMENTS]
+        args = [user_id] * len(CONTEXT_STATEMENTS)
+        for _, _, sql in SIMILAR_USER_TIERS:
+            statements.append(sql.strip())
+            args.extend([user_id, max_similar])
+
+        result_sets = self._fetch_result_sets(statements, args)
+
+        user_rows, experiences, past_analyses = result_sets[:3]
+        return FortuneContext(
+            user_id,
+            user_rows[0] if user_rows else None,
+            experiences,
+            past_analyses,
+            self.merge_similar_users(result_sets[3:], max_similar)
+        )
+
+    def load_similar_users(self, user_id: int, max_similar: int = 5) -> List[Dict[str, Any]]:
+        """유사 사용자 4단계만 한 번에 조회"""
+        statements = [sql.strip() for _, _, sql in SIMILAR_USER_TIERS]
+        args = [user_id, max_similar] * len(SIMILAR_USER_TIERS)
+
+        result_sets = self._fetch_result_sets(statements, args)
+        return self.merge_similar_users(result_sets, max_similar)
+
+    @staticmethod
+    def merge_similar_users(tier_rows: List[List[Dict[str, Any]]], max_similar: int) -> List[Dict[str, Any]]:
+        """
+        단계별 결과를 앞 단계부터 채움 (단계마다 최대 max_similar개를 받아 남은 자리만큼 사용).
+        기존처럼 단계 사이 중복은 제거하지 않습니다.
+        """
+        similar_users = []
+        for (similarity_type, similarity_score, _), rows in zip(SIMILAR_USER_TIERS, tier_rows):
+            for user in rows[:max_similar - len(similar_users)]:
+                user['similarity_type'] = similarity_type
+                user['similarity_score'] = similarity_score
+                similar_users.append(user)
+        return similar_users
+
+    def _fetch_result_sets(self, statements: List[str], args: List[Any]) -> List[List[Dict[str, Any]]]:
+        """문장들을 다중 문장 쿼리 하나로 실행하고 문장별 결과 행 목록을 반환"""
+        connection = self.pool.connection()
+        try:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(";\n".join(statements), args)
+                result_sets = [list(cursor.fetchall())]
+                while cursor.nextset():
+                    result_sets.append(list(cursor.fetchall()))
+            return result_sets
+        finally:
+            connection.close()
+
+
+# 사용 예시
+if __name__ == "__main__":
+    loader = FortuneContextLoader()
+    context = loader.load(1)
+    print(context)
+    for user in context.similar_users:
+        print(f"{user['name']} ({user['similarity_type']}, {user['similarity_score']})")
@@ -0,0 +1,296 @@
+import json
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+import pymysql
+
+from db_pool import get_db_pool
+from config import JOB_WORKERS, JOB_POLL_INTERVAL, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS
+
+# 작업 상태: queued(대기) → running(실행 중) → done(완료) / failed(실패)
+CREATE_ANALYSIS_JOBS_TABLE = """
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    id CHAR(32) PRIMARY KEY COMMENT '작업 ID (UUID)',
+    job_type VARCHAR(32) NOT NULL COMMENT '작업 종류 (fortune 등)',
+    status VARCHAR(16) NOT NULL DEFAULT 'queued' COMMENT '상태 (queued, running, done, failed)',
+    progress VARCHAR(32) COMMENT '진행 단계',
+    payload MEDIUMTEXT NOT NULL COMMENT '요청 데이터 (JSON)',
+    result MEDIUMTEXT COMMENT '결과 (JSON)',
+    error TEXT COMMENT '오류 메시지',
+    attempts INT NOT NULL DEFAULT 0 COMMENT '실행 시도 횟수',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '생성일시',
+    started_at TIMESTAMP NULL COMMENT '실행 시작일시',
+    finished_at TIMESTAMP NULL COMMENT '완료일시',
+    INDEX idx_analysis_jobs_status_created_at (status, created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='분석 작업 큐 테이블'
+"""
+
+# 가장 오래된 대기 작업 후보 (작업자 수 + 1개) - 인자: (limit,)
+QUEUED_JOBS_SQL = """
+    SELECT id FROM analysis_jobs
+    WHERE status = 'queued'
+    ORDER BY created_at
+    LIMIT %s
+"""
+
+
+class AnalysisJobQueue:
+    """
+    DB 테이블 기반 분석 작업 큐 - 요청은 작업 ID만 받고 바로 돌아가며, 정해진 수의 작업자 스레드가 실행합니다.
+    작업은 analysis_jobs 테이블에 저장되므로 서버가 재시작되어도 대기·실행 중이던 작업을 다시 실행합니다.
+    여러 프로세스가 같은 테이블을 써도 상태를 조건부 UPDATE로 바꿔 작업 하나는 한 작업자만 가져갑니다.
+    """
+
+    def __init__(self, handlers: Dict[str, Callable], workers: int = JOB_WORKERS,
+                 poll_interval: float = JOB_POLL_INTERVAL, lease_seconds: int = JOB_LEASE_SECONDS,
+                 max_attempts: int = JOB_MAX_ATTEMPTS):
+        """
+        Args:
+            handlers: 작업 종류 → 실행 함수 handler(payload, report). report(단계)로 진행 단계를 기록하며,
+                      반환값(JSON 직렬화 가능)이 작업 결과가 되고 예외가 나면 실패로 기록됩니다.
+            lease_seconds: 실행 중 작업이 이 시간 동안 진행 단계를 보고하지 않으면 (report마다 임대 갱신) 작업자가 죽은 것으로 보고 다시 대기열에 넣음
+        """
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._wakeup = threading.Condition()
+        self._pending = 0
+        self._threads = []
+        self._started = False
+        self._lock = threading.Lock()
+
+    def get_db_connection(self):
+        """데이터베이스 연결을 반환합니다."""
+        try:
+            return get_db_pool().connection()
+        except Exception as e:
+            print(f"데이터베이스 연결 오류: {e}")
+            return None
+
+    def create_table(self, cursor) -> None:
+        """작업 큐 테이블 생성 (init_database에서도 호출)"""
+        cursor.execute(CREATE_ANALYSIS_JOBS_TABLE)
+
+    def start(self) -> None:
+        """테이블을 만들고, 멈춰 있던 작업을 다시 대기열에 넣은 뒤 작업자 스레드를 시작합니다."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+
+        connection = self.get_db_connection()
+        if connection:
+            try:
+                with connection.cursor() as cursor:
+                    self.create_table(cursor)
+                connection.commit()
+            except Exception as e:
+                print(f"작업 큐 테이블 생성 오류: {e}")
+            finally:
+                connection.close()
+        self.requeue_stale_jobs()
+
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"analysis-job-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, job_type: str, payload: Dict[str, Any]) -> Optional[str]:
+        """작업을 대기열에 넣고 작업 ID를 반환합니다 (저장에 실패하면 None)."""
+        if job_type not in self.handlers:
+            raise ValueError(f"알 수 없는 작업 종류입니다: {job_type}")
+        self.start()
+
+        job_id = uuid.uuid4().hex
+        connection = self.get_db_connection()
+        if not connection:
+            return None
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO analysis_jobs (id, job_type, status, progress, payload)
+                    VALUES (%s, %s, 'queued', 'queued', %s)
+                """, (job_id, job_type, json.dumps(payload, ensure_ascii=False, default=str)))
+            connection.commit()
+        except Exception as e:
+            print(f"작업 저장 오류: {e}")
+            return None
+        finally:
+            connection.close()
+
+        # 잠든 작업자 하나를 깨움
+        with self._wakeup:
+            self._pending += 1
+            self._wakeup.notify()
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태·진행 단계·결과 조회 (없으면 None)"""
+        connection = self.get_db_connection()
+        if not connection:
+            raise ConnectionError("데이터베이스 연결에 실패했습니다.")
+        try:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute("""
+                    SELECT id, job_type, status, progress, result, error, attempts,
+                           created_at, started_at, finished_at
+                    FROM analysis_jobs
+                    WHERE id = %s
+                """, (job_id,))
+                job = cursor.fetchone()
+        finally:
+            connection.close()
+
+        if not job:
+            return None
+        job['job_id'] = job.pop('id')
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        for key in ('created_at', 'started_at', 'finished_at'):
+            if job[key]:
+                job[key] = job[key].strftime('%Y-%m-%d %H:%M:%S')
+        return job
+
+    def requeue_stale_jobs(self) -> int:
+        """
+        마지막 임대 갱신(started_at) 후 lease_seconds가 지난 실행 중 작업(작업자 프로세스가 죽은 경우)을 다시 대기열에 넣습니다.
+        시도 횟수가 max_attempts에 이른 작업은 실패로 기록합니다. 다시 넣은 작업 수를 반환합니다.
+        """
+        connection = self.get_db_connection()
+        if not connection:
+            return 0
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE analysis_jobs
+                    SET status = 'failed', error = '작업자가 중단되어 재시도 횟수를 모두 사용했습니다.', finished_at = NOW()
+                    WHERE status = 'running' AND started_at < NOW() - INTERVAL %s SECOND AND attempts >= %s
+                """, (self.lease_seconds, self.max_attempts))
+                requeued = cursor.execute("""
+                    UPDATE analysis_jobs
+                    SET status = 'queued', progress = 'requeued', started_at = NULL
+                    WHERE status = 'running' AND started_at < NOW() - INTERVAL %s SECOND
+                """, (self.lease_seconds,))
+            connection.commit()
+            if requeued:
+                print(f"중단된 분석 작업 {requeued}개를 다시 대기열에 넣었습니다.")
+            return requeued
+        except Exception as e:
+            print(f"작업 재등록 오류: {e}")
+            return 0
+        finally:
+            connection.close()
+
+    def _claim_next_job(self) -> Optional[Dict[str, Any]]:
+        """가장 오래된 대기 작업을 실행 중으로 바꾸고 가져옴 (다른 작업자가 먼저 가져가면 다음 작업 시도)"""
+        connection = self.get_db_connection()
+        if not connection:
+            return None
+        try:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(QUEUED_JOBS_SQL, (self.workers + 1,))
+                for candidate in cursor.fetchall():
+                    claimed = cursor.execute("""
+                        UPDATE analysis_jobs
+                        SET status = 'running', progress = 'started', started_at = NOW(), attempts = attempts + 1
+                        WHERE id = %s AND status = 'queued'
+                    """, (candidate['id'],))
+                    connection.commit()
+                    if claimed:
+                        cursor.execute("SELECT id, job_type, payload, attempts FROM analysis_jobs WHERE id = %s",
+                                       (candidate['id'],))
+                        return cursor.fetchone()
+            return None
+        finally:
+            connection.close()
+
+    def _update_job(self, job_id: str, attempt: int, **fields) -> None:
+        """
+        작업 행의 컬럼 갱신 (finished_at=True면 현재 시각, renew_lease=True면 started_at을 현재 시각으로 갱신).
+        작업이 이 시도(attempts = attempt)에 속할 때만 갱신 - 임대가 끝나 다시 대기열에 들어간 작업을
+        늦게 끝난 이전 실행이 덮어쓰지 않도록 함
+        """
+        finished = fields.pop('finished_at', False)
+        renew_lease = fields.pop('renew_lease', False)
+        assignments = [f"{column} = %s" for column in fields]
+        if finished:
+            assignments.append("finished_at = NOW()")
+        if renew_lease:
+            assignments.append("started_at = NOW()")
+        connection = self.get_db_connection()
+        if not connection:
+            return
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"UPDATE analysis_jobs SET {', '.join(assignments)} WHERE id = %s AND attempts = %s",
+                               (*fields.values(), job_id, attempt))
+            connection.commit()
+        except Exception as e:
+            print(f"작업 상태 갱신 오류: {e}")
+        finally:
+            connection.close()
+
+    def _run_job(self, job: Dict[str, Any]) -> None:
+        """작업 하나 실행 후 결과 또는 오류 기록"""
+        job_id = job['id']
+        attempt = job['attempts']
+
+        def report(stage: str) -> None:
+            # 단계마다 임대 갱신 - lease_seconds보다 오래 걸리는 작업이 실행 중에 다시 대기열에 들어가지 않도록
+            self._update_job(job_id, attempt, progress=stage, renew_lease=True)
+
+        try:
+            handler = self.handlers[job['job_type']]
+            result = handler(json.loads(job['payload']), report)
+            self._update_job(job_id, attempt, status='done', progress='done',
+                             result=json.dumps(result, ensure_ascii=False, default=str), finished_at=True)
+        except Exception as e:
+            print(f"분석 작업 오류 ({job_id}): {e}")
+            self._update_job(job_id, attempt, status='failed', progress='failed', error=str(e), finished_at=True)
+
+    def _worker_loop(self) -> None:
+        """작업자 스레드 - 대기 작업을 가져와 실행하고, 없으면 새 작업 알림이나 poll_interval까지 대기"""
+        last_requeue = time.monotonic()
+        while True:
+            try:
+                job = self._claim_next_job()
+            except Exception as e:
+                print(f"작업 조회 오류: {e}")
+                job = None
+
+            if job:
+                self._run_job(job)
+                continue
+
+            # 다른 프로세스에서 죽은 작업도 주기적으로 다시 대기열에 넣음
+            if time.monotonic() - last_requeue > self.lease_seconds:
+                self.requeue_stale_jobs()
+                last_requeue = time.monotonic()
+
+            with self._wakeup:
+                if self._pending == 0:
+                    self._wakeup.wait(self.poll_interval)
+                self._pending = max(0, self._pending - 1)
+
+
+# 사용 예시
+if __name__ == "__main__":
+    def echo_job(payload, report):
+        """1초 걸리는 테스트용 작업"""
+        report('echo')
+        time.sleep(1)
+        return {'echo': payload}
+
+    queue = AnalysisJobQueue({'echo': echo_job}, workers=2)
+    job_id = queue.submit('echo', {'message': '안녕하세요'})
+    print(f"작업 ID: {job_id}")
+    while job_id:
+        job = queue.get_job(job_id)
+        print(f"상태: {job['status']}, 진행 단계: {job['progress']}")
+        if job['status'] in ('done', 'failed'):
+            print(job['result'] or job['error'])
+            break
+        time.sleep(0.5)
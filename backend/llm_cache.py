@@ -0,0 +1,225 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from config import LLM_CACHE_SIZE, LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES
+from memo_cache import MemoCache
+
+
+class LLMResponseCache:
+    """
+    Gemini 응답 캐시 - (모델 이름, 프롬프트) 해시를 키로 메모리 LRU와 SQLite 디스크 두 단계에 저장.
+    같은 프롬프트(새로고침 등)는 모델을 다시 호출하지 않으며, 디스크 단계는 프로세스 재시작·워커 사이에 공유됩니다.
+    항목은 TTL이 지나면 버리고, 디스크는 최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 지웁니다.
+    """
+
+    def __init__(self, path: Optional[str] = LLM_CACHE_PATH, ttl: float = LLM_CACHE_TTL,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES, memory_size: int = LLM_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory = MemoCache(memory_size)  # 키 → (응답, 원래 호출 시간 ms, 저장 시각)
+        self._lock = threading.Lock()
+
+        # 통계 (절약한 시간 = 적중한 항목의 원래 호출 시간 합)
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+        self.call_ms = 0.0
+
+        # 디스크 단계 (경로가 없거나 열 수 없으면 메모리만 사용)
+        self._connection = None
+        if path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                self._connection = sqlite3.connect(path, check_same_thread=False)
+                self._connection.execute("""
+                    CREATE TABLE IF NOT EXISTS llm_responses (
+                        key TEXT PRIMARY KEY,
+                        model TEXT NOT NULL,
+                        response TEXT NOT NULL,
+                        latency_ms REAL NOT NULL,
+                        created_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )
+                """)
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_llm_responses_accessed_at ON llm_responses(accessed_at)")
+                self._connection.commit()
+            except Exception as e:
+                print(f"LLM 응답 캐시(디스크) 초기화 오류: {e}")
+                self._connection = None
+
+    def make_key(self, model_name: str, prompt: str) -> str:
+        """(모델 이름, 프롬프트) → 캐시 키 (SHA-256)"""
+        return hashlib.sha256(f"{model_name}\0{prompt}".encode('utf-8')).hexdigest()
+
+    def generate(self, model, model_name: str, prompt: str) -> str:
+        """
+        캐시에 있으면 저장된 응답을, 없으면 model.generate_content(prompt)를 호출해 저장한 뒤 응답 텍스트를 반환합니다.
+        모델 호출 오류는 그대로 전달되며 저장하지 않습니다.
+        """
+        key = self.make_key(model_name, prompt)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        response = model.generate_content(prompt)
+        text = response.text
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.misses += 1
+            self.call_ms += latency_ms
+
+        if text:
+            self.put(key, model_name, text, latency_ms)
+        return text
+
+    def stream(self, model, model_name: str, prompt: str) -> Iterator[str]:
+        """
+        generate의 스트리밍 버전 - model.generate_content(prompt, stream=True)의 텍스트 조각을 받는 대로 내보냅니다.
+        캐시에 있으면 저장된 응답을 한 조각으로 내보내고, 끝까지 받은 응답만 저장합니다 (중간에 끊기면 저장하지 않음).
+        """
+        key = self.make_key(model_name, prompt)
+        cached = self.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        started = time.perf_counter()
+        chunks = []
+        for chunk in model.generate_content(prompt, stream=True):
+            if chunk.text:
+                chunks.append(chunk.text)
+                yield chunk.text
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.misses += 1
+            self.call_ms += latency_ms
+
+        text = ''.join(chunks)
+        if text:
+            self.put(key, model_name, text, latency_ms)
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 조회 (메모리 → 디스크 순서, 없거나 만료되면 None)"""
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None and now - entry[2] < self.ttl:
+            self._record_hit('memory', entry[1])
+            return entry[0]
+
+        row = None
+        if self._connection is not None:
+            try:
+                with self._lock:
+                    row = self._connection.execute(
+                        "SELECT response, latency_ms, created_at FROM llm_responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None and now - row[2] >= self.ttl:
+                        self._connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                        row = None
+                    elif row is not None:
+                        self._connection.execute(
+                            "UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+                    self._connection.commit()
+            except Exception as e:
+                print(f"LLM 응답 캐시 조회 오류: {e}")
+                row = None
+
+        if row is None:
+            return None
+        self._memory.put(key, (row[0], row[1], row[2]))
+        self._record_hit('disk', row[1])
+        return row[0]
+
+    def put(self, key: str, model_name: str, text: str, latency_ms: float) -> None:
+        """응답 저장 (메모리와 디스크), 디스크가 최대 항목 수를 넘으면 오래 사용되지 않은 항목부터 삭제"""
+        now = time.time()
+        self._memory.put(key, (text, latency_ms, now))
+        if self._connection is None:
+            return
+        try:
+            with self._lock:
+                self._connection.execute("""
+                    INSERT OR REPLACE INTO llm_responses (key, model, response, latency_ms, created_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (key, model_name, text, latency_ms, now, now))
+                self._connection.execute("DELETE FROM llm_responses WHERE created_at <= ?", (now - self.ttl,))
+                self._connection.execute("""
+                    DELETE FROM llm_responses WHERE key IN (
+                        SELECT key FROM llm_responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+                self._connection.commit()
+        except Exception as e:
+            print(f"LLM 응답 캐시 저장 오류: {e}")
+
+    def _record_hit(self, tier: str, latency_ms: float) -> None:
+        with self._lock:
+            if tier == 'memory':
+                self.memory_hits += 1
+            else:
+                self.disk_hits += 1
+            self.saved_ms += latency_ms
+
+    def stats(self) -> Dict[str, Any]:
+        """적중률(메모리/디스크)과 절약한 모델 호출 시간"""
+        disk_entries = 0
+        if self._connection is not None:
+            try:
+                with self._lock:
+                    disk_entries = self._connection.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            except Exception as e:
+                print(f"LLM 응답 캐시 통계 오류: {e}")
+
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round(hits / total, 4) if total else 0.0,
+                'saved_seconds': round(self.saved_ms / 1000, 3),
+                'avg_call_ms': round(self.call_ms / self.misses, 1) if self.misses else 0.0,
+                'memory_size': len(self._memory),
+                'disk_entries': disk_entries,
+                'ttl_seconds': self.ttl,
+                'max_entries': self.max_entries
+            }
+
+    def clear(self) -> None:
+        """모든 항목과 통계 초기화"""
+        self._memory.clear()
+        with self._lock:
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM llm_responses")
+                self._connection.commit()
+            self.memory_hits = self.disk_hits = self.misses = 0
+            self.saved_ms = self.call_ms = 0.0
+
+
+# 사용 예시
+if __name__ == "__main__":
+    class EchoModel:
+        """호출마다 0.2초 걸리는 테스트용 모델"""
+        class Response:
+            def __init__(self, text):
+                self.text = text
+
+        def generate_content(self, prompt):
+            time.sleep(0.2)
+            return self.Response(f"응답: {prompt}")
+
+    cache = LLMResponseCache(path=None)
+    model = EchoModel()
+    for prompt in ["사주 분석", "사주 분석", "오늘의 운세", "사주 분석"]:
+        started = time.perf_counter()
+        text = cache.generate(model, 'echo', prompt)
+        print(f"{text} ({(time.perf_counter() - started) * 1000:.1f}ms)")
+    print(cache.stats())
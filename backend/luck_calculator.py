@@ -0,0 +1,239 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta
+import numpy as np
+from typing import Dict, Optional, Tuple
+from saju_calculator import SajuCalculator
+
+class LuckCalculator:
+    """대운(10년 운)·세운(1년 운) 계산 클래스"""
+
+    def __init__(self, saju_calculator: Optional[SajuCalculator] = None):
+        self.saju_calculator = saju_calculator or SajuCalculator()
+
+        # 타임라인 길이 (출생 연도부터)
+        self.LIFESPAN_YEARS = 100
+
+        # 대운 한 주기 (년)
+        self.DAEUN_YEARS = 10
+
+        # 말년 기준 나이
+        self.LATE_LIFE_AGE = 61
+
+        # 성별 입력 → 'male' / 'female'
+        self.GENDER_MAPPING = {
+            'm': 'male', 'male': 'male', '남': 'male', '남자': 'male', '남성': 'male',
+            'f': 'female', 'female': 'female', '여': 'female', '여자': 'female', '여성': 'female'
+        }
+
+    def calculate_luck(self, birth_date: str, birth_time: str, gender: Optional[str] = None) -> Dict[str, any]:
+        """
+        대운과 세운을 계산합니다.
+
+        Args:
+            birth_date: 생년월일 (YYYY-MM-DD 형식)
+            birth_time: 생시 (HH:MM 형식)
+            gender: 성별 (male/female, 남/여 등). 없으면 대운은 계산하지 않고 세운만 계산
+
+        Returns:
+            대운 목록과 출생 연도부터 100년간의 세운 목록.
+            나이는 세는 나이(출생 연도 = 1세), 세운은 그해 입춘부터 적용
+        """
+        try:
+            return self._format_luck(self.get_luck_timeline(birth_date, birth_time, gender))
+        except Exception as e:
+            print(f"운 계산 오류: {e}")
+            return {}
+
+    def calculate_luck_from_chart(self, birth_datetime: datetime, year_code: int, month_code: int,
+                                  gender: Optional[str] = None) -> Dict[str, any]:
+        """
+        이미 계산한 사주(출생 datetime, 연주·월주 60갑자 인덱스)로 대운과 세운을 계산합니다.
+        calculate_luck과 같은 결과이며, 날짜 파싱과 네 기둥 계산을 다시 하지 않습니다.
+        """
+        try:
+            return self._format_luck(self.get_luck_timeline_from_chart(birth_datetime, year_code, month_code, gender))
+        except Exception as e:
+            print(f"운 계산 오류: {e}")
+            return {}
+
+    def _format_luck(self, timeline: Dict[str, any]) -> Dict[str, any]:
+        """인덱스 배열 타임라인 → 대운·세운 목록 (60갑자 문자열)"""
+        jiazi = self.saju_calculator.JIAZI_CYCLE
+        daeun_list = [
+            {
+                'order': order + 1,
+                'start_age': int(start_age),
+                'start_year': int(start_year),
+                'pillar': jiazi[code]
+            }
+            for order, (start_age, start_year, code) in enumerate(zip(
+                timeline['daeun_start_ages'], timeline['daeun_start_years'], timeline['daeun_pillars']))
+        ]
+
+        seun_list = [
+            {
+                'year': int(year),
+                'age': int(age),
+                'pillar': jiazi[seun],
+                'daeun_pillar': jiazi[daeun] if daeun >= 0 else ''
+            }
+            for year, age, seun, daeun in zip(
+                timeline['year'], timeline['age'], timeline['seun'], timeline['daeun'])
+        ]
+
+        return {
+            'gender': timeline['gender'],
+            'daeun_direction': timeline['daeun_direction'],   # 순행/역행 (성별 없으면 None)
+            'daeun_start_age': timeline['daeun_start_age'],   # 대운수
+            'daeun': daeun_list,
+            'seun': seun_list
+        }
+
+    def get_luck_timeline(self, birth_date: str, birth_time: str,
+                          gender: Optional[str] = None) -> Dict[str, any]:
+        """
+        출생 연도부터 LIFESPAN_YEARS년간의 세운·대운을 60갑자 인덱스 배열로 한 번에 계산합니다.
+        대운이 시작되기 전이거나 성별이 없으면 daeun 값은 -1입니다.
+        """
+        calculator = self.saju_calculator
+        birth_datetime = calculator._parse_birth_datetime(birth_date, birth_time)
+        year_code, month_code, _, _ = calculator._calculate_pillar_codes(birth_datetime)
+        return self.get_luck_timeline_from_chart(birth_datetime, year_code, month_code, gender)
+
+    def get_luck_timeline_from_chart(self, birth_datetime: datetime, year_code: int, month_code: int,
+                                     gender: Optional[str] = None) -> Dict[str, any]:
+        """get_luck_timeline과 같으나 이미 계산한 출생 datetime과 연주·월주 인덱스를 받습니다."""
+        calculator = self.saju_calculator
+
+        # 세운: 출생 연도부터 매년의 연주 (그해 입춘부터 적용)
+        birth_year = birth_datetime.year
+        years = birth_year + np.arange(self.LIFESPAN_YEARS)
+        ages = years - birth_year + 1
+        seun = (calculator.BASE_YEAR_JIAZI_INDEX + years - 1900) % 60
+
+        gender = self._normalize_gender(gender)
+        daeun = np.full(self.LIFESPAN_YEARS, -1)
+        direction = None
+        start_age = None
+        daeun_orders = np.arange(0)
+
+        if gender:
+            # 양남음녀는 순행, 음남양녀는 역행 (양간: 甲丙戊庚壬)
+            is_yang_year = year_code % 2 == 0
+            forward = is_yang_year == (gender == 'male')
+            direction = '순행' if forward else '역행'
+            start_age = self._calculate_daeun_start_age(birth_datetime, forward)
+
+            # n번째 대운 = 월주에서 n칸 이동, start_age세부터 10년씩
+            step = 1 if forward else -1
+            order = (ages - start_age) // self.DAEUN_YEARS
+            daeun = np.where(ages >= start_age, (month_code + step * (order + 1)) % 60, -1)
+            daeun_orders = np.arange((self.LIFESPAN_YEARS - start_age) // self.DAEUN_YEARS + 1)
+
+        return {
+            'gender': gender,
+            'daeun_direction': direction,
+            'daeun_start_age': start_age,
+            'year': years,
+            'age': ages,
+            'seun': seun,
+            'daeun': daeun,
+            'daeun_start_ages': (start_age or 0) + self.DAEUN_YEARS * daeun_orders,
+            'daeun_start_years': birth_year - 1 + (start_age or 0) + self.DAEUN_YEARS * daeun_orders,
+            'daeun_pillars': (month_code + (1 if direction == '순행' else -1) * (daeun_orders + 1)) % 60
+        }
+
+    def _normalize_gender(self, gender: Optional[str]) -> Optional[str]:
+        """성별 입력을 'male' / 'female'로 변환 (알 수 없으면 None)"""
+        if not gender:
+            return None
+        return self.GENDER_MAPPING.get(str(gender).strip().lower())
+
+    def _calculate_daeun_start_age(self, birth_datetime: datetime, forward: bool) -> int:
+        """대운수: 순행은 다음 절, 역행은 이전 절까지의 날수 ÷ 3 (반올림, 최소 1)"""
+        previous_term, next_term = self._get_adjacent_terms(birth_datetime)
+        if forward:
+            days = (next_term - birth_datetime) / timedelta(days=1)
+        else:
+            days = (birth_datetime - previous_term) / timedelta(days=1)
+        return max(1, int(days / 3 + 0.5))
+
+    def _get_adjacent_terms(self, birth_datetime: datetime) -> Tuple[datetime, datetime]:
+        """출생 시각 직전·직후의 절입 시각"""
+        calculator = self.saju_calculator
+        birth_minute = ((birth_datetime.toordinal() - calculator.BASE_ORDINAL) * 1440
+                        + birth_datetime.hour * 60 + birth_datetime.minute)
+
+        # 절입 시각 표 범위 안: 이분 탐색
+        terms = calculator.SOLAR_TERM_MINUTES
+        term_count = bisect_right(terms, birth_minute)
+        if 0 < term_count < len(terms):
+            return (calculator.BASE_DATE + timedelta(minutes=terms[term_count - 1]),
+                    calculator.BASE_DATE + timedelta(minutes=terms[term_count]))
+
+        # 표 범위 밖: 고정 절입일 자정
+        year, month = birth_datetime.year, birth_datetime.month
+        this_term = datetime(year, month, calculator.SOLAR_TERM_DAY[month])
+        if birth_datetime >= this_term:
+            next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+            return this_term, datetime(next_year, next_month, calculator.SOLAR_TERM_DAY[next_month])
+        previous_year, previous_month = (year - 1, 12) if month == 1 else (year, month - 1)
+        return datetime(previous_year, previous_month, calculator.SOLAR_TERM_DAY[previous_month]), this_term
+
+    def get_luck_analysis(self, luck: Dict[str, any], current_year: Optional[int] = None) -> str:
+        """대운·세운 분석 텍스트 생성 (올해·내년 세운, 현재 대운, 말년 대운)"""
+        if not luck:
+            return "운 계산에 실패했습니다."
+
+        current_year = current_year or datetime.now().year
+        seun_by_year = {item['year']: item for item in luck.get('seun', [])}
+
+        # 대운
+        if luck.get('daeun'):
+            daeun_lines = []
+            for item in luck['daeun']:
+                end_year = item['start_year'] + self.DAEUN_YEARS - 1
+                marker = " ← 현재" if item['start_year'] <= current_year <= end_year else ""
+                late = " (말년)" if item['start_age'] >= self.LATE_LIFE_AGE else ""
+                daeun_lines.append(f"{item['start_age']}세 ({item['start_year']}~{end_year}년): "
+                                   f"{item['pillar']}{late}{marker}")
+            daeun_text = (f"방향: {luck['daeun_direction']}, 대운수: {luck['daeun_start_age']}\n"
+                          + "\n".join(daeun_lines))
+        else:
+            daeun_text = "성별 정보가 없어 대운은 계산하지 않았습니다."
+
+        # 세운 (올해, 내년)
+        seun_lines = []
+        for label, year in [('올해', current_year), ('내년', current_year + 1)]:
+            item = seun_by_year.get(year)
+            if item:
+                daeun_info = f", 대운 {item['daeun_pillar']}" if item['daeun_pillar'] else ""
+                seun_lines.append(f"{label} {year}년 ({item['age']}세): 세운 {item['pillar']}{daeun_info}")
+        seun_text = "\n".join(seun_lines) if seun_lines else "해당 연도의 세운이 없습니다."
+
+        analysis = f"""
+=== 대운 (大運) ===
+{daeun_text}
+
+=== 세운 (歲運) ===
+{seun_text}
+        """
+
+        return analysis.strip()
+
+# 사용 예시
+if __name__ == "__main__":
+    calculator = LuckCalculator()
+
+    # 테스트 1: 성별이 있으면 대운 + 세운
+    luck = calculator.calculate_luck("1990-05-15", "14:30", "male")
+    print(calculator.get_luck_analysis(luck))
+
+    # 테스트 2: 성별이 없으면 세운만
+    luck2 = calculator.calculate_luck("1990-05-15", "14:30")
+    print()
+    print(calculator.get_luck_analysis(luck2))
+
+    # 테스트 3: 100년 타임라인 (배열)
+    timeline = calculator.get_luck_timeline("1990-05-15", "14:30", "female")
+    print(f"\n세운 {len(timeline['seun'])}년, 대운 시작 {timeline['daeun_start_age']}세 ({timeline['daeun_direction']})")
@@ -0,0 +1,209 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class MemoCache:
+    """스레드 안전한 크기 제한 LRU 캐시 (적중/미스 통계 포함)"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """값을 조회합니다. 조회된 항목은 가장 최근 사용으로 옮깁니다."""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """값을 저장합니다. 크기를 넘으면 가장 오래 사용되지 않은 항목을 버립니다."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """캐시에 없으면 compute()로 계산해 저장한 뒤 반환합니다."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """모든 항목과 통계를 초기화합니다."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 크기 조정을 위한 적중/미스 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize
+            }
+
+
+class DailyMemoCache(MemoCache):
+    """로컬 자정이 지나면 비워지는 하루 단위 캐시"""
+
+    def __init__(self, maxsize: int = 1024):
+        super().__init__(maxsize)
+        self.day = date.today()
+
+    def _roll_over(self) -> None:
+        """날짜가 바뀌었으면 전날 항목을 모두 버립니다."""
+        today = date.today()
+        if today != self.day:
+            with self._lock:
+                if today != self.day:
+                    self._data.clear()
+                    self.day = today
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        self._roll_over()
+        return super().get(key, default)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._roll_over()
+        super().put(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        result = super().stats()
+        result['day'] = self.day.isoformat()
+        return result
+
+
+class FragmentCache(MemoCache):
+    """분석 텍스트 조각 캐시 - 항목 수 제한 LRU에 저장된 키·값의 메모리 사용량(바이트)을 함께 집계"""
+
+    def __init__(self, maxsize: int = 1024):
+        super().__init__(maxsize)
+        self.memory_bytes = 0
+
+    def _sizeof(self, key: Hashable, value: Any) -> int:
+        """항목 하나의 크기 (키 튜플 + 값 문자열, 작은 정수는 공유되므로 제외)"""
+        return sys.getsizeof(key) + sys.getsizeof(value)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            old_value = self._data.pop(key, _MISSING)
+            if old_value is not _MISSING:
+                self.memory_bytes -= self._sizeof(key, old_value)
+            self._data[key] = value
+            self.memory_bytes += self._sizeof(key, value)
+            while len(self._data) > self.maxsize:
+                old_key, old_value = self._data.popitem(last=False)
+                self.memory_bytes -= self._sizeof(old_key, old_value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.memory_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        result = super().stats()
+        with self._lock:
+            result['memory_bytes'] = self.memory_bytes
+            result['bytes_per_entry'] = round(self.memory_bytes / len(self._data)) if self._data else 0
+        return result
+
+
+class SingleFlight:
+    """
+    같은 키의 동시 호출 합치기 - 실행 중인 호출이 있으면 새로 실행하지 않고 그 결과를 함께 받으며,
+    끝난 결과는 ttl초 동안 보관해 바로 뒤따르는 같은 요청(중복 제출, 여러 탭)에도 그대로 돌려줍니다.
+    """
+
+    def __init__(self, ttl: float = 10, maxsize: int = 1024):
+        self.ttl = ttl
+        self._results = MemoCache(maxsize)  # 키 → (결과, 저장 시각)
+        self._calls = {}  # 키 → 실행 중인 호출 {'done': Event, 'result', 'error'}
+        self._lock = threading.Lock()
+        self.executions = 0  # 실제로 실행한 호출 수
+        self.coalesced = 0   # 실행 중인 호출을 기다려 결과를 받은 요청 수
+        self.cache_hits = 0  # 보관된 결과를 받은 요청 수
+
+    def do(self, key: Hashable, compute: Callable[[], Any],
+           cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        key의 결과를 반환합니다. 실행 중인 같은 키가 없고 보관된 결과도 없을 때만 compute()를 실행합니다.
+        compute()의 예외는 기다리던 요청에도 그대로 전달되며 보관하지 않습니다.
+        cache_if가 있으면 cache_if(결과)가 참인 결과만 보관합니다 (오류 응답 등 제외).
+        """
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl:
+                self.cache_hits += 1
+                return entry[0]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = {'done': threading.Event(), 'result': None, 'error': None}
+                self._calls[key] = call
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = compute()
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                if call['error'] is None and (cache_if is None or cache_if(call['result'])):
+                    self._results.put(key, (call['result'], time.monotonic()))
+                del self._calls[key]
+            call['done'].set()
+
+    def stats(self) -> Dict[str, Any]:
+        """실행/합쳐진 요청 수 (saved_rate: 실행하지 않고 결과를 받은 요청 비율)"""
+        with self._lock:
+            total = self.executions + self.coalesced + self.cache_hits
+            return {
+                'requests': total,
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'cache_hits': self.cache_hits,
+                'saved_rate': round((self.coalesced + self.cache_hits) / total, 4) if total else 0.0,
+                'in_flight': len(self._calls),
+                'ttl_seconds': self.ttl
+            }
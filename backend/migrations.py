@@ -0,0 +1,325 @@
+import argparse
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import pymysql
+
+from app_queries import (FIND_FORTUNE_USER_SQL, RECENT_ANALYSIS_BY_HASH_SQL, RECENT_ANALYSIS_BY_IDEMPOTENCY_KEY_SQL,
+                         USER_PROFILE_SQL, GET_USER_SQL, build_users_query)
+from config import DB_CONFIG, FORTUNE_DEDUPE_MINUTES, FORTUNE_IDEMPOTENCY_HOURS
+from fortune_context import CONTEXT_STATEMENTS, SIMILAR_USER_TIERS
+from job_queue import CREATE_ANALYSIS_JOBS_TABLE, QUEUED_JOBS_SQL
+from rag_system import RECENT_EXPERIENCES_SQL
+from user_charts import CREATE_USER_CHARTS_TABLE, CREATE_USER_SAL_TABLE, UserChartStore
+
+# 적용한 마이그레이션 기록
+CREATE_SCHEMA_MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY COMMENT '마이그레이션 버전',
+    name VARCHAR(200) NOT NULL COMMENT '이름',
+    duration_ms INT NOT NULL COMMENT '소요 시간 (ms)',
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '적용일시'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='스키마 마이그레이션 기록 테이블'
+"""
+
+CREATE_USERS_TABLE = """
+CREATE TABLE IF NOT EXISTS users (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL COMMENT '이름',
+    birth_date DATE NOT NULL COMMENT '생년월일',
+    birth_time TIME NOT NULL COMMENT '태어난 시간',
+    message TEXT NOT NULL COMMENT '할말',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '생성일시',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '수정일시'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사용자 정보 테이블'
+"""
+
+CREATE_USER_PROFILES_TABLE = """
+CREATE TABLE IF NOT EXISTS user_profiles (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL COMMENT '사용자 ID',
+    financial_status VARCHAR(50) COMMENT '재정상태',
+    occupation VARCHAR(100) COMMENT '직업',
+    interests TEXT COMMENT '관심분야',
+    current_challenges TEXT COMMENT '현재 고민',
+    goals TEXT COMMENT '목표',
+    personality_traits TEXT COMMENT '성격특성',
+    relationship_status VARCHAR(50) COMMENT '연애상태',
+    health_concerns TEXT COMMENT '건강관심사',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '생성일시',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '수정일시',
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사용자 프로필 테이블'
+"""
+
+CREATE_FORTUNE_ANALYSIS_TABLE = """
+CREATE TABLE IF NOT EXISTS fortune_analysis (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL COMMENT '사용자 ID',
+    analysis_result TEXT NOT NULL COMMENT '사주 분석 결과',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '생성일시',
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사주 분석 결과 테이블'
+"""
+
+CREATE_USER_EXPERIENCES_TABLE = """
+CREATE TABLE IF NOT EXISTS user_experiences (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL COMMENT '사용자 ID',
+    experience_text TEXT NOT NULL COMMENT '경험 내용',
+    experience_date DATE COMMENT '경험 날짜',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP COMMENT '생성일시',
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사용자 경험 데이터 테이블'
+"""
+
+# 온라인 DDL - 인덱스·컬럼 추가 중에도 읽기·쓰기를 막지 않음 (서버가 지원하지 않으면 오류)
+ONLINE_DDL = "ALGORITHM=INPLACE, LOCK=NONE"
+
+
+def create_table(sql: str) -> Callable:
+    """CREATE TABLE IF NOT EXISTS 단계"""
+    def step(runner: 'MigrationRunner', cursor) -> None:
+        cursor.execute(sql)
+    return step
+
+
+def add_column(table: str, column: str, definition: str) -> Callable:
+    """컬럼 추가 단계 (이미 있으면 건너뜀)"""
+    def step(runner: 'MigrationRunner', cursor) -> None:
+        if runner.column_exists(cursor, table, column):
+            return
+        runner.alter(cursor, f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return step
+
+
+def add_index(table: str, name: str, columns: List[str], unique: bool = False) -> Callable:
+    """인덱스 추가 단계 (같은 이름이 있으면 건너뜀)"""
+    def step(runner: 'MigrationRunner', cursor) -> None:
+        if runner.index_exists(cursor, table, name):
+            return
+        kind = 'UNIQUE INDEX' if unique else 'INDEX'
+        runner.alter(cursor, f"ALTER TABLE {table} ADD {kind} {name} ({', '.join(columns)})")
+    return step
+
+
+def execute(sql: str) -> Callable:
+    """데이터 정리 등 일반 SQL 단계 (여러 번 실행해도 같은 결과여야 함)"""
+    def step(runner: 'MigrationRunner', cursor) -> None:
+        cursor.execute(sql)
+    return step
+
+
+# 버전별 마이그레이션 (버전 순서대로 한 번씩 적용, 이미 만든 DB에 다시 실행해도 되도록 단계마다 존재 여부 확인)
+MIGRATIONS = [
+    (1, '기본 테이블', [
+        create_table(CREATE_USERS_TABLE),
+        create_table(CREATE_USER_PROFILES_TABLE),
+        create_table(CREATE_FORTUNE_ANALYSIS_TABLE),
+        create_table(CREATE_USER_EXPERIENCES_TABLE),
+    ]),
+    (2, '사용자 검색 인덱스', [
+        add_index('users', 'idx_users_name', ['name']),
+        add_index('users', 'idx_users_birth_date', ['birth_date']),
+        add_index('users', 'idx_users_birth_time', ['birth_time']),
+    ]),
+    (3, '사용자 사주·살 테이블', [
+        create_table(CREATE_USER_CHARTS_TABLE),
+        create_table(CREATE_USER_SAL_TABLE),
+    ]),
+    (4, '분석 작업 큐 테이블', [
+        create_table(CREATE_ANALYSIS_JOBS_TABLE),
+    ]),
+    (5, '사주 분석 요청 해시·멱등성 키', [
+        add_column('fortune_analysis', 'request_hash', "CHAR(64) COMMENT '정규화한 요청 내용 해시' AFTER analysis_result"),
+        add_column('fortune_analysis', 'idempotency_key', "VARCHAR(100) COMMENT '클라이언트 멱등성 키' AFTER request_hash"),
+    ]),
+    (6, '조회 성능 인덱스', [
+        add_index('users', 'idx_users_name_birth', ['name', 'birth_date', 'birth_time', 'created_at']),
+        add_index('users', 'idx_users_created_at_id', ['created_at', 'id']),
+        add_index('fortune_analysis', 'idx_fortune_analysis_user_created_at', ['user_id', 'created_at']),
+        add_index('user_experiences', 'idx_user_experiences_user_created_at', ['user_id', 'created_at']),
+        # 프로필 저장은 사용자 ID로 UPDATE하므로 동시 저장으로 생긴 중복 행은 내용이 같음 - 최신 행만 남김
+        execute("""
+            DELETE older FROM user_profiles older
+            JOIN user_profiles newer ON newer.user_id = older.user_id AND newer.id > older.id
+        """),
+        add_index('user_profiles', 'uq_user_profiles_user_id', ['user_id'], unique=True),
+    ]),
+    (7, '유사 사용자 월일 조회 컬럼', [
+        add_column('users', 'birth_monthday',
+                   "SMALLINT AS (MONTH(birth_date) * 100 + DAYOFMONTH(birth_date)) VIRTUAL COMMENT '생일 월일 (MMDD)'"),
+        add_index('users', 'idx_users_birth_monthday', ['birth_monthday']),
+    ]),
+]
+
+
+def hot_queries(sample_user_id: int) -> List[tuple]:
+    """
+    app.py·rag_system.py 등에서 요청마다 실행하는 쿼리 (이름, SQL, 인자) - EXPLAIN으로 인덱스 사용 확인용.
+    궁합 조회(user_charts 전체를 기본 키 순서로 읽기, 사주 미저장 사용자 조회)는 의도된 전체 조회라 제외합니다.
+    """
+    queries = [
+        ('app.find_fortune_user_id', FIND_FORTUNE_USER_SQL, ('洪吉東', '1990-01-01', '09:30:00')),
+        ('app.find_recent_analysis (요청 해시)', RECENT_ANALYSIS_BY_HASH_SQL,
+         (sample_user_id, FORTUNE_DEDUPE_MINUTES, '0' * 64, 'error%')),
+        ('app.find_recent_analysis (멱등성 키)', RECENT_ANALYSIS_BY_IDEMPOTENCY_KEY_SQL,
+         (sample_user_id, FORTUNE_IDEMPOTENCY_HOURS, 'key', 'error%')),
+        ('app.load_fortune_context', USER_PROFILE_SQL, (sample_user_id,)),
+        ('app.get_user', GET_USER_SQL, (sample_user_id,)),
+        ('app.get_users', *build_users_query((datetime(2100, 1, 1), 0), 51)),
+        ('rag_system.search_similar_experiences', RECENT_EXPERIENCES_SQL, (sample_user_id, 5)),
+        ('job_queue._claim_next_job', QUEUED_JOBS_SQL, (5,)),
+    ]
+    for i, sql in enumerate(CONTEXT_STATEMENTS):
+        queries.append((f'fortune_context.CONTEXT_STATEMENTS[{i}]', sql, (sample_user_id,)))
+    for similarity_type, _, sql in SIMILAR_USER_TIERS:
+        queries.append((f'fortune_context.{similarity_type}', sql, (sample_user_id, 3)))
+    query, params = UserChartStore().build_query(['dohwa_sal'], {'day_pillar': '甲子'}, 50)
+    queries.append(('user_charts.query_users', query, params))
+    return queries
+
+
+class MigrationRunner:
+    """버전별 스키마 마이그레이션 실행기 - schema_migrations에 적용 기록, EXPLAIN으로 주요 쿼리 인덱스 사용 확인"""
+
+    def __init__(self, connection, online_only: bool = True):
+        """
+        Args:
+            connection: 대상 데이터베이스를 선택한 pymysql 연결
+            online_only: True면 온라인 DDL(ALGORITHM=INPLACE, LOCK=NONE)을 지원하지 않는 변경은 실패 처리,
+                         False면 잠금이 걸리는 일반 ALTER로 다시 시도
+        """
+        self.connection = connection
+        self.online_only = online_only
+
+    def applied_versions(self, cursor) -> Dict[int, Any]:
+        """적용한 버전 → 적용일시"""
+        cursor.execute(CREATE_SCHEMA_MIGRATIONS_TABLE)
+        cursor.execute("SELECT version, applied_at FROM schema_migrations")
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def migrate(self, target: Optional[int] = None) -> List[int]:
+        """적용하지 않은 마이그레이션을 버전 순서대로 적용하고 적용한 버전 목록을 반환합니다 (오류는 그대로 전달)."""
+        applied = []
+        with self.connection.cursor() as cursor:
+            done = self.applied_versions(cursor)
+            for version, name, steps in MIGRATIONS:
+                if version in done or (target is not None and version > target):
+                    continue
+                started = time.perf_counter()
+                for step in steps:
+                    step(self, cursor)
+                duration_ms = int((time.perf_counter() - started) * 1000)
+                cursor.execute("INSERT INTO schema_migrations (version, name, duration_ms) VALUES (%s, %s, %s)",
+                               (version, name, duration_ms))
+                self.connection.commit()
+                print(f"마이그레이션 {version} 적용: {name} ({duration_ms}ms)")
+                applied.append(version)
+        return applied
+
+    def status(self) -> List[Dict[str, Any]]:
+        """마이그레이션별 적용 여부"""
+        with self.connection.cursor() as cursor:
+            done = self.applied_versions(cursor)
+        return [{'version': version, 'name': name, 'applied_at': done.get(version)}
+                for version, name, _ in MIGRATIONS]
+
+    def alter(self, cursor, statement: str) -> None:
+        """ALTER TABLE을 온라인 DDL로 실행 (online_only=False면 지원하지 않을 때 일반 ALTER로 재시도)"""
+        try:
+            cursor.execute(f"{statement}, {ONLINE_DDL}")
+        except pymysql.err.MySQLError as e:
+            if self.online_only:
+                raise
+            print(f"온라인 DDL을 지원하지 않아 잠금 ALTER로 실행합니다: {e}")
+            cursor.execute(statement)
+
+    def column_exists(self, cursor, table: str, column: str) -> bool:
+        cursor.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        """, (table, column))
+        return cursor.fetchone() is not None
+
+    def index_exists(self, cursor, table: str, name: str) -> bool:
+        cursor.execute("""
+            SELECT 1 FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+            LIMIT 1
+        """, (table, name))
+        return cursor.fetchone() is not None
+
+    def explain(self) -> List[Dict[str, Any]]:
+        """
+        주요 쿼리를 EXPLAIN해 테이블마다 인덱스를 쓰는지 확인합니다.
+        전체 스캔(type=ALL)인데 쓸 수 있는 인덱스도 없으면 'fail', 인덱스가 있는데 옵티마이저가 스캔을 고르면
+        (행이 적은 테이블 등) 'warn', 나머지는 'ok'입니다.
+        """
+        results = []
+        with self.connection.cursor(pymysql.cursors.DictCursor) as cursor:
+            cursor.execute("SELECT MIN(id) AS id FROM users")
+            sample_user_id = (cursor.fetchone() or {}).get('id') or 1
+            for name, sql, params in hot_queries(sample_user_id):
+                cursor.execute(f"EXPLAIN {sql}", params)
+                for row in cursor.fetchall():
+                    access = row.get('type')
+                    extra = row.get('Extra') or ''
+                    if access == 'ALL' and not row.get('possible_keys'):
+                        verdict = 'fail'
+                    elif access == 'ALL':
+                        verdict = 'warn'
+                    else:
+                        verdict = 'ok'
+                    if not row.get('table') or 'Impossible' in extra or 'no matching row' in extra:
+                        verdict = 'ok'  # 상수 조건으로 테이블을 읽지 않음
+                    results.append({'query': name, 'table': row.get('table'), 'type': access,
+                                    'key': row.get('key'), 'rows': row.get('rows'), 'extra': extra,
+                                    'verdict': verdict})
+        return results
+
+
+def connect_database(create_database: bool = False):
+    """DB_CONFIG 데이터베이스 연결 (create_database=True면 없을 때 생성)"""
+    if not create_database:
+        return pymysql.connect(**DB_CONFIG)
+    connection = pymysql.connect(**{key: value for key, value in DB_CONFIG.items() if key != 'database'})
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']} "
+                       f"CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+        cursor.execute(f"USE {DB_CONFIG['database']}")
+    return connection
+
+
+# 사용 예시
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='스키마 마이그레이션 도구')
+    parser.add_argument('command', choices=['migrate', 'status', 'explain'],
+                        help='migrate: 적용하지 않은 마이그레이션 적용, status: 적용 여부, explain: 주요 쿼리 인덱스 사용 확인')
+    parser.add_argument('--target', type=int, help='이 버전까지만 적용 (migrate)')
+    parser.add_argument('--allow-locking', action='store_true',
+                        help='온라인 DDL을 지원하지 않는 서버에서 잠금이 걸리는 ALTER 허용 (migrate)')
+    args = parser.parse_args()
+
+    connection = connect_database(create_database=args.command == 'migrate')
+    try:
+        runner = MigrationRunner(connection, online_only=not args.allow_locking)
+        if args.command == 'migrate':
+            applied = runner.migrate(args.target)
+            print(f"적용한 마이그레이션 {len(applied)}개" if applied else "모든 마이그레이션이 적용되어 있습니다.")
+        elif args.command == 'status':
+            for migration in runner.status():
+                applied_at = migration['applied_at'] or '미적용'
+                print(f"{migration['version']:>3}  {migration['name']}  ({applied_at})")
+        else:
+            results = runner.explain()
+            for result in results:
+                print(f"[{result['verdict']}] {result['query']} - {result['table']}: "
+                      f"type={result['type']}, key={result['key']}, rows={result['rows']} {result['extra']}")
+            failed = sum(1 for result in results if result['verdict'] == 'fail')
+            print(f"인덱스를 쓰지 않는 쿼리 {failed}개")
+            if failed:
+                raise SystemExit(1)
+    finally:
+        connection.close()
@@ -1,18 +1,29 @@
 import pymysql
-from config import DB_CONFIG
+from db_pool import get_db_pool
+from fortune_context import FortuneContextLoader
 import re
 from datetime import datetime
 
+# 키워드·사용자 정보 조건이 없을 때의 최근 경험 조회 - 인자: (user_id, top_k)
+RECENT_EXPERIENCES_SQL = """
+    SELECT id, experience_text, experience_date, 0.3 as relevance_score
+    FROM user_experiences
+    WHERE user_id = %s
+    ORDER BY created_at DESC
+    LIMIT %s
+"""
+
 class RAGSystem:
     def __init__(self):
         # MySQL 기반 RAG 시스템으로 단순화
-        pass
+        # 사주 분석 컨텍스트 조회기 (사용자·경험·과거 분석·유사 사용자를 한 번의 왕복으로)
+        self.context_loader = FortuneContextLoader()
     
     def get_db_connection(self):
         """데이터베이스 연결을 반환합니다."""
         try:
-            connection = pymysql.connect(**DB_CONFIG)
-            return connection
+            # app.py와 같은 연결 풀에서 빌림 (close()하면 풀에 반환)
+            return get_db_pool().connection()
         except Exception as e:
             print(f"데이터베이스 연결 오류: {e}")
             return None
@@ -46,13 +57,13 @@ class RAGSystem:
     def search_similar_experiences(self, user_id, query_text, top_k=5):
         """사용자 정보를 고려한 MySQL 기반 키워드 검색으로 유사한 경험을 찾습니다."""
         try:
+            # 사용자 기본 정보 조회 (연결 풀에서 연결을 두 개 동시에 잡지 않도록 먼저 조회)
+            user_info = self.get_user_basic_info(user_id)
+            
             connection = self.get_db_connection()
             if not connection:
                 return []
             
-            # 사용자 기본 정보 조회
-            user_info = self.get_user_basic_info(user_id)
-            
             # 쿼리에서 키워드 추출 (사용자 정보 고려)
             keywords = self.extract_keywords_with_user_context(query_text, user_info)
             
@@ -170,13 +181,7 @@ class RAGSystem:
                             LIMIT %s
                         """, case_params + [user_id] + user_params + [top_k])
                     else:
-                        cursor.execute("""
-                            SELECT id, experience_text, experience_date, 0.3 as relevance_score
-                            FROM user_experiences
-                            WHERE user_id = %s
-                            ORDER BY created_at DESC
-                            LIMIT %s
-                        """, (user_id, top_k))
+                        cursor.execute(RECENT_EXPERIENCES_SQL, (user_id, top_k))
                 
                 experiences = cursor.fetchall()
             
@@ -228,111 +233,9 @@ class RAGSystem:
             return None
 
     def find_similar_users(self, user_id, max_similar=5):
-        """유사한 사용자들을 찾습니다 (생년월일, 시간, 이름 기반)."""
+        """유사한 사용자들을 찾습니다 (생년월일, 시간, 이름 기반 4단계를 한 번의 쿼리 왕복으로)."""
         try:
-            connection = self.get_db_connection()
-            if not connection:
-                return []
-            
-            # 현재 사용자 정보 조회
-            current_user = self.get_user_basic_info(user_id)
-            if not current_user:
-                return []
-            
-            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-                similar_users = []
-                
-                # 1. 같은 생년월일을 가진 사용자들 (최우선)
-                cursor.execute("""
-                    SELECT u.id, u.name, u.birth_date, u.birth_time, u.message,
-                           p.occupation, p.financial_status, p.interests, 
-                           p.current_challenges, p.goals, p.personality_traits, 
-                           p.relationship_status, p.health_concerns
-                    FROM users u
-                    LEFT JOIN user_profiles p ON u.id = p.user_id
-                    WHERE u.id != %s AND u.birth_date = %s
-                    ORDER BY ABS(TIME_TO_SEC(TIMEDIFF(u.birth_time, %s))) ASC
-                    LIMIT %s
-                """, (user_id, current_user['birth_date'], current_user['birth_time'], max_similar))
-                
-                same_birthday_users = cursor.fetchall()
-                for user in same_birthday_users:
-                    user['similarity_type'] = 'same_birthday'
-                    user['similarity_score'] = 1.0
-                    similar_users.append(user)
-                
-                # 2. 같은 월일을 가진 사용자들 (2순위)
-                if len(similar_users) < max_similar:
-                    current_month = current_user['birth_date'].month
-                    current_day = current_user['birth_date'].day
-                    
-                    cursor.execute("""
-                        SELECT u.id, u.name, u.birth_date, u.birth_time, u.message,
-                               p.occupation, p.financial_status, p.interests, 
-                               p.current_challenges, p.goals, p.personality_traits, 
-                               p.relationship_status, p.health_concerns
-                        FROM users u
-                        LEFT JOIN user_profiles p ON u.id = p.user_id
-                        WHERE u.id != %s AND MONTH(u.birth_date) = %s AND DAY(u.birth_date) = %s
-                        ORDER BY ABS(TIME_TO_SEC(TIMEDIFF(u.birth_time, %s))) ASC
-                        LIMIT %s
-                    """, (user_id, current_month, current_day, current_user['birth_time'], max_similar - len(similar_users)))
-                    
-                    same_monthday_users = cursor.fetchall()
-                    for user in same_monthday_users:
-                        user['similarity_type'] = 'same_monthday'
-                        user['similarity_score'] = 0.8
-                        similar_users.append(user)
-                
-                # 3. 비슷한 시간대를 가진 사용자들 (3순위)
-                if len(similar_users) < max_similar:
-                    current_time = current_user['birth_time']
-                    # 2시간 이내의 시간대
-                    cursor.execute("""
-                        SELECT u.id, u.name, u.birth_date, u.birth_time, u.message,
-                               p.occupation, p.financial_status, p.interests, 
-                               p.current_challenges, p.goals, p.personality_traits, 
-                               p.relationship_status, p.health_concerns
-                        FROM users u
-                        LEFT JOIN user_profiles p ON u.id = p.user_id
-                        WHERE u.id != %s AND ABS(TIME_TO_SEC(TIMEDIFF(u.birth_time, %s))) <= 7200
-                        ORDER BY ABS(TIME_TO_SEC(TIMEDIFF(u.birth_time, %s))) ASC
-                        LIMIT %s
-                    """, (user_id, current_time, current_time, max_similar - len(similar_users)))
-                    
-                    similar_time_users = cursor.fetchall()
-                    for user in similar_time_users:
-                        user['similarity_type'] = 'similar_time'
-                        user['similarity_score'] = 0.6
-                        similar_users.append(user)
-                
-                # 4. 비슷한 이름을 가진 사용자들 (4순위)
-                if len(similar_users) < max_similar:
-                    current_name = current_user['name']
-                    # 이름의 첫 글자가 같은 사용자들
-                    if len(current_name) > 0:
-                        first_char = current_name[0]
-                        cursor.execute("""
-                            SELECT u.id, u.name, u.birth_date, u.birth_time, u.message,
-                                   p.occupation, p.financial_status, p.interests, 
-                                   p.current_challenges, p.goals, p.personality_traits, 
-                                   p.relationship_status, p.health_concerns
-                            FROM users u
-                            LEFT JOIN user_profiles p ON u.id = p.user_id
-                            WHERE u.id != %s AND u.name LIKE %s
-                            ORDER BY u.created_at DESC
-                            LIMIT %s
-                        """, (user_id, f"{first_char}%", max_similar - len(similar_users)))
-                        
-                        similar_name_users = cursor.fetchall()
-                        for user in similar_name_users:
-                            user['similarity_type'] = 'similar_name'
-                            user['similarity_score'] = 0.4
-                            similar_users.append(user)
-            
-            connection.close()
-            return similar_users[:max_similar]
-            
+            return self.context_loader.load_similar_users(user_id, max_similar)
         except Exception as e:
             print(f"유사한 사용자 검색 오류: {e}")
             return []
@@ -340,7 +243,14 @@ class RAGSystem:
     def get_similar_users_context(self, user_id, max_similar=3):
         """유사한 사용자들의 컨텍스트를 생성합니다."""
         try:
-            similar_users = self.find_similar_users(user_id, max_similar)
+            return self.format_similar_users_context(self.find_similar_users(user_id, max_similar))
+        except Exception as e:
+            print(f"유사한 사용자 컨텍스트 생성 오류: {e}")
+            return ""
+
+    def format_similar_users_context(self, similar_users):
+        """유사한 사용자 목록 → 컨텍스트 텍스트 (없으면 "")"""
+        try:
             if not similar_users:
                 return ""
             
@@ -550,32 +460,47 @@ class RAGSystem:
     def get_personalized_advice(self, user_id, query_text):
         """사용자의 과거 경험과 개인 정보를 바탕으로 개인화된 조언을 제공합니다."""
         try:
-            # 사용자 기본 정보 조회
-            user_info = self.get_user_basic_info(user_id)
-            
-            # 유사한 경험 검색
-            similar_experiences = self.search_similar_experiences(user_id, query_text, top_k=3)
-            
-            # 사용자 정보 기반 컨텍스트 생성
-            user_context = self.create_user_context_for_advice(user_info)
-            
-            if not similar_experiences and not user_context:
+            advice_prompt = self.build_advice_prompt(user_id, query_text)
+            if advice_prompt is None:
                 return "아직 관련된 경험 데이터가 없습니다. 더 많은 경험을 공유해주세요."
             
-            # 과거 경험들을 바탕으로 조언 생성
-            experience_context = ""
-            if similar_experiences:
-                for i, sim_exp in enumerate(similar_experiences, 1):
-                    exp = sim_exp['experience']
-                    similarity = sim_exp['similarity']
-                    experience_context += f"{i}. {exp['experience_text']} (관련도: {similarity:.2f})\n"
-            
-            # 과거 경험 컨텍스트 생성
-            experience_section = ""
-            if experience_context:
-                experience_section = f"사용자의 과거 유사한 경험들:\n{experience_context}"
+            return advice_prompt
             
-            advice_prompt = f"""
+        except Exception as e:
+            print(f"개인화된 조언 생성 오류: {e}")
+            return "개인화된 조언을 생성하는 중 오류가 발생했습니다."
+    
+    def build_advice_prompt(self, user_id, query_text):
+        """
+        개인화된 조언 생성 프롬프트를 만듭니다 (조언 API와 스트리밍 조언이 같이 사용).
+        사용자 정보와 관련 경험이 모두 없으면 None을 반환합니다.
+        """
+        # 사용자 기본 정보 조회
+        user_info = self.get_user_basic_info(user_id)
+        
+        # 유사한 경험 검색
+        similar_experiences = self.search_similar_experiences(user_id, query_text, top_k=3)
+        
+        # 사용자 정보 기반 컨텍스트 생성
+        user_context = self.create_user_context_for_advice(user_info)
+        
+        if not similar_experiences and not user_context:
+            return None
+        
+        # 과거 경험들을 바탕으로 조언 생성
+        experience_context = ""
+        if similar_experiences:
+            for i, sim_exp in enumerate(similar_experiences, 1):
+                exp = sim_exp['experience']
+                similarity = sim_exp['similarity']
+                experience_context += f"{i}. {exp['experience_text']} (관련도: {similarity:.2f})\n"
+        
+        # 과거 경험 컨텍스트 생성
+        experience_section = ""
+        if experience_context:
+            experience_section = f"사용자의 과거 유사한 경험들:\n{experience_context}"
+        
+        advice_prompt = f"""
             사용자의 질문: {query_text}
             
             {user_context}
@@ -585,12 +510,8 @@ class RAGSystem:
             위의 사용자 정보와 과거 경험들을 바탕으로 사용자에게 개인화된 조언을 제공해주세요.
             사용자의 직업, 성격, 관심사 등을 고려하여 구체적이고 실용적인 조언을 포함해주세요.
             """
-            
-            return advice_prompt
-            
-        except Exception as e:
-            print(f"개인화된 조언 생성 오류: {e}")
-            return "개인화된 조언을 생성하는 중 오류가 발생했습니다."
+        
+        return advice_prompt
     
     def create_user_context_for_advice(self, user_info):
         """조언 생성을 위한 사용자 컨텍스트를 생성합니다."""
@@ -637,40 +558,33 @@ class RAGSystem:
         return ""
     
     def get_user_context_for_fortune(self, user_id):
-        """사주 분석을 위한 사용자 컨텍스트를 생성합니다."""
+        """사주 분석을 위한 사용자 컨텍스트를 생성합니다 (필요한 데이터를 한 번의 쿼리 왕복으로 조회)."""
         try:
-            connection = self.get_db_connection()
-            if not connection:
-                return ""
+            context = self.context_loader.load(user_id, max_similar=3)
+            return self.format_fortune_context(context)
             
-            context_parts = []
-            
-            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-                # 1. 사용자 기본 정보 + 프로필 정보
-                cursor.execute("""
-                    SELECT u.name, u.birth_date, u.birth_time, u.message,
-                           p.financial_status, p.occupation, p.interests, 
-                           p.current_challenges, p.goals, p.personality_traits, 
-                           p.relationship_status, p.health_concerns
-                    FROM users u
-                    LEFT JOIN user_profiles p ON u.id = p.user_id
-                    WHERE u.id = %s
-                """, (user_id,))
-                user_data = cursor.fetchone()
-                
-                if user_data:
-                    # 기본 정보
-                    basic_info = f"""
+        except Exception as e:
+            print(f"사용자 컨텍스트 생성 오류: {e}")
+            return ""
+    
+    def format_fortune_context(self, context):
+        """FortuneContext → 사주 분석 프롬프트용 컨텍스트 텍스트"""
+        context_parts = []
+        user_data = context.user
+        
+        if user_data:
+            # 기본 정보
+            basic_info = f"""
 === 사용자 기본 정보 ===
 이름: {user_data.get('name', '미입력')}
 생년월일: {user_data.get('birth_date', '미입력')}
 태어난 시간: {user_data.get('birth_time', '미입력')}
 현재 상황/메시지: {user_data.get('message', '미입력')}
 """
-                    context_parts.append(basic_info)
-                    
-                    # 프로필 정보
-                    profile_context = f"""
+            context_parts.append(basic_info)
+            
+            # 프로필 정보
+            profile_context = f"""
 === 사용자 현재 상황 ===
 재정상태: {user_data.get('financial_status', '미입력')}
 직업: {user_data.get('occupation', '미입력')}
@@ -681,54 +595,30 @@ class RAGSystem:
 연애상태: {user_data.get('relationship_status', '미입력')}
 건강관심사: {user_data.get('health_concerns', '미입력')}
 """
-                    context_parts.append(profile_context)
-                
-                # 2. 최근 경험들 (최근 5개)
-                cursor.execute("""
-                    SELECT experience_text, experience_date, created_at
-                    FROM user_experiences
-                    WHERE user_id = %s
-                    ORDER BY created_at DESC
-                    LIMIT 5
-                """, (user_id,))
-                experiences = cursor.fetchall()
-                
-                if experiences:
-                    experience_context = "\n=== 최근 경험들 ===\n"
-                    for i, exp in enumerate(experiences, 1):
-                        experience_context += f"{i}. {exp['experience_text']}\n"
-                    context_parts.append(experience_context)
-                
-                # 3. 과거 사주 분석 결과들 (최근 3개)
-                cursor.execute("""
-                    SELECT analysis_result, created_at
-                    FROM fortune_analysis
-                    WHERE user_id = %s
-                    ORDER BY created_at DESC
-                    LIMIT 3
-                """, (user_id,))
-                past_analyses = cursor.fetchall()
-                
-                if past_analyses:
-                    analysis_context = "\n=== 과거 사주 분석 요약 ===\n"
-                    for i, analysis in enumerate(past_analyses, 1):
-                        # 분석 결과의 첫 200자만 요약
-                        summary = analysis['analysis_result'][:200] + "..." if len(analysis['analysis_result']) > 200 else analysis['analysis_result']
-                        analysis_context += f"{i}. {summary}\n"
-                    context_parts.append(analysis_context)
-            
-            connection.close()
-            
-            # 4. 유사한 사용자들의 데이터 추가 (RAG 참고용)
-            similar_users_context = self.get_similar_users_context(user_id, max_similar=3)
-            if similar_users_context:
-                context_parts.append(similar_users_context)
-            
-            return "\n".join(context_parts)
-            
-        except Exception as e:
-            print(f"사용자 컨텍스트 생성 오류: {e}")
-            return ""
+            context_parts.append(profile_context)
+        
+        # 최근 경험들 (최근 5개)
+        if context.experiences:
+            experience_context = "\n=== 최근 경험들 ===\n"
+            for i, exp in enumerate(context.experiences, 1):
+                experience_context += f"{i}. {exp['experience_text']}\n"
+            context_parts.append(experience_context)
+        
+        # 과거 사주 분석 결과들 (최근 3개)
+        if context.past_analyses:
+            analysis_context = "\n=== 과거 사주 분석 요약 ===\n"
+            for i, analysis in enumerate(context.past_analyses, 1):
+                # 분석 결과의 첫 200자만 요약
+                summary = analysis['analysis_result'][:200] + "..." if len(analysis['analysis_result']) > 200 else analysis['analysis_result']
+                analysis_context += f"{i}. {summary}\n"
+            context_parts.append(analysis_context)
+        
+        # 유사한 사용자들의 데이터 추가 (RAG 참고용)
+        similar_users_context = self.format_similar_users_context(context.similar_users)
+        if similar_users_context:
+            context_parts.append(similar_users_context)
+        
+        return "\n".join(context_parts)
     
     def save_fortune_analysis_context(self, user_id, analysis_result, context_type="fortune_analysis"):
         """사주 분석 결과를 RAG 컨텍스트로 저장합니다."""
@@ -1,9 +1,23 @@
+from bisect import bisect_right
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
+from chart_results import FiveElementsResult, STEM_PAIRS
+from config import SAJU_CACHE_SIZE, ANALYSIS_TEXT_CACHE_SIZE
+from memo_cache import MemoCache, FragmentCache
+from solar_terms import load_solar_term_minutes
+from calendar_table import (load_calendar_table, TABLE_DAYS,
+                            COL_DAY, COL_MONTH, COL_YEAR, COL_TERM_MINUTE)
 
 class SajuCalculator:
     """사주팔자(연주, 월주, 일주, 시주) 계산 클래스"""
+
+    # (날짜, 시간 구간) → 네 기둥 60갑자 인덱스. 인스턴스가 새로 만들어져도 공유됨
+    _pillar_cache = MemoCache(SAJU_CACHE_SIZE)
+
+    # (기둥 60갑자 인덱스, 일간) → 상세 분석 텍스트의 五行 분석 부분
+    _five_elements_text_cache = FragmentCache(ANALYSIS_TEXT_CACHE_SIZE)
     
     def __init__(self):
         # 천간 (10개) - 한자
@@ -26,7 +40,7 @@ class SajuCalculator:
             '甲寅', '乙卯', '丙辰', '丁巳', '戊午', '己未', '庚申', '辛酉', '壬戌', '癸亥'
         ]
         
-        # 절기 데이터 (양력 기준) - 표에 맞게 정확히 수정
+        # 절기 데이터 (양력 기준) - 절입 시각 표 범위 밖에서 쓰는 고정 절입일
         self.SOLAR_TERMS = {
             1: [6],        # 소한 (1/6)
             2: [4],        # 입춘 (2/4)
@@ -101,8 +115,114 @@ class SajuCalculator:
             '丁': '庚', '壬': '庚',  # 丁, 壬 → 庚子 시작
             '戊': '壬', '癸': '壬'   # 戊, 癸 → 壬子 시작
         }
-    
-    
+
+        # 정수 모델 (천간 0~9, 지지 0~11, 60갑자 0~59) - 위 매핑에서 한 번만 만들어 둠
+        self.BASE_ORDINAL = self.BASE_DATE.toordinal()
+        self.BASE_YEAR_JIAZI_INDEX = 36  # 1900년 = 庚子
+
+        # 월(1~12) → 절입일 (인덱스 0은 사용하지 않음)
+        self.SOLAR_TERM_DAY = (0,) + tuple(self.SOLAR_TERMS[m][0] for m in range(1, 13))
+
+        # (천간, 지지) → 60갑자 인덱스
+        self.JIAZI_INDEX = {(self.CHEONGAN.index(g[0]), self.JIJI.index(g[1])): i
+                            for i, g in enumerate(self.JIAZI_CYCLE)}
+
+        # 간지 문자열 → 60갑자 인덱스
+        self.JIAZI_CODE = {g: i for i, g in enumerate(self.JIAZI_CYCLE)}
+
+        # 오행 순서와 60갑자 인덱스 → (천간 오행, 지지 오행) 인덱스
+        self.FIVE_ELEMENT_NAMES = ['木', '火', '土', '金', '水']
+        self.JIAZI_ELEMENT_INDEXES = tuple(
+            (self.FIVE_ELEMENT_NAMES.index(self.CHEONGAN_FIVE_ELEMENTS[g[0]]),
+             self.FIVE_ELEMENT_NAMES.index(self.JIJI_FIVE_ELEMENTS[g[1]]))
+            for g in self.JIAZI_CYCLE
+        )
+
+        # 상세 분석 텍스트 머리말 (사주·생년월일시만 채움, 五行 분석 부분은 사주 키별로 캐시)
+        self.DETAILED_ANALYSIS_HEADER = """
+=== 사주팔자 분석 ===
+연주: {year_pillar} (年柱)
+월주: {month_pillar} (月柱)
+일주: {day_pillar} (日柱)
+시주: {hour_pillar} (時柱)
+=== 날짜 정보 ===
+생년월일: {birth_date}
+생시: {birth_time}
+
+
+"""
+
+        # 연간 → 월(1~12) → 월주 60갑자 인덱스
+        jiji_order = ['寅', '卯', '辰', '巳', '午', '未', '申', '酉', '戌', '亥', '子', '丑']
+        self.MONTH_JIAZI_TABLE = tuple(
+            (-1,) + tuple(
+                self.JIAZI_INDEX[(
+                    (self.CHEONGAN.index(self.YEAR_TO_MONTH_START[year_cheongan])
+                     + jiji_order.index(self.MONTH_JIJI_MAPPING[month])) % 10,
+                    self.JIJI.index(self.MONTH_JIJI_MAPPING[month])
+                )]
+                for month in range(1, 13)
+            )
+            for year_cheongan in self.CHEONGAN
+        )
+
+        # 일간 → 시지 → 시주 60갑자 인덱스
+        self.HOUR_JIAZI_TABLE = tuple(
+            tuple(
+                self.JIAZI_INDEX[((self.CHEONGAN.index(self.DAY_TO_HOUR_START[day_cheongan]) + jiji) % 10, jiji)]
+                for jiji in range(12)
+            )
+            for day_cheongan in self.CHEONGAN
+        )
+
+        # 하루 중 분(0~1439) → 시지 인덱스 (00:00~01:30 子, 01:31~03:30 丑 ... 23:31~ 夜子)
+        self.HOUR_JIJI_BY_MINUTE = tuple(((minute + 29) // 120) % 12 for minute in range(1440))
+
+        # 하루 중 분 → 시간 구간 (같은 날짜·같은 구간이면 사주가 같음)
+        # 0~11: 시지 구간 (亥는 23:29까지), 12: 23:30 (亥시지만 일주는 다음날), 13: 夜子 23:31~
+        self.TIME_BUCKET_BY_MINUTE = tuple(
+            13 if minute >= 1411 else 12 if minute == 1410 else self.HOUR_JIJI_BY_MINUTE[minute]
+            for minute in range(1440)
+        )
+
+        # 12절 절입 시각 (BASE_DATE 기준 분, 정렬됨) - 첫 항목은 표 첫해의 소한
+        self.SOLAR_TERM_MINUTES = load_solar_term_minutes()
+        if self.SOLAR_TERM_MINUTES:
+            first_term_year = (self.BASE_DATE + timedelta(minutes=self.SOLAR_TERM_MINUTES[0])).year
+        else:
+            first_term_year = self.BASE_DATE.year
+        # 첫 소한은 전년도(입춘 기준 해)의 丑월 - 이후 절마다 월주는 1씩, 연주는 입춘마다 1씩 증가
+        self.FIRST_TERM_YEAR_CODE = self._get_year_code(first_term_year - 1)
+        self.FIRST_TERM_MONTH_CODE = self.MONTH_JIAZI_TABLE[self._get_year_cheongan_index(first_term_year - 1)][1]
+
+        # 지난 절의 수(bisect 결과) → (연주, 월주) 60갑자 인덱스
+        # 첫 절 이전과 마지막 절 이후(다음 절을 모름)는 None → 고정 절입일로 계산
+        self.TERM_CODES_BY_COUNT = [None] + [
+            ((self.FIRST_TERM_YEAR_CODE + (term_index + 11) // 12) % 60,
+             (self.FIRST_TERM_MONTH_CODE + term_index) % 60)
+            for term_index in range(len(self.SOLAR_TERM_MINUTES) - 1)
+        ] + [None] * bool(self.SOLAR_TERM_MINUTES)
+
+        # 기준일로부터의 일수 → 그날 절입 시각 (자정 기준 분)
+        self.TERM_MINUTE_BY_DAY = {minute // 1440: minute % 1440 for minute in self.SOLAR_TERM_MINUTES}
+
+        # 배치 계산용 배열 (위 테이블과 같은 내용)
+        self.SOLAR_TERM_MINUTE_ARRAY = np.array(self.SOLAR_TERM_MINUTES, dtype=np.int64)
+        self.TERM_YEAR_CODE_ARRAY = np.array([codes[0] if codes else -1 for codes in self.TERM_CODES_BY_COUNT])
+        self.TERM_MONTH_CODE_ARRAY = np.array([codes[1] if codes else -1 for codes in self.TERM_CODES_BY_COUNT])
+        self.SOLAR_TERM_DAY_ARRAY = np.array(self.SOLAR_TERM_DAY)
+        self.MONTH_JIAZI_ARRAY = np.array(self.MONTH_JIAZI_TABLE)
+        self.HOUR_JIAZI_ARRAY = np.array(self.HOUR_JIAZI_TABLE)
+        self.HOUR_JIJI_ARRAY = np.array(self.HOUR_JIJI_BY_MINUTE)
+
+        # 60갑자 인덱스 → 문자열 변환용 배열 (JIAZI_ARRAY[codes])
+        self.JIAZI_ARRAY = np.array(self.JIAZI_CYCLE)
+
+        # 미리 생성된 1900~2100년 달력 테이블 (읽기 전용 메모리 매핑, 없으면 계산 방식 사용)
+        self.calendar_table = load_calendar_table()
+        self.calendar_rows = memoryview(self.calendar_table) if self.calendar_table is not None else None
+
+
     
     def calculate_saju(self, birth_date: str, birth_time: str) -> Dict[str, str]:
         """
@@ -116,253 +236,377 @@ class SajuCalculator:
             사주팔자 딕셔너리
         """
         try:
-            # 날짜 파싱
-            year, month, day = map(int, birth_date.split('-'))
-            
-            # 시간 파싱 (시간 형식 자동 처리)
-            if len(birth_time.split(':')) == 3:
-                # HH:MM:SS 형식
-                time_parts = birth_time.split(':')
-                hour, minute, second = map(int, time_parts)
-            else:
-                # HH:MM 형식
-                time_parts = birth_time.split(':')
-                hour, minute = map(int, time_parts)
-                second = 0
-            
-            # 최종 날짜시간 생성
-            birth_datetime = datetime(year, month, day, hour, minute, second)
-            
-            # 연주 계산
-            year_pillar = self._calculate_year_pillar(birth_datetime.year)
-            
-            # 월주 계산
-            month_pillar = self._calculate_month_pillar(birth_datetime)
-            
-            # 일주 계산
-            day_pillar = self._calculate_day_pillar(birth_datetime)
-            
-            # 시주 계산
-            hour_pillar = self._calculate_hour_pillar(birth_datetime)
-            
-            return {
-                'year_pillar': year_pillar,      # 연주
-                'month_pillar': month_pillar,   # 월주
-                'day_pillar': day_pillar,       # 일주
-                'hour_pillar': hour_pillar,     # 시주
-                'birth_date': birth_date,        # 생년월일
-                'birth_time': birth_time         # 생시
-            }
+            birth_datetime = self._parse_birth_datetime(birth_date, birth_time)
+            return self.calculate_saju_from_datetime(birth_datetime, birth_date, birth_time)
             
         except Exception as e:
             print(f"사주 계산 오류: {e}")
             return {}
-    
-    def _calculate_year_pillar(self, year: int) -> str:
-        """연주 계산"""
-        # 기준년도(1900년)로부터의 차이 계산
-        year_diff = year - 1900
-        
-        # 천간 계산 (10년 주기) - 1900년은 庚년
-        base_cheongan_index = 6  # 庚
-        cheongan_index = (base_cheongan_index + year_diff) % 10
-        
-        # 지지 계산 (12년 주기) - 1900년은 子년
-        base_jiji_index = 0  # 子
-        jiji_index = (base_jiji_index + year_diff) % 12
-        
-        return f"{self.CHEONGAN[cheongan_index]}{self.JIJI[jiji_index]}"
-    
-    def _calculate_month_pillar(self, birth_datetime: datetime) -> str:
-        """월주 계산 (절기 기준) - 표에 맞게 정확히 수정"""
-        year = birth_datetime.year
-        month = birth_datetime.month
-        day = birth_datetime.day
+
+    def calculate_saju_from_datetime(self, birth_datetime: datetime, birth_date: str, birth_time: str) -> Dict[str, str]:
+        """
+        이미 파싱한 출생 datetime으로 사주팔자를 계산합니다 (calculate_saju와 같은 결과, 오류는 그대로 전달).
+        birth_date, birth_time은 결과에 그대로 담습니다.
+        """
+        # 네 기둥을 정수(60갑자 인덱스)로 계산 - (날짜, 시간 구간) 단위로 캐시
+        year_code, month_code, day_code, hour_code = self._pillar_cache.get_or_compute(
+            self._chart_key(birth_datetime),
+            lambda: self._calculate_pillar_codes(birth_datetime)
+        )
         
-        # 해당 월의 절기 확인
-        solar_term_day = self.SOLAR_TERMS[month][0]
+        # 문자열 변환은 반환 직전에만
+        return {
+            'year_pillar': self.JIAZI_CYCLE[year_code],    # 연주
+            'month_pillar': self.JIAZI_CYCLE[month_code],  # 월주
+            'day_pillar': self.JIAZI_CYCLE[day_code],      # 일주
+            'hour_pillar': self.JIAZI_CYCLE[hour_code],    # 시주
+            'birth_date': birth_date,        # 생년월일
+            'birth_time': birth_time         # 생시
+        }
+
+    def chart_key(self, birth_date: str, birth_time: str) -> Tuple[int, int, bool]:
+        """
+        사주를 결정하는 정규화 키 (날짜 서수, 시간 구간, 절입 이후 여부)를 반환합니다.
+        "14:30"과 "14:30:00"처럼 같은 사주가 되는 입력은 같은 키가 됩니다.
+        잘못된 입력이면 ValueError가 발생합니다.
+        """
+        return self._chart_key(self._parse_birth_datetime(birth_date, birth_time))
+
+    def _chart_key(self, birth_datetime: datetime) -> Tuple[int, int, bool]:
+        """datetime → (날짜 서수, 시간 구간, 절입 이후 여부)"""
+        ordinal = birth_datetime.toordinal()
+        total_minutes = birth_datetime.hour * 60 + birth_datetime.minute
+        # 절입일은 같은 시간 구간 안에서도 절입 시각 전후로 월주·연주가 달라짐
+        term_minute = self.TERM_MINUTE_BY_DAY.get(ordinal - self.BASE_ORDINAL)
+        return (ordinal, self.TIME_BUCKET_BY_MINUTE[total_minutes],
+                term_minute is not None and total_minutes >= term_minute)
+
+    def _parse_birth_datetime(self, birth_date: str, birth_time: str) -> datetime:
+        """생년월일(YYYY-MM-DD)과 생시(HH:MM 또는 HH:MM:SS)를 datetime으로 변환"""
+        # 날짜 파싱
+        year, month, day = map(int, birth_date.split('-'))
+        
+        # 시간 파싱 (시간 형식 자동 처리)
+        if len(birth_time.split(':')) == 3:
+            # HH:MM:SS 형식
+            time_parts = birth_time.split(':')
+            hour, minute, second = map(int, time_parts)
+        else:
+            # HH:MM 형식
+            time_parts = birth_time.split(':')
+            hour, minute = map(int, time_parts)
+            second = 0
         
-        # 절기 이전이면 이전 달의 지지 사용
-        if day < solar_term_day:
-            month = month - 1 if month > 1 else 12
-            if month == 12:
+        return datetime(year, month, day, hour, minute, second)
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, any]:
+        """사주 계산 캐시 적중/미스 통계"""
+        return cls._pillar_cache.stats()
+
+    @classmethod
+    def analysis_cache_stats(cls) -> Dict[str, any]:
+        """상세 분석 텍스트(五行 부분) 캐시 적중/미스 통계와 메모리 사용량"""
+        return cls._five_elements_text_cache.stats()
+
+    def calculate_saju_batch(self, birth_dates, birth_times=None) -> Dict[str, np.ndarray]:
+        """
+        여러 명의 사주팔자를 한 번에(벡터화) 계산합니다.
+
+        Args:
+            birth_dates: 생년월일 배열 (YYYY-MM-DD 문자열, date, datetime64) 또는
+                         birth_date, birth_time 컬럼을 가진 DataFrame
+            birth_times: 생시 배열 (HH:MM / HH:MM:SS 문자열, timedelta 또는 자정 기준 분)
+
+        Returns:
+            각 주를 60갑자 인덱스(0~59)로 담은 정수 배열 딕셔너리.
+            JIAZI_ARRAY[codes]로 calculate_saju와 같은 문자열을 얻을 수 있으며,
+            계산할 수 없는 행은 -1로 채워집니다.
+        """
+        if isinstance(birth_dates, pd.DataFrame):
+            birth_times = birth_dates['birth_time']
+            birth_dates = birth_dates['birth_date']
+
+        # 날짜 파싱
+        dates = pd.to_datetime(pd.Series(birth_dates).reset_index(drop=True), errors='coerce')
+
+        # 시간 파싱 (timedelta: DB TIME 컬럼, 숫자: 자정 기준 분, 그 외: HH:MM[:SS] 문자열)
+        times = pd.Series(birth_times).reset_index(drop=True)
+        if pd.api.types.is_timedelta64_dtype(times):
+            seconds = times.dt.total_seconds()
+            hours, minutes, secs = seconds // 3600, (seconds % 3600) // 60, seconds % 60
+        elif pd.api.types.is_numeric_dtype(times):
+            hours, minutes, secs = times // 60, times % 60, pd.Series(0, index=times.index)
+        else:
+            hours, minutes, secs = self._parse_time_strings(times.astype(str))
+
+        valid = (dates.notna() & hours.between(0, 23) & minutes.between(0, 59)
+                 & secs.between(0, 59)).to_numpy()
+
+        dates = dates.where(valid, self.BASE_DATE)
+        year = dates.dt.year.to_numpy(np.int64)
+        month = dates.dt.month.to_numpy(np.int64)
+        day = dates.dt.day.to_numpy(np.int64)
+        days_diff = (dates - self.BASE_DATE).dt.days.to_numpy(np.int64)
+        total_minutes = (hours * 60 + minutes).where(valid, 0).to_numpy(np.int64)
+
+        # 모두 달력 테이블 범위 안이면 테이블에서 한 번에 조회
+        if self.calendar_table is not None and ((days_diff >= 0) & (days_diff < TABLE_DAYS - 1)).all():
+            codes = self._lookup_pillar_codes_batch(self.calendar_table, days_diff, total_minutes)
+        else:
+            codes = self._calculate_pillar_codes_batch(year, month, day, days_diff, total_minutes)
+        return {name: np.where(valid, code, -1).astype(np.int8) for name, code in codes.items()}
+
+    def _parse_time_strings(self, times: pd.Series) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        """HH:MM / HH:MM:SS 문자열 배열을 시, 분, 초로 분리"""
+        # 고정 폭(HH:MM, HH:MM:SS) 문자열은 문자 코드 배열에서 바로 숫자를 읽음
+        chars = times.to_numpy().astype('U8').view(np.uint32).reshape(len(times), 8).astype(np.int64)
+        digits = chars - ord('0')
+        is_digit = (digits >= 0) & (digits <= 9)
+        short_form = (chars[:, 5] == 0)
+        fixed_width = (is_digit[:, [0, 1, 3, 4]].all(axis=1) & (chars[:, 2] == ord(':'))
+                       & (short_form | ((chars[:, 5] == ord(':')) & is_digit[:, 6] & is_digit[:, 7]))
+                       & (times.str.len().to_numpy() <= 8))
+
+        hours = pd.Series(digits[:, 0] * 10 + digits[:, 1], dtype=float)
+        minutes = pd.Series(digits[:, 3] * 10 + digits[:, 4], dtype=float)
+        secs = pd.Series(np.where(short_form, 0, digits[:, 6] * 10 + digits[:, 7]), dtype=float)
+
+        # 그 외 형식(H:MM 등)은 split으로 처리
+        if not fixed_width.all():
+            rest = ~fixed_width
+            parts = times[rest].str.split(':', expand=True).reindex(columns=range(3))
+            hours[rest] = pd.to_numeric(parts[0], errors='coerce')
+            minutes[rest] = pd.to_numeric(parts[1], errors='coerce')
+            secs[rest] = pd.to_numeric(parts[2], errors='coerce').fillna(0)
+
+        return hours, minutes, secs
+
+    def _lookup_pillar_codes_batch(self, table: np.ndarray, days_diff: np.ndarray,
+                                   total_minutes: np.ndarray) -> Dict[str, np.ndarray]:
+        """달력 테이블에서 네 기둥의 60갑자 인덱스를 배열로 조회 (_lookup_pillar_codes와 같은 규칙)"""
+        term_row = days_diff - (total_minutes < table[days_diff, COL_TERM_MINUTE])
+        day_row = days_diff + (total_minutes >= 1410)
+        stem_row = days_diff + (total_minutes >= 1411)
+
+        return {
+            'year_pillar': table[term_row, COL_YEAR],
+            'month_pillar': table[term_row, COL_MONTH],
+            'day_pillar': table[day_row, COL_DAY],
+            'hour_pillar': self.HOUR_JIAZI_ARRAY[table[stem_row, COL_DAY] % 10,
+                                                 self.HOUR_JIJI_ARRAY[total_minutes]]
+        }
+
+    def _calculate_pillar_codes_batch(self, year: np.ndarray, month: np.ndarray, day: np.ndarray,
+                                      days_diff: np.ndarray, total_minutes: np.ndarray) -> Dict[str, np.ndarray]:
+        """정수 배열로 네 기둥의 60갑자 인덱스 계산 (calculate_saju와 같은 테이블 사용)"""
+        # 연주·월주: 절입 시각 표에서 이분 탐색 (표 범위 밖은 -1)
+        term_count = np.searchsorted(self.SOLAR_TERM_MINUTE_ARRAY, days_diff * 1440 + total_minutes, side='right')
+        year_code = self.TERM_YEAR_CODE_ARRAY[term_count]
+        month_code = self.TERM_MONTH_CODE_ARRAY[term_count]
+
+        out_of_range = year_code < 0
+        if out_of_range.any():
+            # 고정 절입일 기준: 절입일 이전이면 이전 달 (1월이면 전년도 12월)
+            before_term = day < self.SOLAR_TERM_DAY_ARRAY[month]
+            term_month = np.where(before_term, month - 1, month)
+            term_year = np.where(term_month == 0, year - 1, year)
+            term_month = np.where(term_month == 0, 12, term_month)
+            # 丑월(소한~입춘)은 전년도에 속함
+            solar_year = np.where(term_month == 1, term_year - 1, term_year)
+
+            year_code = np.where(out_of_range, (self.BASE_YEAR_JIAZI_INDEX + solar_year - 1900) % 60, year_code)
+            month_code = np.where(out_of_range, self.MONTH_JIAZI_ARRAY[(6 + solar_year - 1900) % 10, term_month],
+                                  month_code)
+
+        # 일주: 23:30 이후는 다음날 기준
+        day_code = (self.BASE_JIAZI_INDEX + days_diff + (total_minutes >= 1410)) % 60
+
+        # 시주: 夜子(23:31~)만 다음날 일간 사용
+        day_cheongan = (self.BASE_JIAZI_INDEX + days_diff + (total_minutes >= 1411)) % 10
+        hour_code = self.HOUR_JIAZI_ARRAY[day_cheongan, self.HOUR_JIJI_ARRAY[total_minutes]]
+
+        return {
+            'year_pillar': year_code,
+            'month_pillar': month_code,
+            'day_pillar': day_code,
+            'hour_pillar': hour_code
+        }
+
+    def _calculate_pillar_codes(self, birth_datetime: datetime) -> Tuple[int, int, int, int]:
+        """네 기둥의 60갑자 인덱스 (연주, 월주, 일주, 시주)"""
+        days_diff = birth_datetime.toordinal() - self.BASE_ORDINAL
+        total_minutes = birth_datetime.hour * 60 + birth_datetime.minute
+
+        # 달력 테이블 범위 안이면 O(1) 조회, 아니면 계산
+        if self.calendar_rows is not None and 0 <= days_diff < TABLE_DAYS - 1:
+            return self._lookup_pillar_codes(self.calendar_rows, days_diff, total_minutes)
+        return self._compute_pillar_codes(birth_datetime.year, birth_datetime.month, birth_datetime.day,
+                                          days_diff, total_minutes)
+
+    def _lookup_pillar_codes(self, rows: memoryview, days_diff: int, total_minutes: int) -> Tuple[int, int, int, int]:
+        """달력 테이블에서 네 기둥의 60갑자 인덱스 조회"""
+        # 절입 시각 이전이면 전날 행의 월주·연주 사용
+        term_row = days_diff - 1 if total_minutes < rows[days_diff, COL_TERM_MINUTE] else days_diff
+        day_row = days_diff + 1 if total_minutes >= 1410 else days_diff
+        stem_row = days_diff + 1 if total_minutes >= 1411 else days_diff
+
+        return (
+            rows[term_row, COL_YEAR],
+            rows[term_row, COL_MONTH],
+            rows[day_row, COL_DAY],
+            self.HOUR_JIAZI_TABLE[rows[stem_row, COL_DAY] % 10][self.HOUR_JIJI_BY_MINUTE[total_minutes]]
+        )
+
+    def _compute_pillar_codes(self, year: int, month: int, day: int,
+                              days_diff: int, total_minutes: int) -> Tuple[int, int, int, int]:
+        """기준일로부터의 날짜 계산으로 네 기둥의 60갑자 인덱스 계산"""
+        year_code, month_code = self._get_year_month_codes(year, month, day, days_diff, total_minutes)
+        return (
+            year_code,
+            month_code,
+            self._get_day_code(days_diff, total_minutes),
+            self._get_hour_code(days_diff, total_minutes)
+        )
+
+    def _get_year_code(self, year: int) -> int:
+        """연주 60갑자 인덱스 (1900년 = 庚子, 입춘 이후 기준)"""
+        return (self.BASE_YEAR_JIAZI_INDEX + year - 1900) % 60
+
+    def _get_year_month_codes(self, year: int, month: int, day: int,
+                              days_diff: int, total_minutes: int) -> Tuple[int, int]:
+        """연주·월주 60갑자 인덱스 (절입 시각 기준 - 연주는 입춘에 바뀜)"""
+        # 지금까지 지난 절의 수로 월주·연주가 정해짐
+        codes = self.TERM_CODES_BY_COUNT[bisect_right(self.SOLAR_TERM_MINUTES, days_diff * 1440 + total_minutes)]
+        if codes is not None:
+            return codes
+
+        # 표 범위 밖: 고정 절입일 이전이면 이전 달의 지지 사용
+        if day < self.SOLAR_TERM_DAY[month]:
+            month -= 1
+            if month == 0:
+                month = 12
                 year -= 1
-        
-        # 월지 결정
-        month_jiji = self.MONTH_JIJI_MAPPING[month]
-        
-        # 연간 천간 가져오기
-        year_cheongan = self._get_year_cheongan(year)
-        
-        # 연간에 따른 월간 시작점 결정 (표 기준)
-        month_start_cheongan = self.YEAR_TO_MONTH_START[year_cheongan]
-        
-        # 월지 순서 (寅부터 시작)
-        jiji_order = ['寅', '卯', '辰', '巳', '午', '未', '申', '酉', '戌', '亥', '子', '丑']
-        
-        # 현재 월지의 인덱스 찾기
-        month_jiji_index = jiji_order.index(month_jiji)
-        
-        # 월간 계산: 시작 천간에서 월지 순서만큼 더하기
-        start_cheongan_index = self.CHEONGAN.index(month_start_cheongan)
-        month_cheongan_index = (start_cheongan_index + month_jiji_index) % 10
-        
-        return f"{self.CHEONGAN[month_cheongan_index]}{month_jiji}"
-    
+
+        # 丑월(소한~입춘)은 전년도에 속함
+        if month == 1:
+            year -= 1
+
+        return self._get_year_code(year), self.MONTH_JIAZI_TABLE[self._get_year_cheongan_index(year)][month]
+
+    def _get_day_code(self, days_diff: int, total_minutes: int) -> int:
+        """일주 60갑자 인덱스 (23:30~24:00은 다음날 기준)"""
+        if total_minutes >= 1410:
+            days_diff += 1
+        return (self.BASE_JIAZI_INDEX + days_diff) % 60
+
+    def _get_hour_code(self, days_diff: int, total_minutes: int) -> int:
+        """시주 60갑자 인덱스 (夜子 23:31~24:00만 다음날의 일간 사용)"""
+        if total_minutes >= 1411:
+            days_diff += 1
+        day_cheongan = self._get_day_cheongan_index(days_diff)
+        return self.HOUR_JIAZI_TABLE[day_cheongan][self.HOUR_JIJI_BY_MINUTE[total_minutes]]
+
+    def _get_year_cheongan_index(self, year: int) -> int:
+        """연간 인덱스 (1900년 = 庚)"""
+        return (6 + year - 1900) % 10
+
+    def _get_day_cheongan_index(self, days_diff: int) -> int:
+        """일간 인덱스 (기준일로부터의 일수 기준)"""
+        return (self.BASE_JIAZI_INDEX + days_diff) % 10
+
+    def _calculate_year_pillar(self, year: int) -> str:
+        """연주 계산 (입춘 이후 기준)"""
+        return self.JIAZI_CYCLE[self._get_year_code(year)]
+
+    def _calculate_month_pillar(self, birth_datetime: datetime) -> str:
+        """월주 계산 (절입 시각 기준)"""
+        days_diff = birth_datetime.toordinal() - self.BASE_ORDINAL
+        _, month_code = self._get_year_month_codes(birth_datetime.year, birth_datetime.month, birth_datetime.day,
+                                                   days_diff, birth_datetime.hour * 60 + birth_datetime.minute)
+        return self.JIAZI_CYCLE[month_code]
+
     def _calculate_day_pillar(self, birth_datetime: datetime) -> str:
         """일주 계산 (60갑자 순환표 기준 - 자시는 다음날로 계산)"""
-        hour = birth_datetime.hour
-        minute = birth_datetime.minute
-        
-        # 시간을 분 단위로 변환
-        total_minutes = hour * 60 + minute
-        
-        # 23:30~00:00 시간대인 경우 다음날 기준으로 일주 계산
-        if total_minutes >= 1410:  # 23:30~24:00
-            # 다음날 기준으로 일주 계산
-            next_day = birth_datetime + timedelta(days=1)
-            days_diff = (next_day - self.BASE_DATE).days
-        else:
-            # 현재날 기준으로 일주 계산
-            days_diff = (birth_datetime - self.BASE_DATE).days
-        
-        # 60갑자 순환표 기준으로 일주 계산
-        jiazi_index = (self.BASE_JIAZI_INDEX + days_diff) % 60
-        
-        return self.JIAZI_CYCLE[jiazi_index]
-    
+        days_diff = birth_datetime.toordinal() - self.BASE_ORDINAL
+        return self.JIAZI_CYCLE[self._get_day_code(days_diff, birth_datetime.hour * 60 + birth_datetime.minute)]
+
     def _calculate_hour_pillar(self, birth_datetime: datetime) -> str:
         """시주 계산 (표 기준 - 자시는 다음날로 계산)"""
-        hour = birth_datetime.hour
-        minute = birth_datetime.minute
-        
-        # 시간을 분 단위로 변환
-        total_minutes = hour * 60 + minute
-        
-        # 시지 매핑 (30분 단위 기준 - 표에 맞게 정확히 수정)
-        if total_minutes >= 0 and total_minutes <= 90:  # 00:00~01:30
-            hour_jiji = '子'  # 朝子
-        elif total_minutes >= 91 and total_minutes <= 210:  # 01:31~03:30
-            hour_jiji = '丑'
-        elif total_minutes >= 211 and total_minutes <= 330:  # 03:31~05:30
-            hour_jiji = '寅'
-        elif total_minutes >= 331 and total_minutes <= 450:  # 05:31~07:30
-            hour_jiji = '卯'
-        elif total_minutes >= 451 and total_minutes <= 570:  # 07:31~09:30
-            hour_jiji = '辰'
-        elif total_minutes >= 571 and total_minutes <= 690:  # 09:31~11:30
-            hour_jiji = '巳'
-        elif total_minutes >= 691 and total_minutes <= 810:  # 11:31~13:30
-            hour_jiji = '午'
-        elif total_minutes >= 811 and total_minutes <= 930:  # 13:31~15:30
-            hour_jiji = '未'
-        elif total_minutes >= 931 and total_minutes <= 1050:  # 15:31~17:30
-            hour_jiji = '申'
-        elif total_minutes >= 1051 and total_minutes <= 1170:  # 17:31~19:30
-            hour_jiji = '酉'
-        elif total_minutes >= 1171 and total_minutes <= 1290:  # 19:31~21:30
-            hour_jiji = '戌'
-        elif total_minutes >= 1291 and total_minutes <= 1410:  # 21:31~23:30
-            hour_jiji = '亥'
-        elif total_minutes >= 1411:  # 23:31~24:00
-            hour_jiji = '子'  # 夜子
-        else:
-            hour_jiji = '子'  # 기본값
-        
-        # 자시(子시) 중에서도 23:31~24:00(夜子)만 다음날의 일간 사용
-        if hour_jiji == '子' and total_minutes >= 1411:  # 23:31~24:00 (夜子)
-            # 다음날의 일간 계산
-            next_day = birth_datetime + timedelta(days=1)
-            day_cheongan = self._get_day_cheongan(next_day)
-        else:
-            # 현재날의 일간 사용 (00:01~01:30 포함)
-            day_cheongan = self._get_day_cheongan(birth_datetime)
-        
-        # 일간에 따른 자시 천간 시작점 결정 (표 기준)
-        hour_start_cheongan = self.DAY_TO_HOUR_START[day_cheongan]
-        
-        # 지지 순서 (子부터 시작)
-        jiji_order = ['子', '丑', '寅', '卯', '辰', '巳', '午', '未', '申', '酉', '戌', '亥']
-        
-        # 현재 시지의 인덱스 찾기
-        hour_jiji_index = jiji_order.index(hour_jiji)
-        
-        # 시주 천간 계산: 자시 천간에서 시지 순서만큼 더하기
-        start_cheongan_index = self.CHEONGAN.index(hour_start_cheongan)
-        hour_cheongan_index = (start_cheongan_index + hour_jiji_index) % 10
-        
-        return f"{self.CHEONGAN[hour_cheongan_index]}{hour_jiji}"
-    
+        days_diff = birth_datetime.toordinal() - self.BASE_ORDINAL
+        return self.JIAZI_CYCLE[self._get_hour_code(days_diff, birth_datetime.hour * 60 + birth_datetime.minute)]
+
     def _get_year_cheongan(self, year: int) -> str:
         """연도에 해당하는 천간 반환"""
-        year_diff = year - 1900
-        base_cheongan_index = 6  # 庚
-        cheongan_index = (base_cheongan_index + year_diff) % 10
-        return self.CHEONGAN[cheongan_index]
-    
+        return self.CHEONGAN[self._get_year_cheongan_index(year)]
+
     def _get_day_cheongan(self, birth_datetime: datetime) -> str:
         """일간 반환 (60갑자 순환표 기준)"""
-        days_diff = (birth_datetime - self.BASE_DATE).days
-        jiazi_index = (self.BASE_JIAZI_INDEX + days_diff) % 60
-        return self.JIAZI_CYCLE[jiazi_index][0]  # 천간 부분만 반환
+        return self.CHEONGAN[self._get_day_cheongan_index(birth_datetime.toordinal() - self.BASE_ORDINAL)]
     
-    def analyze_five_elements(self, saju: Dict[str, str]) -> Dict[str, any]:
-        """사주팔자의 오행 분석"""
+    def analyze_five_elements(self, saju: Dict[str, str]) -> Union[FiveElementsResult, Dict[str, any]]:
+        """
+        사주팔자의 오행 분석.
+        정수 코드만 담은 FiveElementsResult를 반환하며, 딕셔너리처럼 읽으면
+        (day_element, five_elements_count, strong_elements, weak_elements, cheongan_combinations) 값으로 변환됩니다.
+        사주가 없으면 빈 딕셔너리를 반환합니다 (기존 호출부의 `if not five_elements` 검사 유지).
+        """
         if not saju:
             return {}
         
-        # 각 주의 오행 추출
-        pillars = ['year_pillar', 'month_pillar', 'day_pillar', 'hour_pillar']
-        five_elements_count = {'木': 0, '火': 0, '土': 0, '金': 0, '水': 0}
-        cheongan_list = []
+        # 각 주의 60갑자 인덱스 (없거나 잘못된 기둥은 제외)
+        codes = [self.JIAZI_CODE[saju[pillar]] for pillar in ['year_pillar', 'month_pillar', 'day_pillar', 'hour_pillar']
+                 if saju.get(pillar) in self.JIAZI_CODE]
         
-        for pillar in pillars:
-            if pillar in saju:
-                pillar_value = saju[pillar]
-                if len(pillar_value) == 2:
-                    cheongan = pillar_value[0]
-                    jiji = pillar_value[1]
-                    
-                    cheongan_list.append(cheongan)
-                    
-                    # 천간 오행
-                    if cheongan in self.CHEONGAN_FIVE_ELEMENTS:
-                        five_elements_count[self.CHEONGAN_FIVE_ELEMENTS[cheongan]] += 1
-                    
-                    # 지지 오행
-                    if jiji in self.JIJI_FIVE_ELEMENTS:
-                        five_elements_count[self.JIJI_FIVE_ELEMENTS[jiji]] += 1
+        # 천간·지지 오행 개수
+        counts = [0] * 5
+        for code in codes:
+            stem_element, branch_element = self.JIAZI_ELEMENT_INDEXES[code]
+            counts[stem_element] += 1
+            counts[branch_element] += 1
         
-        # 일간 (일주의 천간) 추출
-        day_cheongan = saju.get('day_pillar', '')[0] if saju.get('day_pillar') else ''
-        day_element = self.CHEONGAN_FIVE_ELEMENTS.get(day_cheongan, '')
+        # 천간합 (두 천간 쌍마다 비트 하나)
+        combination_bits = 0
+        for bit, (i, j) in enumerate(STEM_PAIRS):
+            if j < len(codes) and (self.CHEONGAN[codes[i] % 10], self.CHEONGAN[codes[j] % 10]) in self.CHEONGAN_COMBINATIONS:
+                combination_bits |= 1 << bit
         
-        # 천간합 분석
-        combinations = []
-        for i in range(len(cheongan_list)):
-            for j in range(i + 1, len(cheongan_list)):
-                combo = (cheongan_list[i], cheongan_list[j])
-                if combo in self.CHEONGAN_COMBINATIONS:
-                    combinations.append({
-                        'pair': combo,
-                        'result_element': self.CHEONGAN_COMBINATIONS[combo]
-                    })
+        # 일간 (일주의 천간)
+        day_code = self.JIAZI_CODE.get(saju.get('day_pillar'))
+        day_stem = day_code % 10 if day_code is not None else -1
         
-        return {
-            'day_element': day_element,  # 일간 오행
-            'five_elements_count': five_elements_count,
-            'strong_elements': [elem for elem, count in five_elements_count.items() if count >= 2],
-            'weak_elements': [elem for elem, count in five_elements_count.items() if count == 0],
-            'cheongan_combinations': combinations  # 천간합
-        }
+        return FiveElementsResult(codes, day_stem, counts, combination_bits, self)
     
-    def get_detailed_analysis(self, saju: Dict[str, str]) -> str:
-        """사주팔자 상세 분석 텍스트 생성"""
+    def get_detailed_analysis(self, saju: Dict[str, str], five_elements: Optional[Dict[str, any]] = None) -> str:
+        """
+        사주팔자 상세 분석 텍스트 생성 (오행 분석 결과가 있으면 다시 계산하지 않음).
+        五行 분석 부분은 FiveElementsResult면 (기둥 인덱스, 일간) 키로 캐시하고, 머리말만 매번 채웁니다.
+        """
         if not saju:
             return "사주 계산에 실패했습니다."
         
-        five_elements = self.analyze_five_elements(saju)
+        if five_elements is None:
+            five_elements = self.analyze_five_elements(saju)
         
+        if isinstance(five_elements, FiveElementsResult):
+            five_elements_text = self._five_elements_text_cache.get_or_compute(
+                (five_elements.codes, five_elements.day_stem),
+                lambda: self._format_five_elements_text(five_elements))
+        else:
+            five_elements_text = self._format_five_elements_text(five_elements)
+        
+        header = self.DETAILED_ANALYSIS_HEADER.format(
+            year_pillar=saju.get('year_pillar', ''),
+            month_pillar=saju.get('month_pillar', ''),
+            day_pillar=saju.get('day_pillar', ''),
+            hour_pillar=saju.get('hour_pillar', ''),
+            birth_date=saju.get('birth_date', ''),
+            birth_time=saju.get('birth_time', '')
+        )
+        return (header + five_elements_text).strip()
+    
+    def _format_five_elements_text(self, five_elements: Dict[str, any]) -> str:
+        """상세 분석 텍스트의 五行 분석 부분 (오행 분석 결과에만 의존)"""
         # 천간합 정보 포맷팅
         combinations_text = ""
         if five_elements.get('cheongan_combinations'):
@@ -374,28 +618,12 @@ class SajuCalculator:
                 combo_list.append(f"{pair[0]}+{pair[1]}→{result}")
             combinations_text += ", ".join(combo_list)
         
-        # 날짜 정보 표시
-        date_info = f"""
-=== 날짜 정보 ===
-생년월일: {saju.get('birth_date', '')}
-생시: {saju.get('birth_time', '')}
-"""
-        
-        analysis = f"""
-=== 사주팔자 분석 ===
-연주: {saju.get('year_pillar', '')} (年柱)
-월주: {saju.get('month_pillar', '')} (月柱)
-일주: {saju.get('day_pillar', '')} (日柱)
-시주: {saju.get('hour_pillar', '')} (時柱){date_info}
-
-=== 五行 분석 ===
+        return f"""=== 五行 분석 ===
 일간 五行: {five_elements.get('day_element', '')}
 五行 분포: {five_elements.get('five_elements_count', {})}
 강한 五行: {', '.join(five_elements.get('strong_elements', []))}
 약한 五行: {', '.join(five_elements.get('weak_elements', []))}{combinations_text}
         """
-        
-        return analysis.strip()
 
 # 사용 예시
 if __name__ == "__main__":
@@ -457,3 +685,8 @@ if __name__ == "__main__":
         test_dt = datetime(2002, 9, 20, test_hour, test_minute)
         hour_pillar = calculator._calculate_hour_pillar(test_dt)
         print(f"{test_hour:02d}:{test_minute:02d} → {hour_pillar}")
+    
+    # 테스트 5: 2024년 입춘 (2월 4일 17:27 KST) 전후 - 연주·월주가 바뀜
+    for test_time5 in ["17:26", "17:27"]:
+        saju5 = calculator.calculate_saju("2024-02-04", test_time5)
+        print(f"\n2024-02-04 {test_time5} 연주/월주: {saju5.get('year_pillar', '')} {saju5.get('month_pillar', '')}")
@@ -0,0 +1,76 @@
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from sal_calculator import SalCalculator
+
+
+def random_birth_datetimes(count: int, seed: int):
+    """1900~2100년 사이의 임의 생년월일시 (날짜, 시간 문자열)"""
+    rng = random.Random(seed)
+    start = datetime(1900, 1, 1)
+    total_minutes = (datetime(2100, 12, 31) - start).days * 1440
+    for _ in range(count):
+        when = start + timedelta(minutes=rng.randrange(total_minutes))
+        yield when.strftime('%Y-%m-%d'), when.strftime('%H:%M')
+
+
+def measure(function, charts, repeat: int) -> float:
+    """차트 하나당 평균 실행 시간 (마이크로초, repeat번 중 최솟값)"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for saju in charts:
+            function(saju)
+        best = min(best, time.perf_counter() - started)
+    return best / len(charts) * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='살 계산 벤치마크 - 살별 메서드 호출 vs 규칙 표 한 번 평가 vs 살 테이블 조회 (캐시 제외)')
+    parser.add_argument('--count', type=int, default=20000, help='사주 개수')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (최솟값 사용)')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    args = parser.parse_args()
+
+    calculator = SalCalculator()
+    charts = [calculator.saju_calculator.calculate_saju(birth_date, birth_time)
+              for birth_date, birth_time in random_birth_datetimes(args.count, args.seed)]
+
+    def by_rules(saju):
+        codes = [calculator.JIAZI_CODE[saju[pillar]] for pillar in calculator.PILLAR_KEYS]
+        return calculator._render_sal_results(codes, calculator._evaluate_sal_masks(codes))
+
+    # 결과가 (키 순서까지) 같은지 먼저 확인 (_calculate_sal_from_saju는 살 테이블이 있으면 테이블 조회)
+    mismatches = sum(1 for saju in charts
+                     if list(calculator._calculate_sal_by_methods(saju).items())
+                     != list(by_rules(saju).items())
+                     or list(by_rules(saju).items())
+                     != list(calculator._calculate_sal_from_saju(saju).items()))
+
+    by_methods = measure(calculator._calculate_sal_by_methods, charts, args.repeat)
+    by_rule_table = measure(by_rules, charts, args.repeat)
+
+    print(f"사주 {len(charts)}개, 결과 불일치 {mismatches}개")
+    print(f"살별 메서드 호출: {by_methods:.1f}us/사주")
+    print(f"규칙 표 평가:     {by_rule_table:.1f}us/사주 ({by_methods / by_rule_table:.2f}배)")
+    if calculator.sal_table is not None:
+        by_sal_table = measure(calculator._calculate_sal_from_saju, charts, args.repeat)
+        print(f"살 테이블 조회:   {by_sal_table:.1f}us/사주 ({by_methods / by_sal_table:.2f}배)")
+    else:
+        print("살 테이블 없음 (python sal_table.py build)")
+
+    # 일괄 계산 - 위치 비트마스크 행렬만 (결과 딕셔너리 없음), 규칙 표 평가 결과와 비교
+    codes = np.array([[calculator.JIAZI_CODE[saju[pillar]] for pillar in calculator.PILLAR_KEYS] for saju in charts])
+    batch_mismatches = sum(1 for row, row_codes in zip(calculator.calculate_sal_batch(codes).tolist(), codes.tolist())
+                           if row != calculator._evaluate_sal_masks(row_codes))
+    best = float('inf')
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        calculator.calculate_sal_batch(codes)
+        best = min(best, time.perf_counter() - started)
+    by_batch = best / len(charts) * 1e6
+    print(f"일괄 계산(마스크): {by_batch:.2f}us/사주 ({by_methods / by_batch:.1f}배, 불일치 {batch_mismatches}개)")
@@ -1,12 +1,56 @@
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
+import numpy as np
 from saju_calculator import SajuCalculator
+from config import SAL_CACHE_SIZE, ANALYSIS_TEXT_CACHE_SIZE
+from memo_cache import MemoCache, FragmentCache
+from sal_table import load_sal_table, pack_sal_key
+from chart_results import SalResult
 
 class SalCalculator:
     """살(煞) 계산 클래스 - 사주팔자를 기반으로 각종 살을 계산 (fortune_analyzer.py 기준)"""
+
+    # 네 기둥 60갑자 인덱스 → 살 계산 결과 (SalResult - 위치 비트마스크만 저장). 인스턴스가 새로 만들어져도 공유됨
+    _sal_cache = MemoCache(SAL_CACHE_SIZE)
+
+    # 네 기둥 60갑자 인덱스 → 살 분석 텍스트의 길성·살·흉살 부분 (생년월일시 머리말 제외)
+    _sal_analysis_cache = FragmentCache(ANALYSIS_TEXT_CACHE_SIZE)
+
+    # 살 설명 (살 키 → 설명) - 모든 인스턴스가 공유
+    SAL_DESCRIPTIONS = {
+        'cheonul_gwiin': '옥황상제를 뜻하는 최고의 길신. 좋은 운이 열리고 출세하여 부귀공명을 이룸.',
+        'munchang_gwiin': '공부를 잘하며 특히 시험운이 좋음.',
+        'bokseong_gwiin': '인복과 먹을 복이 있어 식의 어려움이 없음.',
+        'woldeok_gwiin': '달의 덕을 입는다는 의미. 명예와 품성이 좋고 공직, 관직에 오르는 데 좋은 기운.',
+        'cheondeok_gwiin': '하늘의 덕을 입는다는 의미. 모든 종류의 재난으로부터 자신을 지켜주는 수호천사의 역할.',
+        'wolgong_gwiin': '하늘에 뜬 달을 의미하며, 타인에게 인기를 얻고 주목받는 기운.',
+        'geumyeo': '배우자운이 좋아 좋은 남편, 아내를 맞이함.',
+        'geonrok': '평생 굶어죽을 일 없고 의지가 굳으며 건강함. 관직이나 봉급 생활에 유리.',
+        'amrok': '남들이 모르는 록(재물, 도움)을 얻음. 위기 시 의외의 도움이 들어옴.',
+        'samgi': '외모가 좋고 포부가 큼.',
+        'cheonuiseong': '병에 대한 저항성이 강하며 의료계, 사회복지사 등 활인업에 좋음.',
+        'banan_sal': '공을 세우거나 높은 지위에 오를 운.',
+        'dohwa_sal': '색욕을 뜻하는 살. 이성이 끊이지 않으며 유혹에 약함. 긍정적으로는 연예인, 정치인 등 인기 직업에 유리.',
+        'yeokma_sal': '한 곳에 정착하지 못하고 떠돌게 되는 살. 현대에는 여행, 해외 활동, 갑작스러운 이직 등에 유리하게 작용.',
+        'hwagae_sal': '예술적, 예능적 재능이 있으나 인생에서 인복에 따라 길흉이 크게 달라짐.',
+        'gongmang_sal': '모든 노력이 헛되게 되는 살. 길흉의 작용이 무력화됨. 미련살이라고도 함.',
+        'yangin_sal': '강한 기운을 가진 신살. 수술, 교통사고, 사망 등 흉한 작용을 함. 의료계, 법조계 등 생사 관련 직업으로 기운을 상쇄할 수 있음.',
+        'baekho_sal': '호랑이에게 물려가는 재앙. 교통사고, 질병, 이별 등 부정적 의미를 가지나 특수 재능을 뜻하기도 함.',
+        'gwaegang_sal': '극도로 총명하나 폭력적, 파괴적인 힘을 가짐. 극귀(極貴) 또는 극빈(極貧)으로 나타남.',
+        'hyeonchim_sal': '신경이 예민하고 불면증을 겪기 쉬움. 현대에는 의료, 언론, IT 등 직업과 관련.',
+        'hongyeom_sal': '주색에 관한 살. 자신의 주도로 관계를 이끌어감.',
+        'geupgak_sal': '다리를 다치거나 골절상을 입는 사고. 물질적/정신적 기반이 파괴되는 것.',
+        'geop_sal': '남에게 무언가를 뺏기기 쉬움. 외부의 강력한 힘에 의해 결정되는 의미.',
+        'suok_sal': '감옥에 갇히거나 자유를 제한 당함.',
+        'mangsin_sal': '말 그대로 망신을 당함. 공개적인 망신, 재수 없는 일 등이 발생.',
+        'cheonra_jimang': '하늘과 땅에 그물이 쳐져 있어 꼼짝하지 못하는 상태. 과거에는 흉살이었으나, 현대에는 종교적 영성이나 내면의 강한 힘으로 재해석되기도 한다.',
+        'wonjin_sal': '서로 원망하고 화내는 살. 궁합이 좋지 않음.',
+        'gwimungwan_sal': '정신적 이상, 의처증, 의부증, 변태 기질이 생김. 때로는 비상한 두뇌를 뜻하기도 함.'
+    }
     
-    def __init__(self):
-        self.saju_calculator = SajuCalculator()
+    def __init__(self, saju_calculator: Optional[SajuCalculator] = None):
+        # 사주 계산기는 주입받아 공유할 수 있음 (FortuneAnalyzer와 같은 인스턴스 사용)
+        self.saju_calculator = saju_calculator or SajuCalculator()
         
         # 천간 (10개) - 한자
         self.CHEONGAN = ['甲', '乙', '丙', '丁', '戊', '己', '庚', '辛', '壬', '癸']
@@ -184,6 +228,119 @@ class SalCalculator:
             '천라': ['戌', '亥'], '지망': ['辰', '巳']
         }
 
+        # 기둥 이름 (연·월·일·시 순서 = 위치 비트마스크의 비트 0~3)
+        self.PILLAR_KEYS = ['year_pillar', 'month_pillar', 'day_pillar', 'hour_pillar']
+        self.PILLAR_NAMES = ['연주', '월주', '일주', '시주']
+
+        # 위치 비트마스크(0~15) → 기둥 인덱스 / 기둥 이름
+        self.MASK_INDEXES = [tuple(i for i in range(4) if (mask >> i) & 1) for mask in range(16)]
+        self.MASK_PILLAR_NAMES = [tuple(self.PILLAR_NAMES[i] for i in indexes) for indexes in self.MASK_INDEXES]
+
+        # 삼합 그룹
+        self.SAMHAP_GROUPS = {
+            '寅午戌': ['寅', '午', '戌'],
+            '申子辰': ['申', '子', '辰'],
+            '巳酉丑': ['巳', '酉', '丑'],
+            '亥卯未': ['亥', '卯', '未']
+        }
+
+        # 간지 → 60갑자 인덱스
+        self.JIAZI_CODE = self.saju_calculator.JIAZI_CODE
+
+        # 살 규칙 표: (살 키, has 키, 비교 방식, [(기준, 매핑)], 대상 결과 키, 위치에 지지 포함 여부)
+        #   비교 방식 - 'jiji'/'cheongan': 각 기둥의 지지/천간이 대상에 있는지, 'ilju': 일주가 목록에 있는지,
+        #              'samgi', 'chars', 'cheonra_jimang', 'pairs': 살마다 정해진 비교
+        #   기준 - 매핑을 조회할 글자: 'day_cheongan', 'year_cheongan', 'month_jiji', 'year_samhap',
+        #          'day_samhap', 'month_season', 'day_pillar', 'fixed'(매핑 자체가 대상)
+        #   기준이 여러 개이고 대상 결과 키가 하나면 대상들을 합침
+        self.SAL_RULES = [
+            # 길성들
+            ('cheonul_gwiin', 'has_cheonul', 'jiji', [('day_cheongan', self.CHEONUL_GWIIN)], ['target_jiji'], False),
+            ('munchang_gwiin', 'has_munchang', 'jiji', [('day_cheongan', self.MUNCHANG_GWIIN)], ['target_jiji'], False),
+            ('bokseong_gwiin', 'has_bokseong', 'jiji', [('day_cheongan', self.BOKSEONG_GWIIN)], ['target_jiji'], False),
+            ('woldeok_gwiin', 'has_woldeok', 'cheongan', [('month_jiji', self.WOLDEOK_GWIIN)], ['target_cheongan'], False),
+            ('cheondeok_gwiin', 'has_cheondeok', 'cheongan', [('month_jiji', self.CHEONDEOK_GWIIN)], ['target_cheongan'], False),
+            ('wolgong_gwiin', 'has_wolgong', 'cheongan', [('month_jiji', self.WOLGONG_GWIIN)], ['target_cheongan'], False),
+            ('geumyeo', 'has_geumyeo', 'jiji', [('year_cheongan', self.GEUMYEO)], ['target_jiji'], False),
+            ('geonrok', 'has_geonrok', 'jiji', [('day_cheongan', self.GEONROK)], ['target_jiji'], False),
+            ('amrok', 'has_amrok', 'jiji', [('day_cheongan', self.AMROK)], ['target_jiji'], False),
+            ('samgi', 'has_samgi', 'samgi', [('fixed', self.SAMGI)], [], False),
+            ('cheonuiseong', 'has_cheonuiseong', 'jiji', [('month_jiji', self.CHEONUISEONG)], ['target_jiji'], False),
+            ('banan_sal', 'has_banan', 'jiji', [('year_samhap', self.BANAN_SAL)], ['target_jiji'], False),
+            # 주요 살들
+            ('dohwa_sal', 'has_dohwa', 'jiji', [('year_samhap', self.DOHWA_SAL), ('day_samhap', self.DOHWA_SAL)], ['target_jiji'], False),
+            ('yeokma_sal', 'has_yeokma', 'jiji', [('year_samhap', self.YEOKMA_SAL), ('day_samhap', self.YEOKMA_SAL)], ['target_jiji'], False),
+            ('hwagae_sal', 'has_hwagae', 'jiji', [('year_samhap', self.HWAGAE_SAL), ('day_samhap', self.HWAGAE_SAL)], ['target_jiji'], False),
+            ('gongmang_sal', 'has_gongmang', 'jiji', [('day_pillar', self.GONGMANG_SAL)], ['gongmang_jiji'], True),
+            # 흉살들
+            ('yangin_sal', 'has_yangin', 'jiji', [('day_cheongan', self.YANGIN_SAL)], ['target_jiji'], False),
+            ('baekho_sal', 'has_baekho', 'ilju', [('day_pillar', self.BAEKHO_SAL_ILJU)], [], False),
+            ('gwaegang_sal', 'has_gwaegang', 'ilju', [('day_pillar', self.GWAEGANG_SAL_ILJU)], [], False),
+            ('hyeonchim_sal', 'has_hyeonchim', 'chars', [('fixed', self.HYEONCHIM_SAL_CHARS)], [], False),
+            ('hongyeom_sal', 'has_hongyeom', 'jiji', [('day_cheongan', self.HONGYEOM_SAL)], ['target_jiji'], False),
+            ('geupgak_sal', 'has_geupgak', 'jiji', [('day_cheongan', self.GEUPGAK_SAL_ILGAN), ('month_season', self.GEUPGAK_SAL_WOLJI)],
+             ['target_jiji_ilgan', 'target_jiji_wolji'], False),
+            ('geop_sal', 'has_geop', 'jiji', [('day_samhap', self.GEOP_SAL)], ['target_jiji'], False),
+            ('suok_sal', 'has_suok', 'jiji', [('fixed', self.SUOK_SAL_JIJI)], ['target_jiji'], True),
+            ('mangsin_sal', 'has_mangsin', 'jiji', [('year_samhap', self.MANGSIN_SAL), ('day_samhap', self.MANGSIN_SAL)], ['target_jiji'], False),
+            ('cheonra_jimang', 'has_cheonra_jimang', 'cheonra_jimang', [('fixed', self.CHEONRA_JIMANG)], [], False),
+            ('wonjin_sal', 'has_wonjin', 'pairs', [('fixed', self.WONJIN_SAL)], [], False),
+            ('gwimungwan_sal', 'has_gwimungwan', 'pairs', [('fixed', self.GWIMUNGWAN_SAL)], [], False)
+        ]
+        self.SAL_KEYS = [rule[0] for rule in self.SAL_RULES]
+        self.SAL_INDEX = {key: i for i, key in enumerate(self.SAL_KEYS)}
+
+        # 살 분석 텍스트 머리말 (사주·생년월일시만 채움, 나머지는 사주 키별로 캐시)
+        self.SAL_ANALYSIS_HEADER = """
+=== 살(煞) 분석 결과 ===
+
+[기본 사주]
+연주: {year_pillar} (年柱)
+월주: {month_pillar} (月柱)  
+일주: {day_pillar} (日柱)
+시주: {hour_pillar} (時柱)
+
+생년월일: {birth_date}
+생시: {birth_time}
+
+[길성(吉星) 분석]
+"""
+
+        # 살 분석 텍스트에 나오는 살 (살 키, 이름, 이모지)
+        self.GIL_SEONG_LIST = [
+            ('cheonul_gwiin', '천을귀인', '🌟'),
+            ('munchang_gwiin', '문창귀인', '📚'),
+            ('bokseong_gwiin', '복성귀인', '🍀'),
+            ('woldeok_gwiin', '월덕귀인', '🌙'),
+            ('cheondeok_gwiin', '천덕귀인', '☀️'),
+            ('wolgong_gwiin', '월공귀인', '🌕'),
+            ('geumyeo', '금여', '💍'),
+            ('geonrok', '건록', '🏛️'),
+            ('amrok', '암록', '🎁'),
+            ('cheonuiseong', '천의성', '⚕️'),
+            ('banan_sal', '반안살', '🏆')
+        ]
+        self.MAIN_SAL_LIST = [
+            ('dohwa_sal', '도화살', '🌸'),
+            ('yeokma_sal', '역마살', '🔄'),
+            ('hwagae_sal', '화개살', '🎨')
+        ]
+        self.HYUNG_SAL_LIST = [
+            ('yangin_sal', '양인살', '⚔️'),
+            ('baekho_sal', '백호살', '🐅'),
+            ('gwaegang_sal', '괴강살', '⚡'),
+            ('hongyeom_sal', '홍염살', '💋'),
+            ('geupgak_sal', '급각살', '🦵'),
+            ('geop_sal', '겁살', '💸'),
+            ('mangsin_sal', '망신살', '😳')
+        ]
+
+        # 규칙 표를 정수 코드 조회표로 컴파일
+        self._compiled_sal_rules = self._compile_sal_rules()
+
+        # 미리 계산한 살 테이블 (사주 키 → 살별 위치 비트마스크, 없으면 None → 규칙 표로 계산)
+        self.sal_table = load_sal_table(len(self.SAL_KEYS))
+
     def calculate_sal(self, birth_date: str, birth_time: str) -> Dict[str, any]:
         """
         생년월일시를 입력받아 각종 살(煞)을 계산합니다.
@@ -198,65 +355,374 @@ class SalCalculator:
         try:
             # 사주팔자 먼저 계산
             saju = self.saju_calculator.calculate_saju(birth_date, birth_time)
-            if not saju:
-                return {}
-            
-            # 각종 살 계산
-            sal_results = {
-                'saju': saju,
-                # 길성들
-                'cheonul_gwiin': self._calculate_cheonul_gwiin(saju),
-                'munchang_gwiin': self._calculate_munchang_gwiin(saju),
-                'bokseong_gwiin': self._calculate_bokseong_gwiin(saju),
-                'woldeok_gwiin': self._calculate_woldeok_gwiin(saju),
-                'cheondeok_gwiin': self._calculate_cheondeok_gwiin(saju),
-                'wolgong_gwiin': self._calculate_wolgong_gwiin(saju),
-                'geumyeo': self._calculate_geumyeo(saju),
-                'geonrok': self._calculate_geonrok(saju),
-                'amrok': self._calculate_amrok(saju),
-                'samgi': self._calculate_samgi(saju),
-                'cheonuiseong': self._calculate_cheonuiseong(saju),
-                'banan_sal': self._calculate_banan_sal(saju),
-                # 주요 살들
-                'dohwa_sal': self._calculate_dohwa_sal(saju),
-                'yeokma_sal': self._calculate_yeokma_sal(saju),
-                'hwagae_sal': self._calculate_hwagae_sal(saju),
-                'gongmang_sal': self._calculate_gongmang_sal(saju),
-                # 흉살들
-                'yangin_sal': self._calculate_yangin_sal(saju),
-                'baekho_sal': self._calculate_baekho_sal(saju),
-                'gwaegang_sal': self._calculate_gwaegang_sal(saju),
-                'hyeonchim_sal': self._calculate_hyeonchim_sal(saju),
-                'hongyeom_sal': self._calculate_hongyeom_sal(saju),
-                'geupgak_sal': self._calculate_geupgak_sal(saju),
-                'geop_sal': self._calculate_geop_sal(saju),
-                'suok_sal': self._calculate_suok_sal(saju),
-                'mangsin_sal': self._calculate_mangsin_sal(saju),
-                'cheonra_jimang': self._calculate_cheonra_jimang(saju),
-                'wonjin_sal': self._calculate_wonjin_sal(saju),
-                'gwimungwan_sal': self._calculate_gwimungwan_sal(saju)
-            }
+            return self.calculate_sal_for_saju(saju)
             
-            return sal_results
+        except Exception as e:
+            print(f"살 계산 오류: {e}")
+            return {}
+
+    def calculate_sal_for_saju(self, saju: Dict[str, str]) -> Dict[str, any]:
+        """
+        이미 계산된 사주팔자(calculate_saju 결과)로 각종 살을 계산합니다.
+        사주를 다시 계산하지 않으므로 사주를 먼저 계산한 쪽(FortuneAnalyzer 등)에서 사용합니다.
+        """
+        try:
+            sal_result = self.calculate_sal_result(saju)
+            if sal_result is None:
+                return {}
+            return {'saju': saju, **sal_result.to_dict()}
             
         except Exception as e:
             print(f"살 계산 오류: {e}")
             return {}
 
+    def calculate_sal_result(self, saju: Dict[str, str]) -> Optional[SalResult]:
+        """
+        사주팔자로 살을 계산해 SalResult(네 기둥 인덱스 + 살별 위치 비트마스크)로 반환합니다.
+        설명 문자열 등은 결과를 읽을 때 만들어지므로 캐시·일괄 처리에 씁니다. 사주가 없거나 기둥이 없거나 잘못되면 None.
+        """
+        if not saju:
+            return None
+        
+        # 살은 네 기둥만으로 정해지므로 (날짜가 달라도) 네 기둥이 같으면 캐시된 결과 사용
+        codes = [self.JIAZI_CODE.get(saju.get(pillar)) for pillar in self.PILLAR_KEYS]
+        if None in codes:
+            return None
+        return self._sal_cache.get_or_compute(
+            tuple(codes),
+            lambda: SalResult(codes, self._get_sal_masks(codes), self)
+        )
+
+    def _calculate_sal_from_saju(self, saju: Dict[str, str]) -> Dict[str, any]:
+        """사주팔자 딕셔너리로 각종 살 계산 ('saju' 키 제외) - 살 테이블 조회 또는 규칙 표 평가 (기둥이 없거나 잘못되면 {})"""
+        codes = [self.JIAZI_CODE.get(saju.get(pillar)) for pillar in self.PILLAR_KEYS]
+        if None in codes:
+            return {}
+        return self._render_sal_results(codes, self._get_sal_masks(codes))
+
+    def _get_sal_masks(self, codes: List[int]) -> List[int]:
+        """살별 위치 비트마스크 - 살 테이블에 있는 조합이면 행 조회, 아니면 규칙 표 평가"""
+        if self.sal_table is not None:
+            row = pack_sal_key(*codes)
+            if row >= 0:
+                return self.sal_table[row].tolist()
+        return self._evaluate_sal_masks(codes)
+
+    def _calculate_sal_by_methods(self, saju: Dict[str, str]) -> Dict[str, any]:
+        """살마다 _calculate_* 메서드를 호출하는 기준 구현 (규칙 표 검증·벤치마크용)"""
+        return {key: getattr(self, f'_calculate_{key}')(saju) for key in self.SAL_KEYS}
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, any]:
+        """살 계산 캐시 적중/미스 통계"""
+        return cls._sal_cache.stats()
+
     def _get_samhap_group(self, jiji: str) -> str:
         """지지가 속한 삼합 그룹 반환"""
-        samhap_groups = {
-            '寅午戌': ['寅', '午', '戌'],
-            '申子辰': ['申', '子', '辰'],
-            '巳酉丑': ['巳', '酉', '丑'],
-            '亥卯未': ['亥', '卯', '未']
-        }
-        
-        for group, jiji_list in samhap_groups.items():
+        for group, jiji_list in self.SAMHAP_GROUPS.items():
             if jiji in jiji_list:
                 return group
         return ''
 
+    def _compile_sal_rules(self) -> List[tuple]:
+        """
+        SAL_RULES를 정수 코드로 조회하는 표로 바꿉니다.
+        규칙마다 (살 키, 비교 방식, [(기준 슬롯, 기준 값 → 대상 원본, 기준 값 → 대상 비트마스크)],
+        전용 조회표, 결과 딕셔너리 생성 함수). 기준 슬롯 순서는 _get_sal_source_slots와 같습니다.
+        """
+        jiazi = self.saju_calculator.JIAZI_CYCLE
+        source_chars = {
+            'day_cheongan': self.CHEONGAN,
+            'year_cheongan': self.CHEONGAN,
+            'month_jiji': self.JIJI,
+            'year_samhap': [self._get_samhap_group(jiji) for jiji in self.JIJI],
+            'day_samhap': [self._get_samhap_group(jiji) for jiji in self.JIJI],
+            'month_season': self.JIJI,
+            'day_pillar': jiazi,
+            'fixed': [None]
+        }
+        slot_index = {source: i for i, source in enumerate(source_chars)}
+
+        def to_mask(value, alphabet: List[str]) -> int:
+            chars = value if isinstance(value, list) else [value]
+            return sum(1 << alphabet.index(char) for char in set(chars) if char in alphabet)
+
+        def char_mask(chars: List[str], alphabet: List[str]) -> int:
+            return to_mask([char for char in chars if char in alphabet], alphabet)
+
+        compiled = []
+        for key, has_key, match, sources, target_keys, with_jiji in self.SAL_RULES:
+            alphabet = self.CHEONGAN if match == 'cheongan' else self.JIJI
+            compiled_sources = []
+            for source, mapping in sources:
+                if source == 'fixed':
+                    values = [mapping]
+                elif source == 'month_season':
+                    values = [next((targets for season, targets in mapping.items() if jiji in season), [])
+                              for jiji in source_chars[source]]
+                elif match == 'ilju':
+                    values = [pillar in mapping for pillar in source_chars[source]]
+                else:
+                    default = [] if isinstance(next(iter(mapping.values())), list) else None
+                    values = [mapping.get(key, default) for key in source_chars[source]]
+                target_masks = [to_mask(value, alphabet) for value in values] if match in ('jiji', 'cheongan') else []
+                compiled_sources.append((slot_index[source], values, target_masks))
+
+            extra = None
+            mapping = sources[0][1]
+            if match == 'samgi':
+                # 세 천간이 패턴 순서나 역순으로 이어진 경우
+                extra = {tuple(self.CHEONGAN.index(char) for char in sequence)
+                         for pattern in mapping.values() for sequence in (pattern, pattern[::-1])}
+            elif match == 'chars':
+                extra = (char_mask(mapping, self.CHEONGAN), char_mask(mapping, self.JIJI))
+            elif match == 'cheonra_jimang':
+                extra = [to_mask(group, self.JIJI) for group in mapping.values()]
+            elif match == 'pairs':
+                extra = [self.JIJI.index(mapping[jiji]) if jiji in mapping else -1 for jiji in self.JIJI]
+            renderer = self._make_sal_renderer(key, has_key, match, compiled_sources, target_keys, with_jiji)
+            compiled.append((key, match, compiled_sources, extra, renderer))
+        return compiled
+
+    def _get_sal_source_slots(self, codes: List[int]) -> tuple:
+        """정수 코드 사주 → 규칙 기준 슬롯 값 (일간, 연간, 월지, 연지, 일지, 월지, 일주, 0)"""
+        year, month, day, hour = codes
+        return (day % 10, year % 10, month % 12, year % 12, day % 12, month % 12, day, 0)
+
+    def _evaluate_sal_masks(self, codes: List[int]) -> List[int]:
+        """
+        네 기둥 60갑자 인덱스(연·월·일·시)에 살 규칙 표를 한 번에 적용합니다.
+
+        Returns:
+            SAL_KEYS 순서의 살별 위치 비트마스크 (비트 0~3 = 연주·월주·일주·시주)
+        """
+        stems = [code % 10 for code in codes]
+        branches = [code % 12 for code in codes]
+        slots = self._get_sal_source_slots(codes)
+        branch_set = (1 << branches[0]) | (1 << branches[1]) | (1 << branches[2]) | (1 << branches[3])
+
+        def position_mask(target: int, values: List[int]) -> int:
+            return (((target >> values[0]) & 1) | ((target >> values[1]) & 1) << 1
+                    | ((target >> values[2]) & 1) << 2 | ((target >> values[3]) & 1) << 3)
+
+        masks = []
+        for _, match, sources, extra, _ in self._compiled_sal_rules:
+            if match == 'jiji' or match == 'cheongan':
+                target = 0
+                for slot, _, target_masks in sources:
+                    target |= target_masks[slots[slot]]
+                masks.append(position_mask(target, branches if match == 'jiji' else stems))
+            elif match == 'ilju':
+                slot, values, _ = sources[0]
+                masks.append(0b0100 if values[slots[slot]] else 0)
+            elif match == 'samgi':
+                mask = 0
+                if (stems[0], stems[1], stems[2]) in extra:
+                    mask |= 0b0111
+                if (stems[1], stems[2], stems[3]) in extra:
+                    mask |= 0b1110
+                masks.append(mask)
+            elif match == 'chars':
+                masks.append(position_mask(extra[0], stems) | position_mask(extra[1], branches))
+            elif match == 'cheonra_jimang':
+                target = 0
+                for group_mask in extra:
+                    if branch_set & group_mask == group_mask:
+                        target |= group_mask
+                masks.append(position_mask(target, branches))
+            else:  # pairs
+                masks.append(sum(1 << i for i, branch in enumerate(branches)
+                                 if extra[branch] >= 0 and (branch_set >> extra[branch]) & 1))
+        return masks
+
+    def calculate_sal_batch(self, codes) -> np.ndarray:
+        """
+        여러 사주의 살을 한 번에(벡터화) 계산합니다 - 사주마다 반복하지 않고 규칙 28개를 배열 연산으로 평가.
+        전체 사용자 살 분포·상관관계 같은 통계용이며, 설명 등 결과 딕셔너리는 만들지 않습니다.
+
+        Args:
+            codes: 네 기둥 60갑자 인덱스 (N x 4, 연·월·일·시 - calculate_saju_batch 결과를 쌓은 것).
+                   -1이 있는 행(계산할 수 없는 사주)은 모두 0으로 채워집니다.
+
+        Returns:
+            N x 28 uint8 배열 - 열은 SAL_KEYS 순서의 살별 위치 비트마스크 (비트 0~3 = 연주·월주·일주·시주).
+            살이 있는지는 (masks != 0), 단 현침살은 글자 2개 이상일 때만 있음 (has_hyeonchim)
+        """
+        codes = np.asarray(codes, dtype=np.int64).reshape(-1, 4)
+        valid = (codes >= 0).all(axis=1)
+        codes = np.where(valid[:, None], codes, 0)
+        stems, branches = codes % 10, codes % 12
+        slots = np.stack(np.broadcast_arrays(*self._get_sal_source_slots(codes.T)), axis=1)
+        branch_set = np.bitwise_or.reduce(1 << branches, axis=1)
+        weights = 1 << np.arange(4)
+
+        def position_mask(target, values):
+            # 각 기둥 값이 대상 비트마스크에 있으면 그 기둥 비트를 켬
+            return (((target[:, None] >> values) & 1) * weights).sum(axis=1)
+
+        masks = np.zeros((len(codes), len(self._compiled_sal_rules)), dtype=np.uint8)
+        for column, (_, match, sources, extra, _) in enumerate(self._compiled_sal_rules):
+            if match == 'jiji' or match == 'cheongan':
+                target = np.zeros(len(codes), dtype=np.int64)
+                for slot, _, target_masks in sources:
+                    target |= np.asarray(target_masks, dtype=np.int64)[slots[:, slot]]
+                masks[:, column] = position_mask(target, branches if match == 'jiji' else stems)
+            elif match == 'ilju':
+                slot, values, _ = sources[0]
+                masks[:, column] = np.where(np.asarray(values, dtype=bool)[slots[:, slot]], 0b0100, 0)
+            elif match == 'samgi':
+                patterns = np.zeros((10, 10, 10), dtype=bool)
+                patterns[tuple(np.array(sorted(extra)).T)] = True
+                masks[:, column] = (np.where(patterns[stems[:, 0], stems[:, 1], stems[:, 2]], 0b0111, 0)
+                                    | np.where(patterns[stems[:, 1], stems[:, 2], stems[:, 3]], 0b1110, 0))
+            elif match == 'chars':
+                stem_target = np.full(len(codes), extra[0], dtype=np.int64)
+                branch_target = np.full(len(codes), extra[1], dtype=np.int64)
+                masks[:, column] = position_mask(stem_target, stems) | position_mask(branch_target, branches)
+            elif match == 'cheonra_jimang':
+                target = np.zeros(len(codes), dtype=np.int64)
+                for group_mask in extra:
+                    target |= np.where(branch_set & group_mask == group_mask, group_mask, 0)
+                masks[:, column] = position_mask(target, branches)
+            else:  # pairs
+                partners = np.asarray(extra, dtype=np.int64)[branches]
+                hit = (partners >= 0) & ((branch_set[:, None] >> np.maximum(partners, 0)) & 1).astype(bool)
+                masks[:, column] = (hit * weights).sum(axis=1)
+
+        masks[~valid] = 0
+        return masks
+
+    def has_sal_batch(self, codes, masks: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        여러 사주의 살 보유 여부 (N x 28 bool, SAL_KEYS 순서) - 결과 딕셔너리의 has_* 값과 같음.
+        대부분 위치 비트마스크가 0이 아니면 있음이지만, 현침살('chars')은 글자가 2개 이상이어야 있음.
+        masks를 주면 (calculate_sal_batch 결과) 다시 계산하지 않습니다.
+        """
+        codes = np.asarray(codes, dtype=np.int64).reshape(-1, 4)
+        if masks is None:
+            masks = self.calculate_sal_batch(codes)
+        has = masks != 0
+
+        valid = (codes >= 0).all(axis=1)
+        stems, branches = codes % 10, codes % 12
+        for column, (_, match, _, extra, _) in enumerate(self._compiled_sal_rules):
+            if match == 'chars':
+                char_counts = (((extra[0] >> stems) & 1) + ((extra[1] >> branches) & 1)).sum(axis=1)
+                has[:, column] = valid & (char_counts >= 2)
+        return has
+
+    def _make_sal_renderer(self, key: str, has_key: str, match: str, sources: List[tuple],
+                           target_keys: List[str], with_jiji: bool):
+        """규칙 하나의 (위치 비트마스크, 기준 슬롯 값, 네 기둥 간지) → 결과 딕셔너리 함수 (_calculate_* 메서드와 같은 형태)"""
+        description = self.SAL_DESCRIPTIONS[key]
+        mask_indexes = self.MASK_INDEXES
+        mask_pillar_names = self.MASK_PILLAR_NAMES
+        pillar_names = self.PILLAR_NAMES
+
+        if match == 'jiji' or match == 'cheongan':
+            if len(sources) == len(target_keys) == 1:
+                (slot, values, _), = sources
+                target_key = target_keys[0]
+                if with_jiji:
+                    return lambda mask, slots, pillars: {
+                        target_key: values[slots[slot]],
+                        'positions': [{'pillar': pillar_names[i], 'jiji': pillars[i][1]} for i in mask_indexes[mask]],
+                        has_key: mask != 0,
+                        'description': description
+                    }
+                return lambda mask, slots, pillars: {
+                    target_key: values[slots[slot]],
+                    'positions': list(mask_pillar_names[mask]),
+                    has_key: mask != 0,
+                    'description': description
+                }
+
+            def render_targets(mask, slots, pillars):
+                targets = [values[slots[slot]] for slot, values, _ in sources]
+                if len(targets) == len(target_keys):
+                    result = dict(zip(target_keys, targets))
+                else:
+                    # 기준이 여러 개인 규칙은 대상을 합침 (중복 제거)
+                    result = {target_keys[0]: list(set([target for target in targets if target is not None]))}
+                result['positions'] = list(mask_pillar_names[mask])
+                result[has_key] = mask != 0
+                result['description'] = description
+                return result
+            return render_targets
+
+        if match == 'ilju':
+            return lambda mask, slots, pillars: {
+                'day_pillar': pillars[2],
+                has_key: mask != 0,
+                'description': description
+            }
+
+        if match == 'samgi':
+            def render_samgi(mask, slots, pillars):
+                found_samgi = []
+                if mask:
+                    cheongan_list = [pillar[0] for pillar in pillars]
+                    for samgi_type, pattern in self.SAMGI.items():
+                        for i in range(len(cheongan_list) - 2):
+                            if cheongan_list[i:i+3] == pattern or cheongan_list[i:i+3] == pattern[::-1]:
+                                found_samgi.append({
+                                    'type': samgi_type,
+                                    'pattern': cheongan_list[i:i+3],
+                                    'positions': f'{i+1}-{i+2}-{i+3}번째 기둥'
+                                })
+                return {'found_samgi': found_samgi, has_key: len(found_samgi) > 0, 'description': description}
+            return render_samgi
+
+        if match == 'chars':
+            chars = sources[0][1][0]
+
+            def render_chars(mask, slots, pillars):
+                found_chars = []
+                for i in mask_indexes[mask]:
+                    cheongan, jiji = pillars[i][0], pillars[i][1]
+                    if cheongan in chars:
+                        found_chars.append({'char': cheongan, 'pillar': pillar_names[i], 'type': '천간'})
+                    if jiji in chars:
+                        found_chars.append({'char': jiji, 'pillar': pillar_names[i], 'type': '지지'})
+                return {'found_chars': found_chars, has_key: len(found_chars) >= 2, 'description': description}
+            return render_chars
+
+        if match == 'cheonra_jimang':
+            groups = sources[0][1][0]
+
+            def render_cheonra_jimang(mask, slots, pillars):
+                hit_jiji = [pillars[i][1] for i in mask_indexes[mask]]
+                return {
+                    'has_cheonra': any(jiji in groups['천라'] for jiji in hit_jiji),
+                    'has_jimang': any(jiji in groups['지망'] for jiji in hit_jiji),
+                    has_key: mask != 0,
+                    'description': description
+                }
+            return render_cheonra_jimang
+
+        # pairs
+        pairs = sources[0][1][0]
+
+        def render_pairs(mask, slots, pillars):
+            found_pairs = [f'{pillars[i][1]}-{pairs[pillars[i][1]]}' for i in mask_indexes[mask]]
+            return {'found_pairs': list(set(found_pairs)), has_key: len(found_pairs) > 0, 'description': description}
+        return render_pairs
+
+    def _render_sal_rule(self, key: str, codes: tuple, masks: bytes) -> Dict[str, any]:
+        """살 하나의 위치 비트마스크 → 결과 딕셔너리 (없는 살 키면 KeyError)"""
+        index = self.SAL_INDEX[key]
+        jiazi = self.saju_calculator.JIAZI_CYCLE
+        renderer = self._compiled_sal_rules[index][4]
+        return renderer(masks[index], self._get_sal_source_slots(codes), [jiazi[code] for code in codes])
+
+    def _render_sal_results(self, codes: List[int], masks: List[int]) -> Dict[str, any]:
+        """살별 위치 비트마스크 → _calculate_* 메서드와 같은 형태의 결과 딕셔너리"""
+        jiazi = self.saju_calculator.JIAZI_CYCLE
+        pillars = [jiazi[code] for code in codes]
+        slots = self._get_sal_source_slots(codes)
+        return {key: renderer(mask, slots, pillars)
+                for (key, _, _, _, renderer), mask in zip(self._compiled_sal_rules, masks)}
+
     def _calculate_cheonul_gwiin(self, saju: Dict[str, str]) -> Dict[str, any]:
         """천을귀인 계산"""
         day_cheongan = saju.get('day_pillar', '')[0] if saju.get('day_pillar') else ''
@@ -275,7 +741,7 @@ class SalCalculator:
             'target_jiji': target_jiji,
             'positions': positions,
             'has_cheonul': len(positions) > 0,
-            'description': '옥황상제를 뜻하는 최고의 길신. 좋은 운이 열리고 출세하여 부귀공명을 이룸.'
+            'description': self.SAL_DESCRIPTIONS['cheonul_gwiin']
         }
 
     def _calculate_munchang_gwiin(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -296,7 +762,7 @@ class SalCalculator:
             'target_jiji': target_jiji,
             'positions': positions,
             'has_munchang': len(positions) > 0,
-            'description': '공부를 잘하며 특히 시험운이 좋음.'
+            'description': self.SAL_DESCRIPTIONS['munchang_gwiin']
         }
 
     def _calculate_bokseong_gwiin(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -317,7 +783,7 @@ class SalCalculator:
             'target_jiji': target_jiji,
             'positions': positions,
             'has_bokseong': len(positions) > 0,
-            'description': '인복과 먹을 복이 있어 식의 어려움이 없음.'
+            'description': self.SAL_DESCRIPTIONS['bokseong_gwiin']
         }
 
     def _calculate_woldeok_gwiin(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -338,7 +804,7 @@ class SalCalculator:
             'target_cheongan': target_cheongan,
             'positions': positions,
             'has_woldeok': len(positions) > 0,
-            'description': '달의 덕을 입는다는 의미. 명예와 품성이 좋고 공직, 관직에 오르는 데 좋은 기운.'
+            'description': self.SAL_DESCRIPTIONS['woldeok_gwiin']
         }
 
     def _calculate_cheondeok_gwiin(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -359,7 +825,7 @@ class SalCalculator:
             'target_cheongan': target_cheongan,
             'positions': positions,
             'has_cheondeok': len(positions) > 0,
-            'description': '하늘의 덕을 입는다는 의미. 모든 종류의 재난으로부터 자신을 지켜주는 수호천사의 역할.'
+            'description': self.SAL_DESCRIPTIONS['cheondeok_gwiin']
         }
 
     def _calculate_wolgong_gwiin(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -380,7 +846,7 @@ class SalCalculator:
             'target_cheongan': target_cheongan,
             'positions': positions,
             'has_wolgong': len(positions) > 0,
-            'description': '하늘에 뜬 달을 의미하며, 타인에게 인기를 얻고 주목받는 기운.'
+            'description': self.SAL_DESCRIPTIONS['wolgong_gwiin']
         }
 
     def _calculate_geumyeo(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -401,7 +867,7 @@ class SalCalculator:
             'target_jiji': target_jiji,
             'positions': positions,
             'has_geumyeo': len(positions) > 0,
-            'description': '배우자운이 좋아 좋은 남편, 아내를 맞이함.'
+            'description': self.SAL_DESCRIPTIONS['geumyeo']
         }
 
     def _calculate_geonrok(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -422,7 +888,7 @@ class SalCalculator:
             'target_jiji': target_jiji,
             'positions': positions,
             'has_geonrok': len(positions) > 0,
-            'description': '평생 굶어죽을 일 없고 의지가 굳으며 건강함. 관직이나 봉급 생활에 유리.'
+            'description': self.SAL_DESCRIPTIONS['geonrok']
         }
 
     def _calculate_amrok(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -443,7 +909,7 @@ class SalCalculator:
             'target_jiji': target_jiji,
             'positions': positions,
             'has_amrok': len(positions) > 0,
-            'description': '남들이 모르는 록(재물, 도움)을 얻음. 위기 시 의외의 도움이 들어옴.'
+            'description': self.SAL_DESCRIPTIONS['amrok']
         }
 
     def _calculate_samgi(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -473,7 +939,7 @@ class SalCalculator:
         return {
             'found_samgi': found_samgi,
             'has_samgi': len(found_samgi) > 0,
-            'description': '외모가 좋고 포부가 큼.'
+            'description': self.SAL_DESCRIPTIONS['samgi']
         }
 
     def _calculate_cheonuiseong(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -494,7 +960,7 @@ class SalCalculator:
             'target_jiji': target_jiji,
             'positions': positions,
             'has_cheonuiseong': len(positions) > 0,
-            'description': '병에 대한 저항성이 강하며 의료계, 사회복지사 등 활인업에 좋음.'
+            'description': self.SAL_DESCRIPTIONS['cheonuiseong']
         }
 
     def _calculate_banan_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -516,7 +982,7 @@ class SalCalculator:
             'target_jiji': target_jiji,
             'positions': positions,
             'has_banan': len(positions) > 0,
-            'description': '공을 세우거나 높은 지위에 오를 운.'
+            'description': self.SAL_DESCRIPTIONS['banan_sal']
         }
 
     def _calculate_dohwa_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -545,7 +1011,7 @@ class SalCalculator:
             'target_jiji': list(set(target_jiji_list)),
             'positions': positions,
             'has_dohwa': len(positions) > 0,
-            'description': '색욕을 뜻하는 살. 이성이 끊이지 않으며 유혹에 약함. 긍정적으로는 연예인, 정치인 등 인기 직업에 유리.'
+            'description': self.SAL_DESCRIPTIONS['dohwa_sal']
         }
 
     def _calculate_yeokma_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -574,7 +1040,7 @@ class SalCalculator:
             'target_jiji': list(set(target_jiji_list)),
             'positions': positions,
             'has_yeokma': len(positions) > 0,
-            'description': '한 곳에 정착하지 못하고 떠돌게 되는 살. 현대에는 여행, 해외 활동, 갑작스러운 이직 등에 유리하게 작용.'
+            'description': self.SAL_DESCRIPTIONS['yeokma_sal']
         }
 
     def _calculate_hwagae_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -603,7 +1069,7 @@ class SalCalculator:
             'target_jiji': list(set(target_jiji_list)),
             'positions': positions,
             'has_hwagae': len(positions) > 0,
-            'description': '예술적, 예능적 재능이 있으나 인생에서 인복에 따라 길흉이 크게 달라짐.'
+            'description': self.SAL_DESCRIPTIONS['hwagae_sal']
         }
 
     def _calculate_gongmang_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -627,7 +1093,7 @@ class SalCalculator:
             'gongmang_jiji': gongmang_jiji,
             'positions': positions,
             'has_gongmang': len(positions) > 0,
-            'description': '모든 노력이 헛되게 되는 살. 길흉의 작용이 무력화됨. 미련살이라고도 함.'
+            'description': self.SAL_DESCRIPTIONS['gongmang_sal']
         }
 
     def _calculate_yangin_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -648,7 +1114,7 @@ class SalCalculator:
             'target_jiji': target_jiji,
             'positions': positions,
             'has_yangin': len(positions) > 0,
-            'description': '강한 기운을 가진 신살. 수술, 교통사고, 사망 등 흉한 작용을 함. 의료계, 법조계 등 생사 관련 직업으로 기운을 상쇄할 수 있음.'
+            'description': self.SAL_DESCRIPTIONS['yangin_sal']
         }
 
     def _calculate_baekho_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -659,7 +1125,7 @@ class SalCalculator:
         return {
             'day_pillar': day_pillar,
             'has_baekho': has_baekho,
-            'description': '호랑이에게 물려가는 재앙. 교통사고, 질병, 이별 등 부정적 의미를 가지나 특수 재능을 뜻하기도 함.'
+            'description': self.SAL_DESCRIPTIONS['baekho_sal']
         }
 
     def _calculate_gwaegang_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -670,7 +1136,7 @@ class SalCalculator:
         return {
             'day_pillar': day_pillar,
             'has_gwaegang': has_gwaegang,
-            'description': '극도로 총명하나 폭력적, 파괴적인 힘을 가짐. 극귀(極貴) 또는 극빈(極貧)으로 나타남.'
+            'description': self.SAL_DESCRIPTIONS['gwaegang_sal']
         }
 
     def _calculate_hyeonchim_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -694,7 +1160,7 @@ class SalCalculator:
         return {
             'found_chars': found_chars,
             'has_hyeonchim': has_hyeonchim,
-            'description': '신경이 예민하고 불면증을 겪기 쉬움. 현대에는 의료, 언론, IT 등 직업과 관련.'
+            'description': self.SAL_DESCRIPTIONS['hyeonchim_sal']
         }
 
     def _calculate_hongyeom_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -715,7 +1181,7 @@ class SalCalculator:
             'target_jiji': target_jiji,
             'positions': positions,
             'has_hongyeom': len(positions) > 0,
-            'description': '주색에 관한 살. 자신의 주도로 관계를 이끌어감.'
+            'description': self.SAL_DESCRIPTIONS['hongyeom_sal']
         }
 
     def _calculate_geupgak_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -749,7 +1215,7 @@ class SalCalculator:
             'target_jiji_wolji': target_jiji_wolji,
             'positions': positions,
             'has_geupgak': len(positions) > 0,
-            'description': '다리를 다치거나 골절상을 입는 사고. 물질적/정신적 기반이 파괴되는 것.'
+            'description': self.SAL_DESCRIPTIONS['geupgak_sal']
         }
 
     def _calculate_geop_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -771,7 +1237,7 @@ class SalCalculator:
             'target_jiji': target_jiji,
             'positions': positions,
             'has_geop': len(positions) > 0,
-            'description': '남에게 무언가를 뺏기기 쉬움. 외부의 강력한 힘에 의해 결정되는 의미.'
+            'description': self.SAL_DESCRIPTIONS['geop_sal']
         }
 
     def _calculate_suok_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -792,7 +1258,7 @@ class SalCalculator:
             'target_jiji': self.SUOK_SAL_JIJI,
             'positions': positions,
             'has_suok': len(positions) > 0,
-            'description': '감옥에 갇히거나 자유를 제한 당함.'
+            'description': self.SAL_DESCRIPTIONS['suok_sal']
         }
 
     def _calculate_mangsin_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -821,7 +1287,7 @@ class SalCalculator:
             'target_jiji': list(set(target_jiji_list)),
             'positions': positions,
             'has_mangsin': len(positions) > 0,
-            'description': '말 그대로 망신을 당함. 공개적인 망신, 재수 없는 일 등이 발생.'
+            'description': self.SAL_DESCRIPTIONS['mangsin_sal']
         }
 
     def _calculate_cheonra_jimang(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -844,7 +1310,7 @@ class SalCalculator:
             'has_cheonra': has_cheonra,
             'has_jimang': has_jimang,
             'has_cheonra_jimang': has_cheonra or has_jimang,
-            'description': '하늘과 땅에 그물이 쳐져 있어 꼼짝하지 못하는 상태. 과거에는 흉살이었으나, 현대에는 종교적 영성이나 내면의 강한 힘으로 재해석되기도 한다.'
+            'description': self.SAL_DESCRIPTIONS['cheonra_jimang']
         }
 
     def _calculate_wonjin_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -867,7 +1333,7 @@ class SalCalculator:
         return {
             'found_pairs': list(set(found_pairs)),
             'has_wonjin': len(found_pairs) > 0,
-            'description': '서로 원망하고 화내는 살. 궁합이 좋지 않음.'
+            'description': self.SAL_DESCRIPTIONS['wonjin_sal']
         }
 
     def _calculate_gwimungwan_sal(self, saju: Dict[str, str]) -> Dict[str, any]:
@@ -890,7 +1356,7 @@ class SalCalculator:
         return {
             'found_pairs': list(set(found_pairs)),
             'has_gwimungwan': len(found_pairs) > 0,
-            'description': '정신적 이상, 의처증, 의부증, 변태 기질이 생김. 때로는 비상한 두뇌를 뜻하기도 함.'
+            'description': self.SAL_DESCRIPTIONS['gwimungwan_sal']
         }
 
     def get_sal_analysis(self, sal_results: Dict[str, any]) -> str:
@@ -898,39 +1364,51 @@ class SalCalculator:
         if not sal_results:
             return "살 계산에 실패했습니다."
         
-        saju = sal_results.get('saju', {})
-        
-        analysis = f"""
-=== 살(煞) 분석 결과 ===
-
-[기본 사주]
-연주: {saju.get('year_pillar', '')} (年柱)
-월주: {saju.get('month_pillar', '')} (月柱)  
-일주: {saju.get('day_pillar', '')} (日柱)
-시주: {saju.get('hour_pillar', '')} (時柱)
-
-생년월일: {saju.get('birth_date', '')}
-생시: {saju.get('birth_time', '')}
-
-[길성(吉星) 분석]
-"""
+        analysis = self._format_sal_analysis_header(sal_results.get('saju', {}))
+        analysis += self._format_sal_analysis_body(sal_results)
+        return analysis.strip()
+    
+    def get_sal_analysis_for_saju(self, saju: Dict[str, str], sal_result: Optional[SalResult] = None) -> str:
+        """
+        사주팔자로 살 분석 텍스트 생성 - get_sal_analysis(calculate_sal_for_saju(saju))와 같은 텍스트.
+        길성·살·흉살 부분은 네 기둥 키로 캐시하고, 머리말(사주·생년월일시)만 매번 채웁니다.
+        """
+        try:
+            if not sal_result:
+                sal_result = self.calculate_sal_result(saju)
+            if sal_result is None:
+                return "살 계산에 실패했습니다."
+            
+            body = self._sal_analysis_cache.get_or_compute(
+                sal_result.codes, lambda: self._format_sal_analysis_body(sal_result))
+            return (self._format_sal_analysis_header(saju) + body).strip()
+            
+        except Exception as e:
+            print(f"살 분석 텍스트 생성 오류: {e}")
+            return "살 계산에 실패했습니다."
+    
+    @classmethod
+    def analysis_cache_stats(cls) -> Dict[str, any]:
+        """살 분석 텍스트 캐시 적중/미스 통계와 메모리 사용량"""
+        return cls._sal_analysis_cache.stats()
+    
+    def _format_sal_analysis_header(self, saju: Dict[str, str]) -> str:
+        """살 분석 텍스트 머리말 (기본 사주, 생년월일시)"""
+        return self.SAL_ANALYSIS_HEADER.format(
+            year_pillar=saju.get('year_pillar', ''),
+            month_pillar=saju.get('month_pillar', ''),
+            day_pillar=saju.get('day_pillar', ''),
+            hour_pillar=saju.get('hour_pillar', ''),
+            birth_date=saju.get('birth_date', ''),
+            birth_time=saju.get('birth_time', '')
+        )
+    
+    def _format_sal_analysis_body(self, sal_results) -> str:
+        """살 분석 텍스트 본문 (길성·주요 살·흉살) - 살 결과에만 의존하므로 사주 키별로 캐시 가능"""
+        analysis = ""
         
         # 길성들 분석
-        gil_seong_list = [
-            ('cheonul_gwiin', '천을귀인', '🌟'),
-            ('munchang_gwiin', '문창귀인', '📚'),
-            ('bokseong_gwiin', '복성귀인', '🍀'),
-            ('woldeok_gwiin', '월덕귀인', '🌙'),
-            ('cheondeok_gwiin', '천덕귀인', '☀️'),
-            ('wolgong_gwiin', '월공귀인', '🌕'),
-            ('geumyeo', '금여', '💍'),
-            ('geonrok', '건록', '🏛️'),
-            ('amrok', '암록', '🎁'),
-            ('cheonuiseong', '천의성', '⚕️'),
-            ('banan_sal', '반안살', '🏆')
-        ]
-        
-        for key, name, emoji in gil_seong_list:
+        for key, name, emoji in self.GIL_SEONG_LIST:
             result = sal_results.get(key, {})
             has_key = f'has_{key.split("_")[0]}'  # has_cheonul, has_munchang 등
             if result.get(has_key):
@@ -949,13 +1427,7 @@ class SalCalculator:
         analysis += "\n[주요 살(煞) 분석]\n"
         
         # 주요 살들
-        sal_list = [
-            ('dohwa_sal', '도화살', '🌸'),
-            ('yeokma_sal', '역마살', '🔄'),
-            ('hwagae_sal', '화개살', '🎨')
-        ]
-        
-        for key, name, emoji in sal_list:
+        for key, name, emoji in self.MAIN_SAL_LIST:
             result = sal_results.get(key, {})
             if result.get(f'has_{key.split("_")[0]}'):
                 positions = result.get('positions', [])
@@ -973,17 +1445,7 @@ class SalCalculator:
         analysis += "\n[흉살(凶煞) 분석]\n"
         
         # 흉살들
-        흉살_list = [
-            ('yangin_sal', '양인살', '⚔️'),
-            ('baekho_sal', '백호살', '🐅'),
-            ('gwaegang_sal', '괴강살', '⚡'),
-            ('hongyeom_sal', '홍염살', '💋'),
-            ('geupgak_sal', '급각살', '🦵'),
-            ('geop_sal', '겁살', '💸'),
-            ('mangsin_sal', '망신살', '😳')
-        ]
-        
-        for key, name, emoji in 흉살_list:
+        for key, name, emoji in self.HYUNG_SAL_LIST:
             result = sal_results.get(key, {})
             has_key = f'has_{key.split("_")[0]}'
             if result.get(has_key):
@@ -1031,7 +1493,7 @@ class SalCalculator:
             analysis += f"👻 귀문관살: {', '.join(gwimungwan.get('found_pairs', []))}\n"
             analysis += f"   → {gwimungwan.get('description')}\n\n"
         
-        return analysis.strip()
+        return analysis
     
     def fortune_analyze(self, birth_date: str, birth_time: str) -> str:
         """
@@ -1181,3 +1643,13 @@ if __name__ == "__main__":
         print(fortune)
     else:
         print("살 계산에 실패했습니다.")
+
+    # 테스트: 여러 사주 일괄 계산 → 살별 보유 비율
+    print("\n" + "="*50)
+    print("=== 살 일괄 계산 (보유 비율) ===")
+    batch = sal_calculator.saju_calculator.calculate_saju_batch(
+        ["1990-05-15", "1985-03-20", "2000-12-25"], ["14:30", "09:15", "23:45"])
+    codes = np.stack([batch[key] for key in sal_calculator.PILLAR_KEYS], axis=1)
+    masks = sal_calculator.calculate_sal_batch(codes)
+    for key, ratio in zip(sal_calculator.SAL_KEYS, (masks != 0).mean(axis=0)):
+        print(f"{key}: {ratio:.0%}")
@@ -0,0 +1,117 @@
+import argparse
+import os
+from typing import Optional
+
+import numpy as np
+
+from config import SAL_TABLE_PATH
+
+# 테이블 키: 연주(60) x 월지(12) x 일주(60) x 시지(12)
+# 월간은 연간, 시간은 일간으로 정해지므로 키에서 빠짐 (전체 60^4 중 실제로 나오는 조합만)
+SAL_TABLE_ROWS = 60 * 12 * 60 * 12
+
+_loaded_tables = {}
+
+
+def pack_sal_key(year_code: int, month_code: int, day_code: int, hour_code: int) -> int:
+    """
+    네 기둥 60갑자 인덱스 → 살 테이블 행 번호.
+    월간·시간이 연간·일간 규칙(연상기월, 일상기시)과 맞지 않으면 -1 (23:30 야자시 등 → 규칙 표로 계산)
+    """
+    month_branch, hour_branch = month_code % 12, hour_code % 12
+    if month_code % 10 != ((year_code % 5) * 2 + 2 + (month_branch - 2) % 12) % 10:
+        return -1
+    if hour_code % 10 != ((day_code % 5) * 2 + hour_branch) % 10:
+        return -1
+    return ((year_code * 12 + month_branch) * 60 + day_code) * 12 + hour_branch
+
+
+def unpack_sal_keys(rows: np.ndarray) -> np.ndarray:
+    """살 테이블 행 번호들 → 네 기둥 60갑자 인덱스 (N x 4)"""
+    rows = np.asarray(rows, dtype=np.int64)
+    hour_branch = rows % 12
+    day_code = rows // 12 % 60
+    month_branch = rows // (12 * 60) % 12
+    year_code = rows // (12 * 60 * 12)
+
+    month_stem = ((year_code % 5) * 2 + 2 + (month_branch - 2) % 12) % 10
+    hour_stem = ((day_code % 5) * 2 + hour_branch) % 10
+    # (천간, 지지) → 60갑자 인덱스: 6 * 천간 - 5 * 지지 (mod 60)
+    month_code = (6 * month_stem - 5 * month_branch) % 60
+    hour_code = (6 * hour_stem - 5 * hour_branch) % 60
+    return np.stack([year_code, month_code, day_code, hour_code], axis=1)
+
+
+def load_sal_table(column_count: int, path: str = SAL_TABLE_PATH) -> Optional[np.ndarray]:
+    """
+    미리 생성된 살 테이블(행: 사주 키, 열: 살별 위치 비트마스크)을 읽기 전용으로 메모리 매핑합니다.
+    같은 파일을 매핑한 워커 프로세스들은 같은 페이지를 공유하며,
+    파일이 없거나 형식이 맞지 않으면 None을 반환합니다 (규칙 표로 계산).
+    """
+    if path in _loaded_tables:
+        return _loaded_tables[path]
+
+    table = None
+    try:
+        if os.path.exists(path):
+            mapped = np.load(path, mmap_mode='r')
+            if mapped.dtype == np.uint8 and mapped.shape == (SAL_TABLE_ROWS, column_count):
+                table = mapped
+            else:
+                print(f"살 테이블 형식이 맞지 않아 사용하지 않습니다: {path}")
+        else:
+            print(f"살 테이블이 없어 규칙 표로 계산합니다 (python sal_table.py build): {path}")
+    except Exception as e:
+        print(f"살 테이블 로드 오류: {e}")
+
+    _loaded_tables[path] = table
+    return table
+
+
+def build_sal_table(calculator=None) -> np.ndarray:
+    """현재 살 규칙 표(SalCalculator.SAL_RULES)로 전체 살 테이블을 생성합니다."""
+    from sal_calculator import SalCalculator
+
+    calculator = calculator or SalCalculator()
+    return calculator.calculate_sal_batch(unpack_sal_keys(np.arange(SAL_TABLE_ROWS)))
+
+
+def diff_sal_table(table: np.ndarray) -> int:
+    """테이블을 현재 규칙 표로 다시 계산한 결과와 비교하고, 살별 불일치를 출력한 뒤 불일치 행 수를 반환합니다."""
+    from sal_calculator import SalCalculator
+
+    calculator = SalCalculator()
+    expected = build_sal_table(calculator)
+    if table.shape != expected.shape:
+        print(f"테이블 크기가 다릅니다: 테이블={table.shape} 규칙={expected.shape}")
+        return SAL_TABLE_ROWS
+    different = np.asarray(table) != expected
+
+    jiazi = calculator.saju_calculator.JIAZI_CYCLE
+    for column in np.flatnonzero(different.any(axis=0)):
+        rows = np.flatnonzero(different[:, column])
+        example = unpack_sal_keys(rows[:1])[0]
+        print(f"{calculator.SAL_KEYS[column]}: {len(rows)}행 불일치 "
+              f"(예: {' '.join(jiazi[code] for code in example)} "
+              f"테이블={table[rows[0], column]:04b} 규칙={expected[rows[0], column]:04b})")
+    return int(different.any(axis=1).sum())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='살 테이블 생성/비교 도구')
+    parser.add_argument('command', choices=['build', 'diff'], help='build: 테이블 생성, diff: 현재 규칙 표와 비교')
+    parser.add_argument('--path', default=SAL_TABLE_PATH, help='테이블 파일 경로')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        os.makedirs(os.path.dirname(os.path.abspath(args.path)), exist_ok=True)
+        np.save(args.path, build_sal_table())
+        print(f"살 테이블을 생성했습니다: {args.path} ({SAL_TABLE_ROWS}행)")
+    else:
+        if not os.path.exists(args.path):
+            print(f"살 테이블이 없습니다: {args.path}")
+            raise SystemExit(1)
+        table = np.load(args.path, mmap_mode='r')
+        mismatch_count = diff_sal_table(table)
+        print(f"비교 완료: 불일치 {mismatch_count}행")
+        raise SystemExit(1 if mismatch_count else 0)
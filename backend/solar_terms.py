@@ -0,0 +1,111 @@
+import argparse
+import csv
+import math
+import os
+from datetime import datetime, timedelta
+from typing import List
+
+from config import SOLAR_TERMS_PATH
+
+# 월주를 나누는 12절 (절기 24개 중 '절'만 사용) - 태양 황경(도)
+TERM_NAMES = ['소한', '입춘', '경칩', '청명', '입하', '망종', '소서', '입추', '백로', '한로', '입동', '대설']
+TERM_LONGITUDES = [285, 315, 345, 15, 45, 75, 105, 135, 165, 195, 225, 255]
+
+# 절입 시각은 이 시각(KST)으로부터의 분 단위로 다룸 (SajuCalculator.BASE_DATE와 같음)
+TERM_EPOCH = datetime(1900, 1, 1)
+
+# 표준시: UTC+9 고정 (역사적인 표준시 변경·서머타임은 반영하지 않음)
+KST_OFFSET = timedelta(hours=9)
+
+_loaded_terms = {}
+
+
+def load_solar_term_minutes(path: str = SOLAR_TERMS_PATH) -> List[int]:
+    """
+    절입 시각 표를 읽어 TERM_EPOCH 기준 분 단위의 정렬된 리스트로 반환합니다.
+    첫 항목은 표 첫해의 소한이며, 이후 12개마다 한 해씩 이어집니다.
+    파일이 없거나 읽을 수 없으면 빈 리스트를 반환합니다 (고정 절입일로 동작).
+    """
+    if path in _loaded_terms:
+        return _loaded_terms[path]
+
+    minutes = []
+    try:
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                reader = csv.reader(f)
+                next(reader)  # 헤더
+                for row in reader:
+                    year = int(row[0])
+                    for value in row[1:]:
+                        term_time = datetime.strptime(f"{year}-{value}", '%Y-%m-%d %H:%M')
+                        minutes.append(int((term_time - TERM_EPOCH).total_seconds()) // 60)
+            if minutes != sorted(minutes) or len(minutes) % 12:
+                print(f"절입 시각 표 형식이 맞지 않아 사용하지 않습니다: {path}")
+                minutes = []
+        else:
+            print(f"절입 시각 표가 없어 고정 절입일로 동작합니다 (python solar_terms.py generate): {path}")
+    except Exception as e:
+        print(f"절입 시각 표 로드 오류: {e}")
+        minutes = []
+
+    _loaded_terms[path] = minutes
+    return minutes
+
+
+def _sun_longitude(when) -> float:
+    """그 시각의 태양 시황경(겉보기 지심 황경, 라디안)"""
+    import ephem
+
+    sun = ephem.Sun(when)
+    return float(ephem.Ecliptic(ephem.Equatorial(sun.g_ra, sun.g_dec, epoch=when), epoch=when).lon)
+
+
+def find_term_time(year: int, index: int) -> datetime:
+    """year년 index번째 절(0=소한)의 절입 시각을 KST 분 단위(반올림)로 계산합니다."""
+    import ephem
+
+    target = math.radians(TERM_LONGITUDES[index])
+    # 절입일은 매달 4~9일 사이이므로 그 앞뒤로 이분 탐색
+    low = ephem.Date(datetime(year, index + 1, 1))
+    high = ephem.Date(datetime(year, index + 1, 12))
+    while high - low > 0.1 / 86400:
+        middle = ephem.Date((low + high) / 2)
+        difference = (_sun_longitude(middle) - target + math.pi) % (2 * math.pi) - math.pi
+        if difference < 0:
+            low = middle
+        else:
+            high = middle
+
+    term_time = ephem.Date(high).datetime() + KST_OFFSET
+    return (term_time + timedelta(seconds=30)).replace(second=0, microsecond=0)
+
+
+def generate_solar_terms(start_year: int, end_year: int) -> List[List[str]]:
+    """start_year~end_year 각 해의 12절 절입 시각 표 (행: [연도, 'MM-DD HH:MM' x 12])"""
+    rows = []
+    for year in range(start_year, end_year + 1):
+        rows.append([str(year)] + [find_term_time(year, index).strftime('%m-%d %H:%M')
+                                   for index in range(12)])
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='절입 시각 표 생성/조회 도구 (생성에는 ephem 패키지 필요)')
+    parser.add_argument('command', choices=['generate', 'show'], help='generate: 표 생성, show: 한 해 조회')
+    parser.add_argument('--path', default=SOLAR_TERMS_PATH, help='표 파일 경로')
+    parser.add_argument('--start', type=int, default=1899, help='시작 연도')
+    parser.add_argument('--end', type=int, default=2101, help='끝 연도')
+    parser.add_argument('--year', type=int, default=datetime.now().year, help='조회할 연도 (show)')
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        os.makedirs(os.path.dirname(os.path.abspath(args.path)), exist_ok=True)
+        with open(args.path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(['year'] + TERM_NAMES)
+            writer.writerows(generate_solar_terms(args.start, args.end))
+        print(f"절입 시각 표를 생성했습니다: {args.path} ({args.start}~{args.end}년)")
+    else:
+        for index, name in enumerate(TERM_NAMES):
+            print(f"{name}: {find_term_time(args.year, index):%Y-%m-%d %H:%M} (KST)")
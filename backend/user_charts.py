@@ -0,0 +1,280 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pymysql
+
+from config import DB_CONFIG
+from sal_calculator import SalCalculator
+
+# 기둥 이름 → user_charts 컬럼 (60갑자 인덱스 0~59)
+CODE_COLUMNS = {
+    'year_pillar': 'year_code',
+    'month_pillar': 'month_code',
+    'day_pillar': 'day_code',
+    'hour_pillar': 'hour_code'
+}
+
+# 사용자별 사주 (네 기둥 60갑자 인덱스 + 살 보유 비트) - 기둥별 인덱스로 "같은 일주" 등 조회
+CREATE_USER_CHARTS_TABLE = """
+CREATE TABLE IF NOT EXISTS user_charts (
+    user_id INT PRIMARY KEY COMMENT '사용자 ID',
+    year_code TINYINT UNSIGNED NOT NULL COMMENT '연주 60갑자 인덱스',
+    month_code TINYINT UNSIGNED NOT NULL COMMENT '월주 60갑자 인덱스',
+    day_code TINYINT UNSIGNED NOT NULL COMMENT '일주 60갑자 인덱스',
+    hour_code TINYINT UNSIGNED NOT NULL COMMENT '시주 60갑자 인덱스',
+    sal_bits INT UNSIGNED NOT NULL COMMENT '살 보유 비트 (SalCalculator.SAL_KEYS 순서)',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '계산일시',
+    INDEX idx_user_charts_year_code (year_code),
+    INDEX idx_user_charts_month_code (month_code),
+    INDEX idx_user_charts_day_code (day_code),
+    INDEX idx_user_charts_hour_code (hour_code),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사용자 사주 테이블'
+"""
+
+# 살별 보유 사용자 (살 키 + 사용자 ID가 기본 키) - "도화살과 역마살이 있는 사용자" 등 조회
+CREATE_USER_SAL_TABLE = """
+CREATE TABLE IF NOT EXISTS user_sal (
+    sal_key VARCHAR(32) NOT NULL COMMENT '살 키 (dohwa_sal 등)',
+    user_id INT NOT NULL COMMENT '사용자 ID',
+    PRIMARY KEY (sal_key, user_id),
+    INDEX idx_user_sal_user_id (user_id),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='사용자 살 테이블'
+"""
+
+# 저장된 전체 사용자 사주 (기본 키 순서로 읽음, 궁합 조회용)
+CHART_CODES_SQL = """
+    SELECT user_id, year_code, month_code, day_code, hour_code
+    FROM user_charts
+    ORDER BY user_id
+"""
+
+# 사주가 아직 저장되지 않은 사용자 (백필 전 등)
+MISSING_CHART_USERS_SQL = """
+    SELECT u.id, u.birth_date, u.birth_time
+    FROM users u
+    LEFT JOIN user_charts uc ON uc.user_id = u.id
+    WHERE uc.user_id IS NULL
+"""
+
+
+class UserChartStore:
+    """사용자 사주·살 저장소 - 사용자 생성 시 저장, 기존 사용자 일괄 채우기, 사주 조건 조회"""
+
+    def __init__(self, sal_calculator: Optional[SalCalculator] = None):
+        self.sal_calculator = sal_calculator or SalCalculator()
+        self.saju_calculator = self.sal_calculator.saju_calculator
+        self.SAL_KEYS = self.sal_calculator.SAL_KEYS
+        self.PILLAR_KEYS = list(CODE_COLUMNS)
+
+    def create_tables(self, cursor):
+        """user_charts, user_sal 테이블 생성 (users 테이블 다음에 호출)"""
+        cursor.execute(CREATE_USER_CHARTS_TABLE)
+        cursor.execute(CREATE_USER_SAL_TABLE)
+
+    def compute_charts(self, users: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        사용자들의 사주와 살 보유 여부를 한 번에(벡터화) 계산합니다.
+
+        Args:
+            users: id, birth_date, birth_time 컬럼을 가진 DataFrame
+
+        Returns:
+            'user_ids', 'codes'(N x 4), 'has'(N x 28 bool), 'sal_bits'(N) 배열 딕셔너리.
+            사주를 계산할 수 없는 사용자는 빠짐
+        """
+        batch = self.saju_calculator.calculate_saju_batch(users)
+        codes = np.stack([batch[key] for key in self.PILLAR_KEYS], axis=1)
+        valid = (codes >= 0).all(axis=1)
+        codes = codes[valid]
+        has = self.sal_calculator.has_sal_batch(codes)
+        return {
+            'user_ids': users['id'].to_numpy()[valid],
+            'codes': codes,
+            'has': has,
+            'sal_bits': (has.astype(np.int64) << np.arange(has.shape[1])).sum(axis=1)
+        }
+
+    def load_all_codes(self, connection, batch_size: int = 10000) -> tuple:
+        """
+        전체 사용자의 네 기둥 인덱스를 (사용자 ID 배열, N x 4 배열)로 반환합니다 (사용자 ID 순서).
+        user_charts는 서버 측 커서로 batch_size씩 읽고, 아직 저장되지 않은 사용자만 생년월일시로 계산합니다.
+        사주를 계산할 수 없는 사용자는 빠집니다.
+        """
+        chunks = []
+        with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+            cursor.execute(CHART_CODES_SQL)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                chunks.append(np.array(rows, dtype=np.int64))
+
+        with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+            cursor.execute(MISSING_CHART_USERS_SQL)
+            missing = pd.DataFrame(cursor.fetchall(), columns=['id', 'birth_date', 'birth_time'])
+        if len(missing):
+            batch = self.saju_calculator.calculate_saju_batch(missing)
+            codes = np.stack([batch[key] for key in self.PILLAR_KEYS], axis=1)
+            valid = (codes >= 0).all(axis=1)
+            chunks.append(np.column_stack([missing['id'].to_numpy(dtype=np.int64)[valid],
+                                           codes[valid].astype(np.int64)]))
+
+        if not chunks:
+            return np.empty(0, dtype=np.int64), np.empty((0, 4), dtype=np.int64)
+        rows = np.concatenate(chunks)
+        rows = rows[np.argsort(rows[:, 0], kind='stable')]
+        return rows[:, 0], rows[:, 1:]
+
+    def save_charts(self, cursor, users: pd.DataFrame) -> int:
+        """사용자들의 사주·살을 계산해 저장합니다 (있으면 덮어씀). 커밋은 호출한 쪽에서. 저장한 사용자 수 반환"""
+        charts = self.compute_charts(users)
+        user_ids = charts['user_ids'].tolist()
+        if not user_ids:
+            return 0
+
+        chart_rows = [(user_id, *codes, sal_bits)
+                      for user_id, codes, sal_bits in zip(user_ids, charts['codes'].tolist(), charts['sal_bits'].tolist())]
+        cursor.executemany("""
+            INSERT INTO user_charts (user_id, year_code, month_code, day_code, hour_code, sal_bits)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE year_code = VALUES(year_code), month_code = VALUES(month_code),
+                day_code = VALUES(day_code), hour_code = VALUES(hour_code), sal_bits = VALUES(sal_bits)
+        """, chart_rows)
+
+        placeholders = ', '.join(['%s'] * len(user_ids))
+        cursor.execute(f"DELETE FROM user_sal WHERE user_id IN ({placeholders})", user_ids)
+        rows, columns = np.nonzero(charts['has'])
+        sal_rows = [(self.SAL_KEYS[column], user_ids[row]) for row, column in zip(rows.tolist(), columns.tolist())]
+        if sal_rows:
+            cursor.executemany("INSERT INTO user_sal (sal_key, user_id) VALUES (%s, %s)", sal_rows)
+        return len(user_ids)
+
+    def save_user_chart(self, cursor, user_id: int, birth_date: str, birth_time: str) -> bool:
+        """사용자 한 명의 사주·살 저장 (사용자 생성 시). 사주를 계산할 수 없으면 False"""
+        users = pd.DataFrame({'id': [user_id], 'birth_date': [birth_date], 'birth_time': [birth_time]})
+        return self.save_charts(cursor, users) > 0
+
+    def backfill(self, workers: int = 4, chunk_size: int = 5000, recompute: bool = False) -> int:
+        """
+        기존 사용자들의 사주·살을 사용자 ID 구간별로 나눠 병렬로 채웁니다.
+        구간마다 별도 DB 연결을 사용하며, recompute가 아니면 아직 저장되지 않은 사용자만 계산합니다.
+        (살 규칙을 바꾼 뒤에는 recompute=True로 다시 계산)
+        """
+        connection = pymysql.connect(**DB_CONFIG)
+        try:
+            with connection.cursor() as cursor:
+                self.create_tables(cursor)
+                cursor.execute("SELECT MIN(id), MAX(id) FROM users")
+                min_id, max_id = cursor.fetchone()
+            connection.commit()
+        finally:
+            connection.close()
+        if min_id is None:
+            return 0
+
+        ranges = [(start, min(start + chunk_size - 1, max_id)) for start in range(min_id, max_id + 1, chunk_size)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            saved_counts = list(executor.map(lambda id_range: self._backfill_range(*id_range, recompute), ranges))
+        return sum(saved_counts)
+
+    def _backfill_range(self, start_id: int, end_id: int, recompute: bool) -> int:
+        """사용자 ID 구간 하나 채우기 (백필 작업자 하나)"""
+        connection = None
+        try:
+            connection = pymysql.connect(**DB_CONFIG)
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(f"""
+                    SELECT u.id, u.birth_date, u.birth_time
+                    FROM users u
+                    {'' if recompute else 'LEFT JOIN user_charts uc ON uc.user_id = u.id'}
+                    WHERE u.id BETWEEN %s AND %s {'' if recompute else 'AND uc.user_id IS NULL'}
+                """, (start_id, end_id))
+                users = pd.DataFrame(cursor.fetchall(), columns=['id', 'birth_date', 'birth_time'])
+                saved_count = self.save_charts(cursor, users) if len(users) else 0
+            connection.commit()
+            print(f"사용자 {start_id}~{end_id}: {saved_count}명 저장")
+            return saved_count
+        except Exception as e:
+            print(f"사주 백필 오류 ({start_id}~{end_id}): {e}")
+            if connection:
+                connection.rollback()
+            return 0
+        finally:
+            if connection:
+                connection.close()
+
+    def build_query(self, sal_keys: List[str], pillars: Dict[str, str], limit: int,
+                    after_id: int = 0) -> tuple:
+        """
+        사주 조건 조회 SQL과 인자를 만듭니다 (사용자 ID 순서, after_id 다음부터 limit + 1개 - 다음 페이지 확인용).
+        살마다 user_sal 기본 키 (sal_key, user_id)로, 기둥마다 user_charts 기둥 인덱스로 조회합니다.
+
+        Args:
+            sal_keys: 모두 가지고 있어야 하는 살 키 목록 (SAL_KEYS 중)
+            pillars: 기둥 이름(day_pillar 등) → 간지 ('甲子')
+        """
+        joins, conditions, join_params, params = [], ['uc.user_id > %s'], [], [after_id]
+        for i, sal_key in enumerate(sal_keys):
+            joins.append(f"JOIN user_sal s{i} ON s{i}.sal_key = %s AND s{i}.user_id = uc.user_id")
+            join_params.append(sal_key)
+        for pillar, ganji in pillars.items():
+            conditions.append(f"uc.{CODE_COLUMNS[pillar]} = %s")
+            params.append(self.saju_calculator.JIAZI_CODE[ganji])
+
+        query = f"""
+            SELECT uc.user_id, u.name, u.birth_date, u.birth_time,
+                   uc.year_code, uc.month_code, uc.day_code, uc.hour_code, uc.sal_bits
+            FROM user_charts uc
+            JOIN users u ON u.id = uc.user_id
+            {' '.join(joins)}
+            WHERE {' AND '.join(conditions)}
+            ORDER BY uc.user_id
+            LIMIT %s
+        """
+        return query, join_params + params + [limit + 1]
+
+    def query_users(self, cursor, sal_keys: List[str], pillars: Dict[str, str], limit: int = 50,
+                    after_id: int = 0) -> Dict[str, any]:
+        """
+        살·기둥 조건에 맞는 사용자 한 페이지를 조회합니다 (DictCursor).
+
+        Returns:
+            'users' (사주와 보유 살 포함), 'next_after' (다음 페이지의 after_id, 마지막 페이지면 None)
+        """
+        query, params = self.build_query(sal_keys, pillars, limit, after_id)
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+
+        jiazi = self.saju_calculator.JIAZI_CYCLE
+        users = []
+        for row in rows[:limit]:
+            users.append({
+                'user_id': row['user_id'],
+                'name': row['name'],
+                'birth_date': row['birth_date'].strftime('%Y-%m-%d') if row['birth_date'] else None,
+                'birth_time': str(row['birth_time']) if row['birth_time'] is not None else None,
+                'saju': {pillar: jiazi[row[column]] for pillar, column in CODE_COLUMNS.items()},
+                'sals': [key for i, key in enumerate(self.SAL_KEYS) if (row['sal_bits'] >> i) & 1]
+            })
+        return {
+            'users': users,
+            'next_after': users[-1]['user_id'] if len(rows) > limit else None
+        }
+
+
+# 사용 예시
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='사용자 사주·살 테이블 채우기 (기존 사용자 백필)')
+    parser.add_argument('--workers', type=int, default=4, help='병렬 작업자 수 (작업자마다 DB 연결 하나)')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='작업 하나가 맡는 사용자 ID 구간 크기')
+    parser.add_argument('--recompute', action='store_true', help='이미 저장된 사용자도 다시 계산 (살 규칙 변경 후)')
+    args = parser.parse_args()
+
+    store = UserChartStore()
+    total = store.backfill(workers=args.workers, chunk_size=args.chunk_size, recompute=args.recompute)
+    print(f"백필 완료: {total}명 저장")